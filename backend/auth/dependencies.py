@@ -4,7 +4,7 @@ import jwt
 from datetime import datetime, timedelta
 from typing import Optional
 
-from models.user import User
+from ..models.user import User
 
 # JWT token settings
 SECRET_KEY = "mysecretkey"
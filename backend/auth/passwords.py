@@ -0,0 +1,87 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 2))
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a small dedicated thread pool.
+
+    bcrypt releases the GIL, so the event loop keeps serving other requests
+    while a hash runs. A semaphore caps concurrent hashes at the pool size and
+    callers beyond that wait on it, which is what the queue metrics measure;
+    a login burst therefore uses a fixed number of cores.
+    """
+
+    def __init__(self, context: Optional[CryptContext] = None, max_workers: int = DEFAULT_WORKERS):
+        self.context = context or CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max_workers)
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password"
+            )
+        return self._executor
+
+    async def _run(self, func, *args):
+        queued_at = time.monotonic()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.monotonic()
+        self.total_wait_seconds += started_at - queued_at
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.total_run_seconds += time.monotonic() - started_at
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        if not hashed_password:
+            return False
+        return await self._run(self.context.verify, password, hashed_password)
+
+    def metrics(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "running": self.running,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "completed": self.completed,
+            "avg_wait_ms": round(1000 * self.total_wait_seconds / self.completed, 2) if self.completed else 0.0,
+            "avg_run_ms": round(1000 * self.total_run_seconds / self.completed, 2) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,139 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitRule(NamedTuple):
+    """A token bucket holding `capacity` attempts that refills completely every `period` seconds"""
+    name: str
+    capacity: int
+    period: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period
+
+
+LOGIN_PER_IP = RateLimitRule("login:ip", capacity=20, period=60)
+# Failed logins only; successful logins are not counted. The account-wide bucket
+# stops guessing spread over many addresses, the tighter (account, address) one
+# a single guesser, who then can't use up the account-wide bucket on their own.
+LOGIN_PER_ACCOUNT = RateLimitRule("login:account", capacity=20, period=900)
+LOGIN_PER_ACCOUNT_IP = RateLimitRule("login:account_ip", capacity=5, period=300)
+REGISTER_PER_IP = RateLimitRule("register:ip", capacity=5, period=3600)
+
+
+def _take(tokens: float, updated_at: float, now: float, rule: RateLimitRule, cost: int = 1) -> Tuple[float, float]:
+    """
+    Refill a bucket up to now and take cost tokens (0 only checks); returns
+    (tokens left, seconds to wait or 0). An empty bucket takes nothing.
+    """
+    tokens = min(rule.capacity, tokens + max(0.0, now - updated_at) * rule.refill_rate)
+    if tokens >= 1:
+        return tokens - cost, 0.0
+    return tokens, (1 - tokens) / rule.refill_rate
+
+
+def forwarded_client_ip(forwarded_for: Optional[str], peer: Optional[str], trusted_hops: int) -> str:
+    """
+    The client address as seen by the outermost of trusted_hops reverse proxies.
+    Each proxy appends the address it received the request from to
+    X-Forwarded-For, so the entry trusted_hops from the right is the last one a
+    trusted proxy wrote; anything left of it can be forged by the client.
+    """
+    addresses = [address.strip() for address in (forwarded_for or "").split(",") if address.strip()]
+    if trusted_hops <= 0 or not addresses:
+        return peer or "unknown"
+    return addresses[-min(trusted_hops, len(addresses))]
+
+
+class MemoryRateLimiter:
+    """
+    Token buckets kept in this process, for single-worker deployments.
+    Least recently used buckets are dropped past max_keys; a dropped bucket
+    comes back full, which only ever errs towards letting a request through.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # "rule:key" -> (tokens, updated_at)
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def hit(self, rule: RateLimitRule, key: str, cost: int = 1) -> float:
+        """
+        Take cost attempts from the bucket (0 only checks it); returns 0 if
+        allowed, else seconds until the next attempt is.
+        """
+        bucket_key = f"{rule.name}:{key}"
+        now = time.monotonic()
+        tokens, updated_at = self.buckets.get(bucket_key, (rule.capacity, now))
+        tokens, retry_after = _take(tokens, updated_at, now, rule, cost)
+        self.buckets[bucket_key] = (tokens, now)
+        self.buckets.move_to_end(bucket_key)
+        while len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+        return retry_after
+
+    async def close(self):
+        pass
+
+
+# Same arithmetic as _take, run atomically inside Redis so every worker shares the bucket
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - cost
+else
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimiter:
+    """
+    Token buckets shared through Redis, for multi-worker deployments.
+    If Redis is unreachable requests are let through and the error is logged,
+    so an outage of the limiter never takes logins down with it.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self.script = client.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def hit(self, rule: RateLimitRule, key: str, cost: int = 1) -> float:
+        try:
+            retry_after = await self.script(
+                keys=[f"{self.prefix}:{rule.name}:{key}"],
+                args=[rule.capacity, rule.refill_rate, time.time(), cost]
+            )
+        except Exception as e:
+            logger.error(f"Rate limiter unavailable, allowing request: {str(e)}")
+            return 0.0
+        return float(retry_after)
+
+    async def close(self):
+        await self.client.close()
+
+
+def create_rate_limiter(redis_url: Optional[str] = None):
+    """Redis-backed when a URL is configured, in-memory otherwise"""
+    if not redis_url:
+        return MemoryRateLimiter()
+    import redis.asyncio as redis
+    logger.info("Using Redis for rate limiting")
+    return RedisRateLimiter(redis.from_url(redis_url))
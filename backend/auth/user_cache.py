@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+class UserCache:
+    """
+    Bounded TTL/LRU cache of user documents for authenticated requests.
+
+    Every user id carries a version number that invalidate() bumps. A reader
+    takes the version before going to the database and put() drops the result
+    if the version moved meanwhile, so a write racing a cache fill never leaves
+    a stale entry behind. The TTL bounds staleness from writes made by other
+    workers, which cannot invalidate this process's cache.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # user id -> (user document, version, expiry)
+        self.entries: "OrderedDict[str, Tuple[dict, int, float]]" = OrderedDict()
+        self.versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def version(self, user_id: str) -> int:
+        return self.versions.get(user_id, 0)
+
+    def get(self, user_id: str) -> Optional[dict]:
+        entry = self.entries.get(user_id)
+        if entry is not None:
+            user, version, expires_at = entry
+            if version == self.version(user_id) and expires_at > time.monotonic():
+                self.entries.move_to_end(user_id)
+                self.hits += 1
+                return dict(user)
+            del self.entries[user_id]
+        self.misses += 1
+        return None
+
+    def put(self, user_id: str, user: dict, version: int):
+        """Cache a user read at the given version, unless it was invalidated since"""
+        if version != self.version(user_id):
+            return
+        self.entries[user_id] = (dict(user), version, time.monotonic() + self.ttl_seconds)
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str]):
+        """Call after any write to the user's document"""
+        if not user_id:
+            return
+        self.versions[user_id] = self.version(user_id) + 1
+        self.entries.pop(user_id, None)
+
+    def clear(self):
+        for user_id in list(self.entries):
+            self.invalidate(user_id)
@@ -0,0 +1 @@
+# This file makes the database directory a Python package
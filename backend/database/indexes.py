@@ -0,0 +1,154 @@
+import logging
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Every index the API's query shapes rely on, keyed by collection.
+# Sort-bearing indexes end in (updated_at, id) to serve keyset pagination;
+# the review queue ones follow QUEUE_SORT in backend/review/queue.py.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("is_admin", ASCENDING)], name="is_admin"),
+    ],
+    "researcher_profiles": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+        IndexModel(
+            [("status", ASCENDING), ("updated_at", DESCENDING), ("id", DESCENDING)],
+            name="status_updated_at_id"
+        ),
+        IndexModel(
+            [("status", ASCENDING), ("submitted_day", ASCENDING), ("completion_percentage", DESCENDING), ("id", ASCENDING)],
+            name="status_review_queue"
+        ),
+        IndexModel([("updated_at", DESCENDING), ("id", DESCENDING)], name="updated_at_id"),
+        IndexModel([("review_batch_id", ASCENDING)], name="review_batch_id", sparse=True),
+    ],
+    "academics": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+        IndexModel(
+            [("approval_status", ASCENDING), ("updated_at", DESCENDING), ("id", DESCENDING)],
+            name="approval_status_updated_at_id"
+        ),
+        IndexModel(
+            [
+                ("approval_status", ASCENDING), ("submitted_day", ASCENDING),
+                ("completion_percentage", DESCENDING), ("id", ASCENDING)
+            ],
+            name="approval_status_review_queue"
+        ),
+        IndexModel(
+            [("approval_status", ASCENDING), ("country", ASCENDING), ("city", ASCENDING)],
+            name="approval_status_country_city"
+        ),
+        IndexModel([("updated_at", DESCENDING), ("id", DESCENDING)], name="updated_at_id"),
+        IndexModel([("review_batch_id", ASCENDING)], name="review_batch_id", sparse=True),
+    ],
+    "connections": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("requester_id", ASCENDING), ("updated_at", DESCENDING), ("id", DESCENDING)],
+            name="requester_id_updated_at_id"
+        ),
+        IndexModel(
+            [("recipient_id", ASCENDING), ("updated_at", DESCENDING), ("id", DESCENDING)],
+            name="recipient_id_updated_at_id"
+        ),
+        IndexModel([("status", ASCENDING)], name="status"),
+        IndexModel(
+            [("pair_key", ASCENDING)],
+            name="pair_key_unique",
+            unique=True,
+            partialFilterExpression={"pair_key": {"$type": "string"}}
+        ),
+    ],
+    "research_projects": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("team_members.user_id", ASCENDING), ("updated_at", DESCENDING), ("id", DESCENDING)],
+            name="team_members_user_id_updated_at_id"
+        ),
+    ],
+    "verification_tokens": [
+        IndexModel([("token", ASCENDING)], name="token_unique", unique=True),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+    "academic_stats": [
+        IndexModel(
+            [("kind", ASCENDING), ("country", ASCENDING), ("city", ASCENDING)],
+            name="kind_country_city"
+        ),
+        IndexModel([("kind", ASCENDING), ("count", DESCENDING)], name="kind_count"),
+    ],
+    "keywords": [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+        IndexModel([("count", DESCENDING), ("name", ASCENDING)], name="count_name"),
+    ],
+    "connection_suggestions": [
+        IndexModel([("candidates.user_id", ASCENDING)], name="candidates_user_id"),
+        IndexModel([("generation", DESCENDING)], name="generation"),
+    ],
+    "email_outbox": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt_at"),
+        IndexModel([("claim_id", ASCENDING)], name="claim_id", sparse=True),
+    ],
+}
+
+
+async def ensure_indexes(db, indexes: Dict[str, List[IndexModel]] = INDEXES) -> Dict[str, List[str]]:
+    """
+    Create any declared index that does not exist yet.
+    Failures (e.g. duplicates blocking a unique index) are logged, not raised,
+    so a bad index never keeps the API from starting.
+    """
+    created = []
+    failed = []
+    for collection_name, models in indexes.items():
+        existing = await db[collection_name].index_information()
+        missing = [model for model in models if model.document["name"] not in existing]
+        for model in missing:
+            name = f"{collection_name}.{model.document['name']}"
+            try:
+                await db[collection_name].create_indexes([model])
+                created.append(name)
+            except OperationFailure as e:
+                failed.append(name)
+                logger.error(f"Failed to create index {name}: {str(e)}")
+
+    if created:
+        logger.info(f"Created indexes: {', '.join(created)}")
+    return {"created": created, "failed": failed}
+
+
+async def index_report(db, indexes: Dict[str, List[IndexModel]] = INDEXES) -> Dict[str, List[str]]:
+    """
+    Compare the live indexes with the registry.
+    Reports declared indexes that are missing, declared indexes that have not
+    served a query since the server started, and live indexes nobody declared.
+    """
+    missing = []
+    unused = []
+    undeclared = []
+    for collection_name, models in indexes.items():
+        declared = {model.document["name"] for model in models}
+        stats = await db[collection_name].aggregate([{"$indexStats": {}}]).to_list(None)
+        live = {stat["name"]: stat.get("accesses", {}).get("ops", 0) for stat in stats}
+
+        for name in sorted(declared):
+            if name not in live:
+                missing.append(f"{collection_name}.{name}")
+            elif live[name] == 0:
+                unused.append(f"{collection_name}.{name}")
+
+        for name in sorted(live):
+            if name != "_id_" and name not in declared:
+                undeclared.append(f"{collection_name}.{name}")
+
+    return {"missing": missing, "unused": unused, "undeclared": undeclared}
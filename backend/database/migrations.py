@@ -0,0 +1,74 @@
+import logging
+
+from pymongo import UpdateOne
+
+from ..graph.connections import connection_pair_key
+from ..review.queue import REVIEW_KINDS
+
+_DAY_MS = 24 * 60 * 60 * 1000
+
+logger = logging.getLogger(__name__)
+
+# Which connection keeps the pair key when a pair has several documents
+_STATUS_PRIORITY = {"accepted": 0, "pending": 1, "rejected": 2}
+
+
+async def backfill_connection_pair_keys(db):
+    """
+    Give every connection its canonical pair_key. Must run before the unique
+    pair_key index is created. Where a pair already has several documents,
+    only the one that matters most (accepted, then pending, then oldest) gets
+    the key; the rest keep none and are logged, since the index ignores them.
+    """
+    connections = await db.connections.find(
+        {"pair_key": {"$exists": False}},
+        {"_id": 0, "id": 1, "requester_id": 1, "recipient_id": 1, "status": 1, "created_at": 1}
+    ).to_list(None)
+    if not connections:
+        return
+
+    keyed = await db.connections.distinct("pair_key", {"pair_key": {"$type": "string"}})
+    taken = set(keyed)
+    connections.sort(key=lambda connection: (
+        _STATUS_PRIORITY.get(connection.get("status"), 3), str(connection.get("created_at", ""))
+    ))
+
+    operations = []
+    duplicates = 0
+    for connection in connections:
+        key = connection_pair_key(connection["requester_id"], connection["recipient_id"])
+        if key in taken:
+            duplicates += 1
+            continue
+        taken.add(key)
+        operations.append(UpdateOne({"id": connection["id"]}, {"$set": {"pair_key": key}}))
+
+    if operations:
+        await db.connections.bulk_write(operations, ordered=False)
+    logger.info(f"Backfilled pair_key on {len(operations)} connections")
+    if duplicates:
+        logger.warning(f"{duplicates} duplicate connections were left without a pair_key")
+
+
+async def backfill_review_queue_fields(db):
+    """
+    Store the review queue's sort fields on pending documents submitted before
+    they were written at submission, taking the kind's fallback field as the
+    submission time. Must run before the queue indexes are used; the queue
+    sorts on submitted_day and would put documents lacking it first.
+    """
+    for kind, review_kind in REVIEW_KINDS.items():
+        submitted_at = {"$ifNull": ["$submitted_at", f"${review_kind.fallback_submitted_field}"]}
+        result = await db[review_kind.collection].update_many(
+            {review_kind.status_field: review_kind.pending, "submitted_day": {"$exists": False}},
+            [
+                {"$set": {"submitted_at": submitted_at}},
+                {"$set": {
+                    # Midnight of the submission day, as a date
+                    "submitted_day": {"$subtract": ["$submitted_at", {"$mod": [{"$toLong": "$submitted_at"}, _DAY_MS]}]},
+                    "completion_percentage": {"$ifNull": ["$completion_percentage", 100]},
+                }},
+            ]
+        )
+        if result.modified_count:
+            logger.info(f"Backfilled review queue fields on {result.modified_count} pending {kind}s")
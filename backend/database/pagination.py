@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from pymongo import ASCENDING, DESCENDING
+
+# Newest first, with the id as a tie-breaker so the order is total
+DEFAULT_SORT = [("updated_at", DESCENDING), ("id", DESCENDING)]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# What a cursor may hold: sort key values, never documents or operators
+CURSOR_TYPES = (str, int, float, datetime, type(None))
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _decode_value(value: dict):
+    if "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Pack the sort key of the last returned item into an opaque token"""
+    raw = json.dumps(values, default=_encode_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int, types: Optional[Sequence[Tuple[type, ...]]] = None) -> List[Any]:
+    """
+    Unpack a cursor token, rejecting anything that was not issued for this sort:
+    the wrong number of values, values that are not scalars, or values whose
+    type does not match types, given per position.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded), object_hook=_decode_value)
+    except (ValueError, TypeError):
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or any(type(value) not in CURSOR_TYPES for value in values)
+        or (types is not None and any(type(value) not in allowed for value, allowed in zip(values, types)))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    return values
+
+
+def _after(field: str, direction: int, value: Any) -> Optional[dict]:
+    """
+    The condition for a field value sorting strictly after value. MongoDB sorts
+    null (and missing) below everything else, so nulls come after any value
+    in descending order and before any value in ascending order.
+    """
+    if direction == ASCENDING:
+        return {field: {"$ne": None}} if value is None else {field: {"$gt": value}}
+    if value is None:
+        return None
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_filter(sort: List[Tuple[str, int]], values: List[Any]) -> dict:
+    """
+    Build the filter selecting documents that sort strictly after the cursor.
+    For a (a, b) key this is a < a0 OR (a == a0 AND b < b0), flipped for ascending fields.
+    """
+    branches = []
+    for position, (field, direction) in enumerate(sort):
+        after = _after(field, direction, values[position])
+        if after is None:
+            continue
+        branch = {prefix_field: values[index] for index, (prefix_field, _) in enumerate(sort[:position])}
+        branches.append({**branch, **after})
+    return {"$or": branches} if branches else {"id": {"$in": []}}
+
+
+async def paginate(
+    collection,
+    query: dict,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    sort: Optional[List[Tuple[str, int]]] = None,
+    projection: Optional[dict] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Fetch one keyset page of a collection.
+    Returns the documents and the cursor for the next page, or None on the last page.
+    """
+    sort = sort or DEFAULT_SORT
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor, len(sort)))]}
+
+    # Fetch one extra document to learn whether another page exists
+    documents = await collection.find(query, projection).sort(sort).limit(limit + 1).to_list(limit + 1)
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = encode_cursor([documents[-1].get(field) for field, _ in sort])
+
+    return documents, next_cursor
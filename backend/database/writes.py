@@ -0,0 +1,99 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from fastapi import HTTPException, status
+from pymongo import ReturnDocument
+
+# Turns the document as it currently stands (None if it does not exist) into
+# the exception explaining why a conditional write did not match it
+Explain = Callable[[Optional[dict]], Exception]
+
+
+async def update_and_fetch(
+    collection,
+    query: dict,
+    update: Union[dict, List[dict]],
+    return_previous: bool = False,
+    projection: Optional[dict] = None
+) -> Optional[dict]:
+    """
+    Apply an update to the document matching query and return it, in one
+    round trip. The document as written is returned unless return_previous
+    asks for the version before the update. None if nothing matched.
+    """
+    return await collection.find_one_and_update(
+        query,
+        update,
+        projection=projection,
+        return_document=ReturnDocument.BEFORE if return_previous else ReturnDocument.AFTER
+    )
+
+
+async def conditional_update(
+    collection,
+    key: dict,
+    conditions: dict,
+    update: Union[dict, List[dict]],
+    explain: Explain,
+    return_previous: bool = False
+) -> dict:
+    """
+    Update the document identified by key, but only while it also meets the
+    permission and state conditions, and return it.
+
+    The checks run inside the write's filter, so they cannot interleave with
+    another write. Only when nothing matched is the document read again, so
+    explain can tell "not found" apart from "not allowed" or "wrong state".
+    """
+    document = await update_and_fetch(collection, {**key, **conditions}, update, return_previous)
+    if document is None:
+        raise explain(await collection.find_one(key))
+    return document
+
+
+async def conditional_update_with_previous(
+    collection,
+    key: dict,
+    conditions: dict,
+    update: Union[dict, List[dict]],
+    explain: Explain,
+    tracked: Sequence[str],
+    attempts: int = 3
+) -> Tuple[dict, dict]:
+    """
+    conditional_update for callers that need the change itself, e.g. to move
+    counters: returns (before, after), where after is the document as written.
+
+    before is read first and the write only matches while its tracked fields
+    still hold the values read, so for those fields before is exactly what
+    the write replaced. If another write changed one of them in between,
+    the read and write are retried; a 409 is raised once attempts run out.
+    """
+    before = await collection.find_one(key)
+    for _ in range(attempts):
+        if before is None:
+            raise explain(None)
+        pinned = {field: before.get(field) for field in tracked}
+        after = await update_and_fetch(collection, {**key, **conditions, **pinned}, update)
+        if after is not None:
+            return before, after
+        current = await collection.find_one(key)
+        if current is None or all(current.get(field) == before.get(field) for field in tracked):
+            raise explain(current)
+        before = current
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="The document is being changed by another request, please try again"
+    )
+
+
+def literal_fields(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """$set values for an update pipeline, quoted so strings starting with "$" are kept as data"""
+    return {name: {"$literal": value} for name, value in fields.items()}
+
+
+def populated_count(fields: List[str]) -> dict:
+    """Aggregation expression counting how many of the fields hold a non-empty value"""
+    return {"$add": [
+        {"$cond": [{"$in": [{"$ifNull": [f"${field}", None]}, [None, "", [], {}, False, 0]]}, 0, 1]}
+        for field in fields
+    ]}
@@ -0,0 +1,62 @@
+import struct
+from typing import List
+
+# Media type clients send in Accept to receive the packed globe payload
+GLOBE_BINARY_MEDIA_TYPE = "application/vnd.globe-points+octet-stream"
+
+MAGIC = b"GLB1"
+
+
+def accepts_globe_binary(accept: str) -> bool:
+    return GLOBE_BINARY_MEDIA_TYPE in (accept or "")
+
+
+def encode_globe_points(points: List[dict]) -> bytes:
+    """
+    Pack globe points and clusters into a columnar little-endian buffer.
+
+    Layout, with every column 4-byte aligned so clients can view it directly
+    as typed arrays:
+
+        magic        4 bytes  b"GLB1"
+        n            uint32
+        lat          float32[n]
+        lng          float32[n]
+        count        uint32[n]   1 for an individual academic
+        ids_length   uint32
+        ids          UTF-8, newline-separated
+
+    Everything else about a point is fetched by id when it is needed.
+    """
+    n = len(points)
+    ids = "\n".join(point["id"] for point in points).encode("utf-8")
+    return b"".join([
+        MAGIC,
+        struct.pack("<I", n),
+        struct.pack(f"<{n}f", *(point["lat"] for point in points)),
+        struct.pack(f"<{n}f", *(point["lng"] for point in points)),
+        struct.pack(f"<{n}I", *(point.get("count", 1) for point in points)),
+        struct.pack("<I", len(ids)),
+        ids,
+    ])
+
+
+def decode_globe_points(payload: bytes) -> List[dict]:
+    """Inverse of encode_globe_points, returning id, lat, lng and count per point"""
+    if payload[:4] != MAGIC:
+        raise ValueError("Not a globe points payload")
+    (n,) = struct.unpack_from("<I", payload, 4)
+    offset = 8
+    lats = struct.unpack_from(f"<{n}f", payload, offset)
+    offset += 4 * n
+    lngs = struct.unpack_from(f"<{n}f", payload, offset)
+    offset += 4 * n
+    counts = struct.unpack_from(f"<{n}I", payload, offset)
+    offset += 4 * n
+    (ids_length,) = struct.unpack_from("<I", payload, offset)
+    offset += 4
+    ids = payload[offset:offset + ids_length].decode("utf-8").split("\n") if n else []
+    return [
+        {"id": ids[i], "lat": lats[i], "lng": lngs[i], "count": counts[i]}
+        for i in range(n)
+    ]
@@ -0,0 +1,289 @@
+import math
+import bisect
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# At this zoom and above the globe shows individual academics
+EXPAND_ZOOM = 10
+
+# Clusters at zoom z are quadkey cells at level z + CELL_LEVEL_OFFSET,
+# i.e. an 8x8 grid of cells per map tile
+CELL_LEVEL_OFFSET = 3
+
+MAX_LATITUDE = 85.05112878
+
+
+# Most tiles a viewport query prefix-scans; wider boxes use coarser tiles
+MAX_VIEWPORT_TILES = 64
+
+
+def tile_xy(lat: float, lng: float, level: int) -> Tuple[int, int]:
+    """Web Mercator tile coordinates of a point at the given level"""
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    x = (lng + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+
+    size = 1 << level
+    return min(size - 1, max(0, int(x * size))), min(size - 1, max(0, int(y * size)))
+
+
+def quadkey(lat: float, lng: float, level: int) -> str:
+    """Web Mercator quadkey of the tile containing a point at the given level"""
+    tile_x, tile_y = tile_xy(lat, lng, level)
+    return tile_quadkey(tile_x, tile_y, level)
+
+
+def tile_quadkey(tile_x: int, tile_y: int, level: int) -> str:
+    digits = []
+    for i in range(level, 0, -1):
+        mask = 1 << (i - 1)
+        digit = 0
+        if tile_x & mask:
+            digit += 1
+        if tile_y & mask:
+            digit += 2
+        digits.append(str(digit))
+    return "".join(digits)
+
+
+def quadkey_tile(key: str) -> Tuple[int, int]:
+    """Inverse of tile_quadkey"""
+    tile_x = tile_y = 0
+    for char in key:
+        digit = int(char)
+        tile_x = (tile_x << 1) | (digit & 1)
+        tile_y = (tile_y << 1) | (digit >> 1)
+    return tile_x, tile_y
+
+
+def parse_bbox(value: str) -> Tuple[float, float, float, float]:
+    """
+    Parse a "west,south,east,north" bounding box in degrees.
+    west may exceed east for a box that crosses the antimeridian.
+    """
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox must have four comma-separated values")
+    west, south, east, north = parts
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south <= north <= 90):
+        raise ValueError("bbox is out of range")
+    return west, south, east, north
+
+
+def bbox_tile_ranges(bbox: Tuple[float, float, float, float], level: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Inclusive (x0, x1, y0, y1) tile ranges covering a bbox, split at the
+    antimeridian. Split spans that meet or overlap (a box wrapping almost the
+    whole globe) are merged into one full-width range, so no tile is covered twice.
+    """
+    west, south, east, north = bbox
+    x0, y0 = tile_xy(north, west, level)
+    x1, y1 = tile_xy(south, east, level)
+    if west <= east:
+        return [(x0, x1, y0, y1)]
+    last_column = (1 << level) - 1
+    if x1 >= x0 - 1:
+        return [(0, last_column, y0, y1)]
+    return [(x0, last_column, y0, y1), (0, x1, y0, y1)]
+
+
+def covering_prefixes(bbox: Tuple[float, float, float, float], max_level: int) -> List[str]:
+    """
+    Quadkeys of the tiles covering a bbox at the deepest level up to max_level
+    that needs no more than MAX_VIEWPORT_TILES of them.
+    """
+    level = max_level
+    while level > 0:
+        ranges = bbox_tile_ranges(bbox, level)
+        if sum((x1 - x0 + 1) * (y1 - y0 + 1) for x0, x1, y0, y1 in ranges) <= MAX_VIEWPORT_TILES:
+            break
+        level -= 1
+    return list(dict.fromkeys(
+        tile_quadkey(tile_x, tile_y, level)
+        for x0, x1, y0, y1 in bbox_tile_ranges(bbox, level)
+        for tile_x in range(x0, x1 + 1)
+        for tile_y in range(y0, y1 + 1)
+    ))
+
+
+def in_bbox(lat: float, lng: float, bbox: Tuple[float, float, float, float]) -> bool:
+    west, south, east, north = bbox
+    if not south <= lat <= north:
+        return False
+    if west <= east:
+        return west <= lng <= east
+    return lng >= west or lng <= east
+
+
+def globe_point(academic: dict, user: Optional[dict] = None) -> dict:
+    """Shape an academic document into the point the globe renders"""
+    name = None
+    if user:
+        name = " ".join(part for part in [user.get("first_name"), user.get("last_name")] if part)
+    return {
+        "id": academic["id"],
+        "type": "academic",
+        "name": name or academic.get("university"),
+        "university": academic.get("university"),
+        "field": academic.get("research_field"),
+        "bio": academic.get("bio"),
+        "country": academic.get("country"),
+        "city": academic.get("city"),
+        "lat": academic["latitude"],
+        "lng": academic["longitude"],
+        "research_areas": academic.get("keywords", []),
+        "email": academic.get("contact_email"),
+        "profile_picture_url": academic.get("profile_picture_url"),
+    }
+
+
+class GlobeIndex:
+    """
+    Approved academics with per-zoom quadkey clusters.
+
+    Each zoom level keeps cell -> [count, sum_lat, sum_lng], so a point can be
+    added or removed in O(levels) and centroids never need recomputing.
+    """
+
+    def __init__(self, expand_zoom: int = EXPAND_ZOOM):
+        self.expand_zoom = expand_zoom
+        self.points: Dict[str, dict] = {}
+        # id -> quadkey at the deepest clustered level
+        self.point_keys: Dict[str, str] = {}
+        # Sorted (quadkey, id) pairs, to find the academics inside a cell by prefix
+        self.sorted_keys: List[tuple] = []
+        self.levels: List[Dict[str, List[float]]] = [{} for _ in range(expand_zoom)]
+        # Sorted cell keys per zoom level, for prefix scans over a viewport
+        self.level_keys: List[List[str]] = [[] for _ in range(expand_zoom)]
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, point: dict):
+        """Add a point, replacing any previous version of it"""
+        self.remove(point["id"])
+        key = quadkey(point["lat"], point["lng"], self.expand_zoom - 1 + CELL_LEVEL_OFFSET)
+        for zoom, cells in enumerate(self.levels):
+            cell_key = key[:zoom + CELL_LEVEL_OFFSET]
+            if cell_key not in cells:
+                cells[cell_key] = [0, 0.0, 0.0]
+                bisect.insort(self.level_keys[zoom], cell_key)
+            cell = cells[cell_key]
+            cell[0] += 1
+            cell[1] += point["lat"]
+            cell[2] += point["lng"]
+        self.points[point["id"]] = point
+        self.point_keys[point["id"]] = key
+        bisect.insort(self.sorted_keys, (key, point["id"]))
+
+    def remove(self, point_id: str):
+        """Remove a point if it is present"""
+        point = self.points.pop(point_id, None)
+        if point is None:
+            return
+        key = self.point_keys.pop(point_id)
+        del self.sorted_keys[bisect.bisect_left(self.sorted_keys, (key, point_id))]
+        for zoom, cells in enumerate(self.levels):
+            cell_key = key[:zoom + CELL_LEVEL_OFFSET]
+            cell = cells[cell_key]
+            cell[0] -= 1
+            cell[1] -= point["lat"]
+            cell[2] -= point["lng"]
+            if cell[0] <= 0:
+                del cells[cell_key]
+                cell_keys = self.level_keys[zoom]
+                del cell_keys[bisect.bisect_left(cell_keys, cell_key)]
+
+    def sync(self, academic: Optional[dict], user: Optional[dict] = None):
+        """Show an approved academic on the globe, or hide one that is not approved"""
+        if not academic or not academic.get("id"):
+            return
+        if academic.get("approval_status") == "approved" and academic.get("latitude") is not None:
+            self.add(globe_point(academic, user))
+        else:
+            self.remove(academic["id"])
+
+    def clusters(self, zoom: int) -> List[dict]:
+        """
+        Cluster centroids with counts for a zoom level.
+        Cells holding a single academic, and every zoom from expand_zoom up,
+        return the academics themselves.
+        """
+        if zoom >= self.expand_zoom:
+            return list(self.points.values())
+
+        return [self._cell_entry(zoom, cell_key, cell) for cell_key, cell in self.levels[zoom].items()]
+
+    def viewport(self, bbox: Tuple[float, float, float, float], zoom: int) -> List[dict]:
+        """
+        Clusters, or academics from expand_zoom up, inside a bounding box.
+        Keys are prefix-scanned from the tiles covering the box, so the work
+        scales with the visible area rather than the global population.
+        """
+        if zoom >= self.expand_zoom:
+            deepest = self.expand_zoom - 1 + CELL_LEVEL_OFFSET
+            results = []
+            for prefix in covering_prefixes(bbox, deepest):
+                position = bisect.bisect_left(self.sorted_keys, (prefix, ""))
+                while position < len(self.sorted_keys) and self.sorted_keys[position][0].startswith(prefix):
+                    point = self.points[self.sorted_keys[position][1]]
+                    if in_bbox(point["lat"], point["lng"], bbox):
+                        results.append(point)
+                    position += 1
+            return results
+
+        level = zoom + CELL_LEVEL_OFFSET
+        cells = self.levels[zoom]
+        cell_keys = self.level_keys[zoom]
+        ranges = bbox_tile_ranges(bbox, level)
+        results = []
+        for prefix in covering_prefixes(bbox, level):
+            position = bisect.bisect_left(cell_keys, prefix)
+            while position < len(cell_keys) and cell_keys[position].startswith(prefix):
+                cell_key = cell_keys[position]
+                tile_x, tile_y = quadkey_tile(cell_key)
+                if any(x0 <= tile_x <= x1 and y0 <= tile_y <= y1 for x0, x1, y0, y1 in ranges):
+                    results.append(self._cell_entry(zoom, cell_key, cells[cell_key]))
+                position += 1
+        return results
+
+    def _cell_entry(self, zoom: int, cell_key: str, cell: List[float]) -> dict:
+        count, sum_lat, sum_lng = cell
+        if count == 1:
+            return self._single_point(cell_key)
+        return {
+            "id": f"cluster-{zoom}-{cell_key}",
+            "type": "cluster",
+            "lat": sum_lat / count,
+            "lng": sum_lng / count,
+            "count": count,
+        }
+
+    def _single_point(self, cell_key: str) -> dict:
+        _, point_id = self.sorted_keys[bisect.bisect_left(self.sorted_keys, (cell_key, ""))]
+        return self.points[point_id]
+
+    def build(self, points: Iterable[dict]):
+        """Rebuild every level from scratch"""
+        self.__init__(self.expand_zoom)
+        for point in points:
+            self.add(point)
+
+    async def load(self, db):
+        """Load every approved academic with a location from the database"""
+        academics = await db.academics.find(
+            {"approval_status": "approved", "latitude": {"$ne": None}},
+            {"_id": 0}
+        ).to_list(None)
+        user_ids = list({academic["user_id"] for academic in academics})
+        users = await db.users.find(
+            {"id": {"$in": user_ids}},
+            {"_id": 0, "id": 1, "first_name": 1, "last_name": 1}
+        ).to_list(None)
+        users_by_id = {user["id"]: user for user in users}
+
+        self.build(globe_point(academic, users_by_id.get(academic["user_id"])) for academic in academics)
+        logger.info(f"Globe index built with {len(self)} approved academics")
@@ -0,0 +1,186 @@
+import math
+import heapq
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def unit_vector(lat: float, lng: float) -> Tuple[float, float, float]:
+    """Point on the unit sphere; chord distance between these orders like great-circle distance"""
+    lat_rad = math.radians(lat)
+    lng_rad = math.radians(lng)
+    return (
+        math.cos(lat_rad) * math.cos(lng_rad),
+        math.cos(lat_rad) * math.sin(lng_rad),
+        math.sin(lat_rad),
+    )
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _squared_distance(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> float:
+    return (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+
+
+class NearbyIndex:
+    """
+    k-d tree over approved academics on the unit sphere, for k-nearest queries.
+
+    Approvals and moves go to a small insert buffer and removals become
+    tombstones; the tree is rebuilt once either grows past sqrt(n), which keeps
+    updates cheap and queries O(log n + buffer). A tree node whose academic is
+    tombstoned or has a newer version in the buffer is stale and skipped.
+    """
+
+    def __init__(self):
+        # id -> (unit vector, lat, lng, research_field, keywords)
+        self.entries: Dict[str, tuple] = {}
+        # Flat tree: node -> (entry id, split axis, split value, left node, right node);
+        # -1 is empty. Split values outlive their entry, so tombstoned nodes still route.
+        self.nodes: List[Tuple[str, int, float, int, int]] = []
+        self.root = -1
+        # Ids the current tree was built over
+        self.tree_ids: Set[str] = set()
+        self.buffer: Set[str] = set()
+        self.tombstones: Set[str] = set()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, academic_id: str, lat: float, lng: float, research_field: Optional[str] = None,
+            keywords: Optional[Iterable[str]] = None):
+        """Add or move an academic; its tree node, if any, stays stale until the next rebuild"""
+        self.entries[academic_id] = (
+            unit_vector(lat, lng), lat, lng, research_field or "", set(keywords or [])
+        )
+        self.tombstones.discard(academic_id)
+        self.buffer.add(academic_id)
+        self._maybe_rebuild()
+
+    def remove(self, academic_id: str):
+        if self.entries.pop(academic_id, None) is None:
+            return
+        self.buffer.discard(academic_id)
+        if academic_id in self.tree_ids:
+            self.tombstones.add(academic_id)
+        self._maybe_rebuild()
+
+    def sync(self, academic: Optional[dict]):
+        """Index an approved academic with a location, or drop it otherwise"""
+        if not academic or not academic.get("id"):
+            return
+        if academic.get("approval_status") == "approved" and academic.get("latitude") is not None:
+            self.add(
+                academic["id"],
+                academic["latitude"],
+                academic["longitude"],
+                academic.get("research_field"),
+                academic.get("keywords")
+            )
+        else:
+            self.remove(academic["id"])
+
+    def _maybe_rebuild(self):
+        limit = max(32, int(math.sqrt(len(self.entries))))
+        if len(self.buffer) > limit or len(self.tombstones) > limit:
+            self.rebuild()
+
+    def rebuild(self):
+        """Build a balanced tree over every live entry and clear the buffer and tombstones"""
+        self.nodes = []
+        self.buffer = set()
+        self.tombstones = set()
+        self.tree_ids = set(self.entries)
+        self.root = self._build(list(self.entries), depth=0)
+
+    def _build(self, ids: List[str], depth: int) -> int:
+        if not ids:
+            return -1
+        axis = depth % 3
+        ids.sort(key=lambda academic_id: self.entries[academic_id][0][axis])
+        middle = len(ids) // 2
+        node = len(self.nodes)
+        self.nodes.append(None)
+        left = self._build(ids[:middle], depth + 1)
+        right = self._build(ids[middle + 1:], depth + 1)
+        self.nodes[node] = (ids[middle], axis, self.entries[ids[middle]][0][axis], left, right)
+        return node
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 10,
+        predicate: Optional[Callable[[tuple], bool]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        The k closest academics passing the predicate, as (id, distance in km).
+        Filtered-out points are skipped during the descent, so the search still
+        stops as soon as k matches bound the remaining branches.
+        """
+        target = unit_vector(lat, lng)
+        # Max-heap of the best k so far, as (-squared chord distance, id)
+        best: List[Tuple[float, str]] = []
+
+        def consider(academic_id: str):
+            entry = self.entries[academic_id]
+            if predicate and not predicate(entry):
+                return
+            distance = _squared_distance(entry[0], target)
+            if len(best) < k:
+                heapq.heappush(best, (-distance, academic_id))
+            elif distance < -best[0][0]:
+                heapq.heapreplace(best, (-distance, academic_id))
+
+        for academic_id in self.buffer:
+            consider(academic_id)
+
+        stack = [self.root] if self.root >= 0 else []
+        while stack:
+            node = stack.pop()
+            academic_id, axis, split, left, right = self.nodes[node]
+            # Skip stale nodes: removed academics, or ones whose current version is buffered
+            if academic_id not in self.tombstones and academic_id not in self.buffer:
+                consider(academic_id)
+            difference = target[axis] - split
+            near, far = (left, right) if difference < 0 else (right, left)
+            if far >= 0 and (len(best) < k or difference * difference < -best[0][0]):
+                stack.append(far)
+            if near >= 0:
+                stack.append(near)
+
+        results = []
+        for _, academic_id in sorted(best, reverse=True):
+            entry = self.entries[academic_id]
+            results.append((academic_id, haversine_km(lat, lng, entry[1], entry[2])))
+        return results
+
+    def build(self, academics: Iterable[dict]):
+        self.__init__()
+        for academic in academics:
+            if academic.get("approval_status") == "approved" and academic.get("latitude") is not None:
+                self.entries[academic["id"]] = (
+                    unit_vector(academic["latitude"], academic["longitude"]),
+                    academic["latitude"],
+                    academic["longitude"],
+                    academic.get("research_field") or "",
+                    set(academic.get("keywords") or []),
+                )
+        self.rebuild()
+
+    async def load(self, db):
+        """Build the tree from every approved academic with a location"""
+        academics = await db.academics.find(
+            {"approval_status": "approved", "latitude": {"$ne": None}},
+            {"_id": 0, "id": 1, "approval_status": 1, "latitude": 1, "longitude": 1,
+             "research_field": 1, "keywords": 1}
+        ).to_list(None)
+        self.build(academics)
+        logger.info(f"Nearby index built with {len(self)} approved academics")
@@ -0,0 +1 @@
+# This file makes the graph directory a Python package
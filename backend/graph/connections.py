@@ -0,0 +1,150 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MAX_PATH_DEPTH = 6
+
+
+def connection_pair_key(user_a: str, user_b: str) -> str:
+    """The same key for a pair of users whichever of them sent the request"""
+    first, second = sorted((user_a, user_b))
+    return f"{first}:{second}"
+
+
+class ConnectionGraph:
+    """
+    Undirected graph of accepted connections, as adjacency sets over interned
+    user ids, so mutual-connection and path queries never touch the database.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.adjacency: List[Set[int]] = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _intern(self, user_id: str) -> int:
+        node = self.index.get(user_id)
+        if node is None:
+            node = len(self.ids)
+            self.index[user_id] = node
+            self.ids.append(user_id)
+            self.adjacency.append(set())
+        return node
+
+    def add_edge(self, user_a: str, user_b: str):
+        if user_a == user_b:
+            return
+        a, b = self._intern(user_a), self._intern(user_b)
+        self.adjacency[a].add(b)
+        self.adjacency[b].add(a)
+
+    def remove_edge(self, user_a: str, user_b: str):
+        a, b = self.index.get(user_a), self.index.get(user_b)
+        if a is None or b is None:
+            return
+        self.adjacency[a].discard(b)
+        self.adjacency[b].discard(a)
+
+    def sync(self, connection: Optional[dict]):
+        """Add the edge for an accepted connection, drop it for any other status"""
+        if not connection:
+            return
+        if connection.get("status") == "accepted":
+            self.add_edge(connection["requester_id"], connection["recipient_id"])
+        else:
+            self.remove_edge(connection["requester_id"], connection["recipient_id"])
+
+    def neighbours(self, user_id: str) -> List[str]:
+        node = self.index.get(user_id)
+        if node is None:
+            return []
+        return [self.ids[other] for other in self.adjacency[node]]
+
+    def degree(self, user_id: str) -> int:
+        node = self.index.get(user_id)
+        return len(self.adjacency[node]) if node is not None else 0
+
+    def mutual(self, user_a: str, user_b: str) -> List[str]:
+        """Users connected to both, sorted by id"""
+        a, b = self.index.get(user_a), self.index.get(user_b)
+        if a is None or b is None:
+            return []
+        smaller, larger = sorted((self.adjacency[a], self.adjacency[b]), key=len)
+        return sorted(self.ids[node] for node in smaller if node in larger)
+
+    def path(self, source: str, target: str, max_depth: int = MAX_PATH_DEPTH) -> Optional[List[str]]:
+        """
+        A shortest chain of connections from source to target, both included,
+        or None if there is none within max_depth hops. Bidirectional BFS always
+        expands the smaller frontier, so only about the square root of the
+        one-sided search space is visited.
+        """
+        start, goal = self.index.get(source), self.index.get(target)
+        if start is None or goal is None:
+            return [source] if source == target else None
+        if start == goal:
+            return [source]
+
+        # node -> the node it was reached from, per direction
+        forward: Dict[int, int] = {start: -1}
+        backward: Dict[int, int] = {goal: -1}
+        forward_frontier, backward_frontier = [start], [goal]
+        depth = 0
+
+        while forward_frontier and backward_frontier and depth < max_depth:
+            depth += 1
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            frontier = forward_frontier if expand_forward else backward_frontier
+            seen, other = (forward, backward) if expand_forward else (backward, forward)
+
+            next_frontier = []
+            meeting = None
+            for node in frontier:
+                for neighbour in self.adjacency[node]:
+                    if neighbour in seen:
+                        continue
+                    seen[neighbour] = node
+                    if neighbour in other:
+                        meeting = neighbour
+                        break
+                    next_frontier.append(neighbour)
+                if meeting is not None:
+                    return self._join(forward, backward, meeting)
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+        return None
+
+    def _join(self, forward: Dict[int, int], backward: Dict[int, int], meeting: int) -> List[str]:
+        chain = []
+        node = meeting
+        while node != -1:
+            chain.append(node)
+            node = forward[node]
+        chain.reverse()
+        node = backward[meeting]
+        while node != -1:
+            chain.append(node)
+            node = backward[node]
+        return [self.ids[node] for node in chain]
+
+    def build(self, connections: Iterable[dict]):
+        self.__init__()
+        for connection in connections:
+            if connection.get("status") == "accepted":
+                self.add_edge(connection["requester_id"], connection["recipient_id"])
+
+    async def load(self, db):
+        """Build the graph from every accepted connection"""
+        connections = await db.connections.find(
+            {"status": "accepted"},
+            {"_id": 0, "requester_id": 1, "recipient_id": 1, "status": 1}
+        ).to_list(None)
+        self.build(connections)
+        logger.info(f"Connection graph built with {len(connections)} connections between {len(self)} users")
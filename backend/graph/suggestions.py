@@ -0,0 +1,392 @@
+import asyncio
+import heapq
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from pymongo import UpdateMany, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+SUGGESTIONS_COLLECTION = "connection_suggestions"
+TOP_K = 50
+# Worker processes for the batch refresh, leaving a core for the API
+MAX_WORKERS = 4
+DEFAULT_WORKERS = max(1, min(MAX_WORKERS, (os.cpu_count() or 1) - 1))
+
+# How much each kind of overlap contributes to a score in [0, 1]
+WEIGHTS = {"interests": 0.6, "institution": 0.2, "city": 0.15, "country": 0.05}
+
+# (research interests, institution, country, city), normalized
+Features = Tuple[FrozenSet[str], str, str, str]
+
+
+def _normalize(value) -> str:
+    return str(value).strip().lower() if value else ""
+
+
+def profile_features(profile: dict) -> Features:
+    return (
+        frozenset(_normalize(interest) for interest in profile.get("research_interests") or [] if interest),
+        _normalize(profile.get("institution_name")),
+        _normalize(profile.get("country")),
+        _normalize(profile.get("city")),
+    )
+
+
+class SuggestionModel:
+    """
+    Approved researchers' features with inverted indexes for candidate lookup.
+
+    Scores are an IDF-weighted Jaccard overlap of research interests, so a
+    shared niche interest counts for more than a shared common one, plus
+    fixed weights for the same institution, city and country.
+    """
+
+    def __init__(self):
+        self.features: Dict[str, Features] = {}
+        self.by_interest: Dict[str, Set[str]] = {}
+        self.by_institution: Dict[str, Set[str]] = {}
+        self.by_city: Dict[Tuple[str, str], Set[str]] = {}
+
+    def __len__(self):
+        return len(self.features)
+
+    def _postings(self, features: Features) -> List[Tuple[dict, object]]:
+        interests, institution, country, city = features
+        postings = [(self.by_interest, interest) for interest in interests]
+        if institution:
+            postings.append((self.by_institution, institution))
+        if city:
+            postings.append((self.by_city, (country, city)))
+        return postings
+
+    def add(self, user_id: str, features: Features):
+        self.remove(user_id)
+        self.features[user_id] = features
+        for index, key in self._postings(features):
+            index.setdefault(key, set()).add(user_id)
+
+    def remove(self, user_id: str):
+        features = self.features.pop(user_id, None)
+        if features is None:
+            return
+        for index, key in self._postings(features):
+            users = index.get(key)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del index[key]
+
+    def sync(self, profile: Optional[dict]):
+        """Index an approved profile, or drop it otherwise"""
+        if not profile or not profile.get("user_id"):
+            return
+        if profile.get("status") == "approved":
+            self.add(profile["user_id"], profile_features(profile))
+        else:
+            self.remove(profile["user_id"])
+
+    def idf(self, interest: str) -> float:
+        return math.log(1 + len(self.features) / (1 + len(self.by_interest.get(interest, ()))))
+
+    def score(self, features: Features, other: Features) -> float:
+        interests, institution, country, city = features
+        other_interests, other_institution, other_country, other_city = other
+        score = 0.0
+        shared = interests & other_interests
+        if shared:
+            union = interests | other_interests
+            score += WEIGHTS["interests"] * (
+                sum(self.idf(interest) for interest in shared)
+                / sum(self.idf(interest) for interest in union)
+            )
+        if institution and institution == other_institution:
+            score += WEIGHTS["institution"]
+        if country and country == other_country:
+            score += WEIGHTS["country"]
+            if city and city == other_city:
+                score += WEIGHTS["city"]
+        return score
+
+    def top_k(
+        self,
+        user_id: str,
+        k: int = TOP_K,
+        exclude: Iterable[str] = (),
+        features: Optional[Features] = None
+    ) -> List[Tuple[str, float]]:
+        """The k best-scoring other researchers, as (user id, score) sorted best first"""
+        features = features or self.features.get(user_id)
+        if features is None:
+            return []
+        candidates: Set[str] = set()
+        for index, key in self._postings(features):
+            candidates.update(index.get(key, ()))
+        candidates.discard(user_id)
+        candidates.difference_update(exclude)
+
+        scored = []
+        for candidate in candidates:
+            score = self.score(features, self.features[candidate])
+            if score > 0:
+                scored.append((round(score, 6), candidate))
+        return [(candidate, score) for score, candidate in heapq.nlargest(k, scored)]
+
+    def build(self, profiles: Iterable[dict]):
+        self.__init__()
+        for profile in profiles:
+            self.sync(profile)
+
+
+# Batch refresh runs in worker processes, each holding a copy of the model
+_worker_model: Optional[SuggestionModel] = None
+
+
+def _init_worker(features: Dict[str, Features]):
+    global _worker_model
+    _worker_model = SuggestionModel()
+    for user_id, user_features in features.items():
+        _worker_model.add(user_id, user_features)
+
+
+def _top_k_chunk(user_ids: List[str], exclusions: Dict[str, Set[str]], k: int) -> List[Tuple[str, List[Tuple[str, float]]]]:
+    return [
+        (user_id, _worker_model.top_k(user_id, k, exclusions.get(user_id, ())))
+        for user_id in user_ids
+    ]
+
+
+def _suggestion_document(candidates: List[Tuple[str, float]]) -> dict:
+    return {
+        "candidates": [{"user_id": candidate, "score": score} for candidate, score in candidates],
+        "updated_at": datetime.now(),
+    }
+
+
+class SuggestionEngine:
+    """
+    Precomputed top-K connection suggestions per researcher.
+
+    A batch job scores every approved researcher and stores each ranked list
+    under the user's id, so serving suggestions is one keyed read. A profile
+    change re-ranks that user's list and pushes the user into the lists of
+    their new candidates in one bulk write.
+
+    The batch job only starts worker processes when there is more than one
+    chunk of researchers to score, and no more than there are chunks. Each
+    run stamps the lists it writes with a generation (its start time), which
+    also tells a restarted server whether a refresh is due yet.
+    """
+
+    def __init__(self, k: int = TOP_K, workers: int = DEFAULT_WORKERS,
+                 chunk_size: int = 500, refresh_hours: float = 24.0):
+        self.k = k
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.refresh_hours = refresh_hours
+        self.model = SuggestionModel()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _exclusions(self, db, user_ids: Optional[List[str]] = None) -> Dict[str, Set[str]]:
+        """Users each researcher is already connected to, or has a pending request with"""
+        query = {"status": {"$in": ["pending", "accepted"]}}
+        if user_ids is not None:
+            query["$or"] = [{"requester_id": {"$in": user_ids}}, {"recipient_id": {"$in": user_ids}}]
+        connections = await db.connections.find(
+            query, {"_id": 0, "requester_id": 1, "recipient_id": 1}
+        ).to_list(None)
+        exclusions: Dict[str, Set[str]] = {}
+        for connection in connections:
+            exclusions.setdefault(connection["requester_id"], set()).add(connection["recipient_id"])
+            exclusions.setdefault(connection["recipient_id"], set()).add(connection["requester_id"])
+        return exclusions
+
+    async def excluded_ids(self, db, user_id: str) -> Set[str]:
+        """Users never to suggest to one researcher: themselves and anyone connected or with a pending request"""
+        exclusions = await self._exclusions(db, [user_id])
+        return {user_id, *exclusions.get(user_id, ())}
+
+    async def load(self, db):
+        profiles = await db.researcher_profiles.find(
+            {"status": "approved"},
+            {"_id": 0, "user_id": 1, "status": 1, "research_interests": 1,
+             "institution_name": 1, "country": 1, "city": 1}
+        ).to_list(None)
+        self.model.build(profiles)
+        logger.info(f"Suggestion model built with {len(self.model)} approved researchers")
+
+    def _rank_inline(self, chunks: List[List[str]], exclusions: Dict[str, Set[str]]):
+        return [
+            [(user_id, self.model.top_k(user_id, self.k, exclusions.get(user_id, ()))) for user_id in chunk]
+            for chunk in chunks
+        ]
+
+    async def refresh_all(self, db):
+        """Recompute every stored list and drop the lists of researchers no longer approved"""
+        generation = datetime.now()
+        exclusions = await self._exclusions(db)
+        user_ids = sorted(self.model.features)
+        chunks = [user_ids[i:i + self.chunk_size] for i in range(0, len(user_ids), self.chunk_size)]
+        collection = db[SUGGESTIONS_COLLECTION]
+
+        async def store(results: List[Tuple[str, List[Tuple[str, float]]]]):
+            await collection.bulk_write([
+                UpdateOne(
+                    {"_id": user_id},
+                    {"$set": {**_suggestion_document(candidates), "generation": generation}},
+                    upsert=True
+                )
+                for user_id, candidates in results
+            ], ordered=False)
+
+        if len(chunks) <= 1 or self.workers <= 1:
+            # Not worth starting processes for; rank off the event loop in a thread
+            for results in await asyncio.to_thread(self._rank_inline, chunks, exclusions):
+                await store(results)
+        else:
+            loop = asyncio.get_running_loop()
+            pool = ProcessPoolExecutor(
+                max_workers=min(self.workers, len(chunks)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(dict(self.model.features),)
+            )
+            try:
+                futures = [
+                    loop.run_in_executor(
+                        pool, _top_k_chunk, chunk,
+                        {user_id: exclusions[user_id] for user_id in chunk if user_id in exclusions}, self.k
+                    )
+                    for chunk in chunks
+                ]
+                for future in asyncio.as_completed(futures):
+                    await store(await future)
+            finally:
+                # Don't block the event loop joining the workers
+                pool.shutdown(wait=False)
+
+        # Lists this run didn't write belong to researchers who are no longer approved;
+        # lists first created by refresh_users during the run carry a later generation
+        await collection.delete_many({"generation": {"$not": {"$gte": generation}}})
+        logger.info(f"Refreshed connection suggestions for {len(user_ids)} researchers")
+
+    async def seconds_until_refresh(self, db) -> float:
+        """Time left before the stored lists are refresh_hours old; 0 if there are none"""
+        latest = await db[SUGGESTIONS_COLLECTION].find_one(
+            {"generation": {"$exists": True}}, {"generation": 1}, sort=[("generation", -1)]
+        )
+        if latest is None:
+            return 0.0
+        age = (datetime.now() - latest["generation"]).total_seconds()
+        return max(0.0, self.refresh_hours * 3600 - age)
+
+    async def sync(self, db, profile: Optional[dict]):
+        """Apply a profile write to the model and the stored lists"""
+        await self.sync_many(db, [profile])
+
+    async def sync_many(self, db, profiles: List[Optional[dict]]):
+        """Apply several profile writes, re-ranking their users together"""
+        user_ids = []
+        for profile in profiles:
+            if profile and profile.get("user_id"):
+                self.model.sync(profile)
+                user_ids.append(profile["user_id"])
+        if user_ids:
+            await self.refresh_users(db, user_ids)
+
+    async def refresh_user(self, db, user_id: str):
+        """Re-rank one researcher after a profile change and update the lists they now belong in"""
+        await self.refresh_users(db, [user_id])
+
+    async def refresh_users(self, db, user_ids: List[str]):
+        """
+        Re-rank researchers after profile changes and update the lists they
+        now belong in, with one exclusions read and one bulk write in all.
+        """
+        collection = db[SUGGESTIONS_COLLECTION]
+        operations = [UpdateMany(
+            {"candidates.user_id": {"$in": user_ids}},
+            {"$pull": {"candidates": {"user_id": {"$in": user_ids}}}}
+        )]
+        batch = set(user_ids)
+        ranked = [user_id for user_id in user_ids if user_id in self.model.features]
+        exclusions = await self._exclusions(db, ranked) if ranked else {}
+        pushes = []
+        for user_id in user_ids:
+            if user_id not in self.model.features:
+                operations.append(UpdateOne({"_id": user_id}, {"$set": _suggestion_document([])}))
+                continue
+            candidates = self.model.top_k(user_id, self.k, exclusions.get(user_id, ()))
+            operations.append(UpdateOne(
+                {"_id": user_id},
+                {"$set": _suggestion_document(candidates), "$setOnInsert": {"generation": datetime.now()}},
+                upsert=True
+            ))
+            # Scores are symmetric, so each candidate may now rank this user; $slice keeps their top k.
+            # Candidates re-ranked in this same batch already got an exact fresh list.
+            for candidate, score in candidates:
+                if candidate in batch:
+                    continue
+                pushes.append(UpdateOne({"_id": candidate}, {"$push": {"candidates": {
+                    "$each": [{"user_id": user_id, "score": score}],
+                    "$sort": {"score": -1},
+                    "$slice": self.k,
+                }}}))
+        await collection.bulk_write(operations + pushes, ordered=True)
+
+    async def forget_pair(self, db, user_a: str, user_b: str):
+        """Drop two users from each other's lists once a request is made between them"""
+        await db[SUGGESTIONS_COLLECTION].bulk_write([
+            UpdateOne({"_id": user_a}, {"$pull": {"candidates": {"user_id": user_b}}}),
+            UpdateOne({"_id": user_b}, {"$pull": {"candidates": {"user_id": user_a}}}),
+        ], ordered=False)
+
+    async def suggested_ids(self, db, user_id: str, limit: int) -> List[str]:
+        """
+        The stored ranking for a user. Users without a stored list, such as
+        researchers whose profile is not approved yet, are ranked on the fly
+        from their current profile.
+        """
+        document = await db[SUGGESTIONS_COLLECTION].find_one({"_id": user_id}, {"candidates": 1})
+        if document is not None:
+            return [candidate["user_id"] for candidate in document.get("candidates", [])[:limit]]
+
+        profile = await db.researcher_profiles.find_one({"user_id": user_id})
+        if not profile:
+            return []
+        exclusions = await self._exclusions(db, [user_id])
+        candidates = self.model.top_k(
+            user_id, limit, exclusions.get(user_id, ()), features=profile_features(profile)
+        )
+        return [candidate for candidate, _ in candidates]
+
+    async def _run(self, db):
+        try:
+            # A restart doesn't redo a recent refresh
+            await asyncio.sleep(await self.seconds_until_refresh(db))
+        except Exception as e:
+            logger.error(f"Failed to read connection suggestions age: {str(e)}")
+        while True:
+            try:
+                await self.refresh_all(db)
+            except Exception as e:
+                logger.error(f"Failed to refresh connection suggestions: {str(e)}")
+            await asyncio.sleep(self.refresh_hours * 3600)
+
+    def start(self, db):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
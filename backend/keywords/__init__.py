@@ -0,0 +1 @@
+# This file makes the keywords directory a Python package
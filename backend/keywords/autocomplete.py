@@ -0,0 +1,103 @@
+import bisect
+import heapq
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+from .synonyms import keyword_key
+
+logger = logging.getLogger(__name__)
+
+# Prefix ranges wider than this are ranked once and cached until a keyword under them changes
+SCAN_LIMIT = 1024
+MAX_COMPLETIONS = 50
+
+
+class KeywordCompleter:
+    """
+    Prefix completion over keyword names, ranked by usage count.
+
+    Names live in a sorted array, so a prefix is a binary-searched range.
+    Narrow ranges are ranked on the fly; broad ones (one or two letters) are
+    ranked once and cached, and a count change only drops the cached
+    rankings of the keyword's own prefixes. Spellings sharing a keyword_key
+    are one entry, with their counts summed under the most used spelling.
+    """
+
+    def __init__(self):
+        self.keys: List[str] = []
+        # keyword_key -> (display name, usage count)
+        self.entries: Dict[str, Tuple[str, int]] = {}
+        self.top_cache: Dict[str, List[Tuple[int, str]]] = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _invalidate(self, key: str):
+        for end in range(len(key) + 1):
+            self.top_cache.pop(key[:end], None)
+
+    def set_count(self, name: str, count: int):
+        """Add, re-rank or (at count 0) remove a keyword"""
+        key = keyword_key(name)
+        if not key:
+            return
+        position = bisect.bisect_left(self.keys, key)
+        present = position < len(self.keys) and self.keys[position] == key
+        if count > 0:
+            if not present:
+                self.keys.insert(position, key)
+            self.entries[key] = (name, count)
+        elif present:
+            del self.keys[position]
+            del self.entries[key]
+        else:
+            return
+        self._invalidate(key)
+
+    def apply(self, deltas: Dict[str, int]):
+        """Apply usage count changes as recorded by the keyword registry"""
+        for name, delta in deltas.items():
+            display, count = self.entries.get(keyword_key(name), (name, 0))
+            self.set_count(display, count + delta)
+
+    def _rank(self, low: int, high: int, limit: int) -> List[Tuple[int, str]]:
+        """(count, key) of the most used keys in keys[low:high], ties in alphabetical order"""
+        best = heapq.nsmallest(limit, ((-self.entries[key][1], key) for key in self.keys[low:high]))
+        return [(-negative_count, key) for negative_count, key in best]
+
+    def complete(self, prefix: str, limit: int = 10) -> List[dict]:
+        """The most used keywords starting with prefix, as {name, count}"""
+        prefix = keyword_key(prefix)
+        limit = min(limit, MAX_COMPLETIONS)
+        low = bisect.bisect_left(self.keys, prefix)
+        high = bisect.bisect_left(self.keys, prefix + "\uffff", low)
+        if high - low <= SCAN_LIMIT:
+            ranked = self._rank(low, high, limit)
+        else:
+            ranked = self.top_cache.get(prefix)
+            if ranked is None:
+                ranked = self._rank(low, high, MAX_COMPLETIONS)
+                self.top_cache[prefix] = ranked
+            ranked = ranked[:limit]
+        return [{"name": self.entries[key][0], "count": count} for count, key in ranked]
+
+    def build(self, keywords: Iterable[dict]):
+        self.__init__()
+        best: Dict[str, Tuple[int, str]] = {}
+        for keyword in keywords:
+            key = keyword_key(keyword.get("name"))
+            count = keyword.get("count", 0)
+            if not key or count <= 0:
+                continue
+            _, total = self.entries.get(key, ("", 0))
+            if count > best.get(key, (0, ""))[0]:
+                best[key] = (count, keyword["name"])
+            self.entries[key] = (best[key][1], total + count)
+        self.keys = sorted(self.entries)
+
+    async def load(self, db):
+        keywords = await db.keywords.find(
+            {"count": {"$gt": 0}}, {"_id": 0, "name": 1, "count": 1}
+        ).to_list(None)
+        self.build(keywords)
+        logger.info(f"Keyword completer built with {len(self)} keywords")
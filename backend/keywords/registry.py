@@ -0,0 +1,75 @@
+import logging
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+
+def keyword_deltas(before: Optional[Iterable[str]], after: Optional[Iterable[str]]) -> Dict[str, int]:
+    """Usage count changes when a profile's keywords go from before to after"""
+    before_set = {keyword for keyword in before or [] if keyword}
+    after_set = {keyword for keyword in after or [] if keyword}
+    deltas = {keyword: 1 for keyword in after_set - before_set}
+    deltas.update({keyword: -1 for keyword in before_set - after_set})
+    return deltas
+
+
+class KeywordRegistry:
+    """
+    The keywords collection, with how many academic profiles use each keyword.
+    Each profile write applies its keyword changes as one unordered bulk write.
+    """
+
+    async def record_change(
+        self, db, before: Optional[Iterable[str]], after: Optional[Iterable[str]]
+    ) -> Dict[str, int]:
+        """Apply the usage changes and return them, for in-memory keyword indexes to follow"""
+        deltas = keyword_deltas(before, after)
+        operations = [
+            UpdateOne(
+                {"name": keyword},
+                {"$inc": {"count": delta}, "$setOnInsert": {"id": str(uuid.uuid4())}},
+                upsert=True
+            )
+            for keyword, delta in deltas.items()
+        ]
+        if operations:
+            await db.keywords.bulk_write(operations, ordered=False)
+        return deltas
+
+    async def recount(self, db):
+        """Recount every keyword's usage from the academics collection"""
+        results = await db.academics.aggregate([
+            {"$match": {"keywords.0": {"$exists": True}}},
+            # A profile counts once per keyword, as in keyword_deltas, even if it lists one twice
+            {"$project": {"keywords": {"$setUnion": ["$keywords", []]}}},
+            {"$unwind": "$keywords"},
+            {"$group": {"_id": "$keywords", "count": {"$sum": 1}}},
+        ]).to_list(None)
+        counts = {result["_id"]: result["count"] for result in results if result["_id"]}
+
+        existing = await db.keywords.distinct("name")
+        operations = [
+            UpdateOne(
+                {"name": name},
+                {"$set": {"count": counts.get(name, 0)}, "$setOnInsert": {"id": str(uuid.uuid4())}},
+                upsert=True
+            )
+            for name in set(existing) | set(counts)
+        ]
+        if operations:
+            await db.keywords.bulk_write(operations, ordered=False)
+        logger.info(f"Recounted usage of {len(operations)} keywords")
+
+    async def ensure_counted(self, db):
+        """Seed usage counts on first start, when keywords predate counting"""
+        if await db.keywords.find_one({"count": {"$exists": False}}, {"_id": 1}):
+            await self.recount(db)
+
+    async def in_use(self, db) -> List[dict]:
+        """Every keyword used by at least one profile, most used first"""
+        return await db.keywords.find(
+            {"count": {"$gt": 0}}, {"_id": 0, "id": 1, "name": 1, "count": 1}
+        ).sort([("count", DESCENDING), ("name", ASCENDING)]).to_list(None)
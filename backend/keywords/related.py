@@ -0,0 +1,164 @@
+import logging
+import math
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .synonyms import clean_keyword, keyword_key
+
+logger = logging.getLogger(__name__)
+
+# Related keywords must co-occur at least this often and score at least this high
+MIN_COOCCURRENCE = 2
+MIN_EXPANSION_SCORE = 0.2
+
+
+class KeywordCooccurrence:
+    """
+    Sparse co-occurrence counts between keywords that appear on the same
+    approved academic or researcher profile.
+
+    Built in one vectorized pass at startup and adjusted per profile write,
+    so related-keyword lookups and query expansion never scan the database.
+    Relatedness is the cosine of the two keywords' document sets.
+    """
+
+    def __init__(self):
+        # keyword key -> display name, as first seen
+        self.names: Dict[str, str] = {}
+        self.frequency: Counter = Counter()
+        self.pairs: Dict[str, Counter] = {}
+        # "academic:<id>" / "profile:<id>" -> keyword keys the document contributes
+        self.doc_terms: Dict[str, FrozenSet[str]] = {}
+
+    def __len__(self):
+        return len(self.frequency)
+
+    def _terms(self, keywords: Optional[Iterable[str]]) -> FrozenSet[str]:
+        terms = set()
+        for name in keywords or []:
+            key = keyword_key(name)
+            if key:
+                self.names.setdefault(key, clean_keyword(name))
+                terms.add(key)
+        return frozenset(terms)
+
+    def _apply(self, terms: FrozenSet[str], sign: int):
+        for term in terms:
+            self.frequency[term] += sign
+            if self.frequency[term] <= 0:
+                del self.frequency[term]
+            neighbours = self.pairs.setdefault(term, Counter())
+            for other in terms:
+                if other != term:
+                    neighbours[other] += sign
+                    if neighbours[other] <= 0:
+                        del neighbours[other]
+            if not neighbours:
+                del self.pairs[term]
+
+    def sync(self, doc_key: str, keywords: Optional[Iterable[str]], public: bool):
+        """Replace a document's contribution; documents that are not public contribute nothing"""
+        terms = self._terms(keywords) if public else frozenset()
+        previous = self.doc_terms.get(doc_key, frozenset())
+        if terms == previous:
+            return
+        self._apply(previous, -1)
+        self._apply(terms, 1)
+        if terms:
+            self.doc_terms[doc_key] = terms
+        else:
+            self.doc_terms.pop(doc_key, None)
+
+    def sync_academic(self, academic: Optional[dict]):
+        if academic and academic.get("id"):
+            self.sync(f"academic:{academic['id']}", academic.get("keywords"),
+                      academic.get("approval_status") == "approved")
+
+    def sync_profile(self, profile: Optional[dict]):
+        if profile and profile.get("id"):
+            self.sync(f"profile:{profile['id']}", profile.get("research_interests"),
+                      profile.get("status") == "approved")
+
+    def related(self, name: str, limit: int = 10) -> List[dict]:
+        """Keywords most often found alongside name, strongest first"""
+        key = keyword_key(name)
+        neighbours = self.pairs.get(key)
+        if not neighbours:
+            return []
+        frequency = self.frequency[key]
+        scored = [
+            (count / math.sqrt(frequency * self.frequency[other]), count, other)
+            for other, count in neighbours.items() if count >= MIN_COOCCURRENCE
+        ]
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [
+            {"name": self.names.get(other, other), "count": count, "score": round(score, 4)}
+            for score, count, other in scored[:limit]
+        ]
+
+    def expand(self, keywords: Iterable[str], per_keyword: int = 5) -> List[str]:
+        """The keywords plus their strongest related keywords, for widening a filter"""
+        expanded = list(keywords)
+        for name in keywords:
+            for related in self.related(name, per_keyword):
+                if related["score"] >= MIN_EXPANSION_SCORE and related["name"] not in expanded:
+                    expanded.append(related["name"])
+        return expanded
+
+    def build(self, documents: Iterable[Tuple[str, Iterable[str]]]):
+        """
+        Count every pair at once: documents are grouped by keyword count so
+        each group's pairs come out of one array indexing step, and pair codes
+        are tallied with a single np.unique.
+        """
+        self.__init__()
+        vocabulary: Dict[str, int] = {}
+        by_size: Dict[int, List[List[int]]] = {}
+        for doc_key, keywords in documents:
+            terms = self._terms(keywords)
+            if not terms:
+                continue
+            self.doc_terms[doc_key] = terms
+            ids = sorted(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+            by_size.setdefault(len(ids), []).append(ids)
+
+        terms_by_id = [None] * len(vocabulary)
+        for term, term_id in vocabulary.items():
+            terms_by_id[term_id] = term
+        size = max(len(vocabulary), 1)
+
+        frequency = np.zeros(size, dtype=np.int64)
+        codes = []
+        for doc_size, rows in by_size.items():
+            matrix = np.asarray(rows, dtype=np.int64)
+            np.add.at(frequency, matrix.ravel(), 1)
+            if doc_size > 1:
+                first, second = np.triu_indices(doc_size, k=1)
+                codes.append(matrix[:, first].ravel() * size + matrix[:, second].ravel())
+
+        for term_id in np.nonzero(frequency)[0]:
+            self.frequency[terms_by_id[term_id]] = int(frequency[term_id])
+        if codes:
+            pair_codes, counts = np.unique(np.concatenate(codes), return_counts=True)
+            for code, count in zip(pair_codes.tolist(), counts.tolist()):
+                a, b = terms_by_id[code // size], terms_by_id[code % size]
+                self.pairs.setdefault(a, Counter())[b] = count
+                self.pairs.setdefault(b, Counter())[a] = count
+
+    async def load(self, db):
+        """Build from every approved academic's keywords and researcher's interests"""
+        academics = await db.academics.find(
+            {"approval_status": "approved", "keywords.0": {"$exists": True}}, {"_id": 0, "id": 1, "keywords": 1}
+        ).to_list(None)
+        profiles = await db.researcher_profiles.find(
+            {"status": "approved", "research_interests.0": {"$exists": True}},
+            {"_id": 0, "id": 1, "research_interests": 1}
+        ).to_list(None)
+        self.build(
+            [(f"academic:{academic['id']}", academic["keywords"]) for academic in academics]
+            + [(f"profile:{profile['id']}", profile["research_interests"]) for profile in profiles]
+        )
+        pair_count = sum(len(neighbours) for neighbours in self.pairs.values()) // 2
+        logger.info(f"Keyword co-occurrence built with {len(self)} keywords and {pair_count} pairs")
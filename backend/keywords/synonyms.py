@@ -0,0 +1,168 @@
+import logging
+import re
+import time
+import unicodedata
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+SYNONYMS_COLLECTION = "keyword_synonyms"
+
+_SEPARATORS = re.compile(r"[-_/]+")
+
+
+def keyword_key(name: str) -> str:
+    """Normalized form two spellings of the same keyword share: NFKC, lower case, one space between words"""
+    name = unicodedata.normalize("NFKC", name or "").lower()
+    return " ".join(_SEPARATORS.sub(" ", name).split())
+
+
+def clean_keyword(name: str) -> str:
+    """The keyword as typed, with whitespace tidied"""
+    return " ".join(unicodedata.normalize("NFKC", name or "").split())
+
+
+class KeywordCanonicalizer:
+    """
+    Maps keyword spellings and admin-defined synonyms to one canonical name.
+
+    Spellings that normalize alike ("Machine Learning", "machine-learning")
+    share the canonical name of the most used existing spelling; the synonym
+    table folds different terms ("ML") into another keyword. Both are cached
+    in process and reloaded after ttl_seconds to pick up other workers' edits.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        # keyword key -> canonical display name
+        self.names: Dict[str, str] = {}
+        # alias key -> canonical keyword key
+        self.synonyms: Dict[str, str] = {}
+        # alias key -> alias as the admin entered it
+        self.alias_names: Dict[str, str] = {}
+        # keyword key -> every spelling of it in the keywords collection, as stored
+        self.spellings: Dict[str, Set[str]] = {}
+        self.expires_at = 0.0
+
+    def _resolve_key(self, key: str) -> str:
+        return self.synonyms.get(key, key)
+
+    def canonical(self, name: str) -> Optional[str]:
+        """The canonical name for a keyword, registering a new spelling on first sight"""
+        key = self._resolve_key(keyword_key(name))
+        if not key:
+            return None
+        if key not in self.names:
+            self.names[key] = clean_keyword(name) if keyword_key(name) == key else key
+        return self.names[key]
+
+    def canonicalize(self, keywords: Optional[Iterable[str]]) -> List[str]:
+        """Canonical names for a keyword list, deduplicated, in the order given"""
+        result = []
+        for name in keywords or []:
+            canonical = self.canonical(name)
+            if canonical and canonical not in result:
+                result.append(canonical)
+        return result
+
+    def expand(self, keywords: Optional[Iterable[str]]) -> List[str]:
+        """
+        Every spelling a keyword filter should match, so documents not yet
+        re-canonicalized match too: the canonical name, its synonyms, and the
+        case and separator variants of both that the keywords collection
+        held at the last load. Variants written since then are not included.
+        """
+        expanded: Set[str] = set()
+        for name in keywords or []:
+            key = self._resolve_key(keyword_key(name))
+            if not key:
+                continue
+            expanded.add(clean_keyword(name))
+            expanded.add(self.names.get(key, clean_keyword(name)))
+            expanded.update(self.spellings.get(key, ()))
+            for alias_key, target in self.synonyms.items():
+                if target == key:
+                    expanded.add(self.alias_names.get(alias_key, alias_key))
+                    expanded.update(self.spellings.get(alias_key, ()))
+        return sorted(expanded)
+
+    async def load(self, db):
+        keywords = await db.keywords.find({}, {"_id": 0, "name": 1, "count": 1}).to_list(None)
+        keywords.sort(key=lambda keyword: -(keyword.get("count") or 0))
+        names: Dict[str, str] = {}
+        spellings: Dict[str, Set[str]] = {}
+        for keyword in keywords:
+            key = keyword_key(keyword.get("name", ""))
+            if key:
+                names.setdefault(key, clean_keyword(keyword["name"]))
+                spellings.setdefault(key, set()).add(keyword["name"])
+
+        synonyms = await db[SYNONYMS_COLLECTION].find({}).to_list(None)
+        self.synonyms = {synonym["_id"]: synonym["canonical_key"] for synonym in synonyms}
+        self.alias_names = {synonym["_id"]: synonym["alias"] for synonym in synonyms}
+        for synonym in synonyms:
+            names.setdefault(synonym["canonical_key"], synonym["canonical"])
+        self.names = names
+        self.spellings = spellings
+        self.expires_at = time.monotonic() + self.ttl_seconds
+
+    async def refresh(self, db):
+        """Reload if the cached tables are older than the TTL"""
+        if time.monotonic() >= self.expires_at:
+            await self.load(db)
+
+    async def set_synonym(self, db, alias: str, canonical: str) -> dict:
+        alias_key = keyword_key(alias)
+        canonical_name = self.canonical(canonical)
+        canonical_key = keyword_key(canonical_name or "")
+        if not alias_key or not canonical_key or alias_key == canonical_key:
+            raise ValueError("A synonym needs an alias and a different canonical keyword")
+        if alias_key in self.synonyms.values():
+            raise ValueError(f"'{alias}' is itself the canonical keyword of other synonyms")
+        synonym = {
+            "alias": clean_keyword(alias),
+            "canonical": canonical_name,
+            "canonical_key": canonical_key,
+            "updated_at": datetime.now(),
+        }
+        await db[SYNONYMS_COLLECTION].update_one({"_id": alias_key}, {"$set": synonym}, upsert=True)
+        self.synonyms[alias_key] = canonical_key
+        self.alias_names[alias_key] = synonym["alias"]
+        return {"alias_key": alias_key, **synonym}
+
+    async def remove_synonym(self, db, alias: str) -> bool:
+        alias_key = keyword_key(alias)
+        result = await db[SYNONYMS_COLLECTION].delete_one({"_id": alias_key})
+        self.synonyms.pop(alias_key, None)
+        self.alias_names.pop(alias_key, None)
+        return result.deleted_count > 0
+
+    async def list_synonyms(self, db) -> List[dict]:
+        synonyms = await db[SYNONYMS_COLLECTION].find({}).sort("_id", 1).to_list(None)
+        return [
+            {"alias_key": synonym["_id"], "alias": synonym["alias"], "canonical": synonym["canonical"]}
+            for synonym in synonyms
+        ]
+
+    async def recanonicalize(self, db, batch_size: int = 500) -> int:
+        """Rewrite every academic's keywords in canonical form; returns how many documents changed"""
+        await self.load(db)
+        changed = 0
+        operations = []
+        cursor = db.academics.find({"keywords.0": {"$exists": True}}, {"_id": 0, "id": 1, "keywords": 1})
+        async for academic in cursor:
+            canonical = self.canonicalize(academic["keywords"])
+            if canonical != academic["keywords"]:
+                operations.append(UpdateOne({"id": academic["id"]}, {"$set": {"keywords": canonical}}))
+            if len(operations) >= batch_size:
+                await db.academics.bulk_write(operations, ordered=False)
+                changed += len(operations)
+                operations = []
+        if operations:
+            await db.academics.bulk_write(operations, ordered=False)
+            changed += len(operations)
+        logger.info(f"Re-canonicalized keywords on {changed} academic profiles")
+        return changed
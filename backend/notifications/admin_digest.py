@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from typing import List, Optional
+
+from .outbox import enqueue_emails
+
+logger = logging.getLogger(__name__)
+
+
+class AdminRoster:
+    """
+    Cached email addresses of admin users.
+    invalidate() after any write that can change who is an admin; the TTL
+    bounds staleness from writes made by other workers.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self.emails: Optional[List[str]] = None
+        self.expires_at = 0.0
+        self.version = 0
+
+    def invalidate(self):
+        self.version += 1
+        self.emails = None
+
+    async def get(self, db) -> List[str]:
+        if self.emails is not None and self.expires_at > time.monotonic():
+            return self.emails
+        version = self.version
+        admins = await db.users.find({"is_admin": True}, {"_id": 0, "email": 1}).to_list(None)
+        emails = sorted({admin["email"] for admin in admins if admin.get("email")})
+        # A role change while the query ran makes this result stale; serve it once, don't cache it
+        if version == self.version:
+            self.emails = emails
+            self.expires_at = time.monotonic() + self.ttl_seconds
+        return emails
+
+
+class AdminDigest:
+    """
+    Batches admin notifications into one digest email per admin.
+
+    Events are buffered in memory and flushed every window_seconds, so a bulk
+    import of thousands of submissions costs one roster read and one outbox
+    write per admin per window instead of one notification per event per admin.
+    """
+
+    def __init__(self, roster: AdminRoster, window_seconds: float = 60.0, max_listed: int = 50):
+        self.roster = roster
+        self.window_seconds = window_seconds
+        self.max_listed = max_listed
+        self.pending: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, event: str):
+        self.pending.append(event)
+
+    def _body(self, events: List[str]) -> str:
+        lines = [f"- {event}" for event in events[:self.max_listed]]
+        if len(events) > self.max_listed:
+            lines.append(f"...and {len(events) - self.max_listed} more")
+        return (
+            f"{len(events)} new profile submission(s) are waiting for review:\n\n"
+            + "\n".join(lines)
+            + "\n\nBangladesh Academic Network"
+        )
+
+    async def flush(self, db):
+        if not self.pending:
+            return
+        events, self.pending = self.pending, []
+        try:
+            admin_emails = await self.roster.get(db)
+            subject = (
+                "New Profile Submission" if len(events) == 1
+                else f"{len(events)} New Profile Submissions"
+            )
+            body = self._body(events)
+            await enqueue_emails(db, [
+                {"to": email, "subject": subject, "body": body, "kind": "admin_digest"}
+                for email in admin_emails
+            ])
+        except Exception as e:
+            # Keep the events for the next window
+            self.pending = events + self.pending
+            logger.error(f"Failed to queue admin digest: {str(e)}")
+
+    async def _run(self, db):
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            await self.flush(db)
+
+    def start(self, db):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self, db):
+        """Stop the periodic flush and queue whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush(db)
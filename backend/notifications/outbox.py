@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import os
+import smtplib
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_COLLECTION = "email_outbox"
+
+
+@dataclass
+class SmtpConfig:
+    host: str
+    port: int = 587
+    username: Optional[str] = None
+    password: Optional[str] = None
+    from_email: Optional[str] = None
+    use_tls: bool = True
+
+    @classmethod
+    def from_env(cls) -> Optional["SmtpConfig"]:
+        """None when SMTP_SERVER is not set, in which case emails are only logged"""
+        host = os.environ.get("SMTP_SERVER")
+        if not host:
+            return None
+        return cls(
+            host=host,
+            port=int(os.environ.get("SMTP_PORT", 587)),
+            username=os.environ.get("SMTP_USERNAME"),
+            password=os.environ.get("SMTP_PASSWORD"),
+            from_email=os.environ.get("FROM_EMAIL"),
+            use_tls=os.environ.get("SMTP_USE_TLS", "true").lower() != "false",
+        )
+
+
+def build_message(from_email: Optional[str], email: dict) -> MIMEMultipart:
+    msg = MIMEMultipart()
+    msg["From"] = from_email or ""
+    msg["To"] = email["to"]
+    msg["Subject"] = email["subject"]
+    msg.attach(MIMEText(email["body"], "plain"))
+    return msg
+
+
+class SmtpPool:
+    """
+    A few authenticated SMTP connections reused across sends.
+
+    smtplib is blocking, so connecting and sending run in worker threads. A
+    connection that errors is closed instead of going back to the pool and is
+    reopened on demand.
+    """
+
+    def __init__(self, config: SmtpConfig, size: int = 2):
+        self.config = config
+        self.size = size
+        self.idle: List[smtplib.SMTP] = []
+        self._slots = asyncio.Semaphore(size)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.config.host, self.config.port, timeout=30)
+        if self.config.use_tls:
+            connection.starttls()
+        if self.config.username:
+            connection.login(self.config.username, self.config.password)
+        return connection
+
+    @staticmethod
+    def _quit(connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    async def send(self, email: dict):
+        message = build_message(self.config.from_email, email)
+        async with self._slots:
+            reused = bool(self.idle)
+            connection = self.idle.pop() if reused else await asyncio.to_thread(self._connect)
+            try:
+                await asyncio.to_thread(connection.send_message, message)
+            except smtplib.SMTPServerDisconnected:
+                if not reused:
+                    raise
+                # The server dropped an idle connection; retry once on a fresh one
+                connection = await asyncio.to_thread(self._connect)
+                try:
+                    await asyncio.to_thread(connection.send_message, message)
+                except Exception:
+                    await asyncio.to_thread(self._quit, connection)
+                    raise
+            except Exception:
+                await asyncio.to_thread(self._quit, connection)
+                raise
+            self.idle.append(connection)
+
+    async def close(self):
+        connections, self.idle = self.idle, []
+        for connection in connections:
+            await asyncio.to_thread(self._quit, connection)
+
+
+def _outbox_document(to: str, subject: str, body: str, kind: str) -> dict:
+    now = datetime.now()
+    return {
+        "id": str(uuid.uuid4()),
+        "kind": kind,
+        "to": to,
+        "subject": subject,
+        "body": body,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+async def enqueue_email(db, to: str, subject: str, body: str, kind: str = "generic") -> str:
+    """Store an email in the outbox; the sender delivers it in the background"""
+    document = _outbox_document(to, subject, body, kind)
+    await db[OUTBOX_COLLECTION].insert_one(document)
+    return document["id"]
+
+
+async def enqueue_emails(db, emails: List[dict]) -> List[str]:
+    """Store several {to, subject, body, kind} emails with one write"""
+    documents = [
+        _outbox_document(email["to"], email["subject"], email["body"], email.get("kind", "generic"))
+        for email in emails
+    ]
+    if documents:
+        await db[OUTBOX_COLLECTION].insert_many(documents, ordered=False)
+    return [document["id"] for document in documents]
+
+
+class OutboxSender:
+    """
+    Background worker delivering the email outbox.
+
+    Each round claims up to batch_size due emails, sends them over the SMTP
+    pool concurrently and records the outcome. Failures are retried with
+    exponential backoff until max_attempts, then left as "failed". Claims
+    expire after lease_seconds, so emails held by a crashed worker are sent
+    again by the next one.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[SmtpPool],
+        batch_size: int = 20,
+        poll_interval: float = 5.0,
+        max_attempts: int = 6,
+        base_backoff_seconds: float = 30.0,
+        lease_seconds: float = 300.0,
+    ):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.lease_seconds = lease_seconds
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def wake(self):
+        """Start the next round now instead of at the next poll"""
+        self._wakeup.set()
+
+    def backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.base_backoff_seconds * 2 ** (attempts - 1), 6 * 3600))
+
+    async def _claim(self, db) -> List[dict]:
+        """
+        Claim up to batch_size due emails in three round trips whatever the
+        batch size: pick candidate ids, stamp them with a claim id in one
+        update_many and read back what this claim won. The update re-checks
+        that each email is still due, so a concurrent worker that picked the
+        same ids only gets the ones it stamped first.
+        """
+        now = datetime.now()
+        due = {
+            "$or": [
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                {"status": "sending", "claimed_at": {"$lt": now - timedelta(seconds=self.lease_seconds)}},
+            ]
+        }
+        candidates = await db[OUTBOX_COLLECTION].find(
+            due, {"_id": 0, "id": 1}
+        ).sort("next_attempt_at", 1).limit(self.batch_size).to_list(self.batch_size)
+        if not candidates:
+            return []
+        claim_id = str(uuid.uuid4())
+        await db[OUTBOX_COLLECTION].update_many(
+            {"id": {"$in": [email["id"] for email in candidates]}, **due},
+            {"$set": {"status": "sending", "claim_id": claim_id, "claimed_at": now, "updated_at": now}},
+        )
+        return await db[OUTBOX_COLLECTION].find({"claim_id": claim_id}).to_list(self.batch_size)
+
+    async def _deliver(self, email: dict):
+        if self.pool is None:
+            # Without SMTP the log is the only copy, e.g. of a verification link
+            logger.info(
+                f"SMTP not configured, email to {email['to']} not sent: {email['subject']}\n{email['body']}"
+            )
+            return
+        await self.pool.send(email)
+
+    async def _record(self, db, email: dict, error: Optional[BaseException]):
+        now = datetime.now()
+        if error is None:
+            update = {"status": "sent", "sent_at": now, "updated_at": now}
+        else:
+            attempts = email.get("attempts", 0) + 1
+            update = {
+                "status": "failed" if attempts >= self.max_attempts else "pending",
+                "attempts": attempts,
+                "last_error": str(error),
+                "next_attempt_at": now + self.backoff(attempts),
+                "updated_at": now,
+            }
+            logger.error(f"Failed to send email {email['id']} (attempt {attempts}): {str(error)}")
+        await db[OUTBOX_COLLECTION].update_one({"id": email["id"]}, {"$set": update})
+
+    async def send_batch(self, db) -> int:
+        """Deliver one batch of due emails; returns how many were claimed"""
+        emails = await self._claim(db)
+        if not emails:
+            return 0
+        results = await asyncio.gather(
+            *(self._deliver(email) for email in emails), return_exceptions=True
+        )
+        for email, result in zip(emails, results):
+            await self._record(db, email, result if isinstance(result, BaseException) else None)
+        return len(emails)
+
+    async def _run(self, db):
+        while True:
+            try:
+                # Keep going while full batches come back, then wait for a wakeup or the poll
+                while await self.send_batch(db) >= self.batch_size:
+                    pass
+            except Exception as e:
+                logger.error(f"Email outbox round failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self, db):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.pool is not None:
+            await self.pool.close()
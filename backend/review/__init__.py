@@ -0,0 +1 @@
+# This file makes the review directory a Python package
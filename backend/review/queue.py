@@ -0,0 +1,126 @@
+import logging
+import uuid
+from datetime import datetime, time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from ..database.pagination import decode_cursor, encode_cursor, keyset_filter
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK_DECISIONS = 1000
+
+_DAY_MS = 24 * 60 * 60 * 1000
+
+# Oldest submission day first, then most complete, with the id as a tie-breaker.
+# All three are stored on the document, so the (status, *QUEUE_SORT) indexes serve the queue.
+QUEUE_SORT = [("submitted_day", ASCENDING), ("completion_percentage", DESCENDING), ("id", ASCENDING)]
+_QUEUE_CURSOR_TYPES = ((datetime, type(None)), (int, float), (str,))
+
+
+class ReviewKind(NamedTuple):
+    """Where one kind of reviewable document lives and which status values mean what"""
+    collection: str
+    status_field: str
+    pending: str
+    approved: str
+    rejected: str
+    # Used as the submission time by documents submitted before submitted_at was recorded
+    fallback_submitted_field: str
+    # Stored on submission by kinds that don't track completion themselves
+    default_completion: Optional[int]
+
+
+REVIEW_KINDS: Dict[str, ReviewKind] = {
+    "profile": ReviewKind("researcher_profiles", "status", "pending_approval", "approved", "draft", "updated_at", None),
+    "academic": ReviewKind("academics", "approval_status", "pending", "approved", "rejected", "created_at", 100),
+}
+
+
+def submission_fields(kind: str, submitted_at: datetime) -> dict:
+    """The queue's sort fields, to be written onto a document when it is submitted for review"""
+    fields = {"submitted_at": submitted_at, "submitted_day": datetime.combine(submitted_at.date(), time.min)}
+    default_completion = REVIEW_KINDS[kind].default_completion
+    if default_completion is not None:
+        fields["completion_percentage"] = default_completion
+    return fields
+
+
+async def review_queue(db, kind: str, limit: int = 100, cursor: Optional[str] = None) -> Tuple[Dict, Optional[str]]:
+    """
+    Pending documents of one kind, those submitted on the earliest day first
+    and, within a day, the most complete first. Each item carries its owner's
+    name and email from one $lookup on the page.
+
+    Pages are keyset pages over (submitted day, completion, id), so an admin
+    deciding items while paging neither skips nor repeats any. The keys are
+    stored at submission, so matching, sorting and limiting run on the index
+    and only the page itself is looked up. Returns the page and the cursor for
+    the next one, or None on the last page.
+    """
+    review_kind = REVIEW_KINDS[kind]
+    match = {review_kind.status_field: review_kind.pending}
+    collection = db[review_kind.collection]
+    # Timestamps are naive local times, so don't measure them against the server's UTC $$NOW
+    now = datetime.now()
+    total = await collection.count_documents(match)
+    if cursor:
+        values = decode_cursor(cursor, len(QUEUE_SORT), _QUEUE_CURSOR_TYPES)
+        match = {"$and": [match, keyset_filter(QUEUE_SORT, values)]}
+    items = await collection.aggregate([
+        {"$match": match},
+        {"$sort": dict(QUEUE_SORT)},
+        # One extra item tells whether another page exists
+        {"$limit": limit + 1},
+        {"$set": {"waiting_days": {"$floor": {"$divide": [{"$subtract": [now, "$submitted_at"]}, _DAY_MS]}}}},
+        {"$lookup": {"from": "users", "localField": "user_id", "foreignField": "id", "as": "user"}},
+        {"$set": {"user": {"$arrayElemAt": ["$user", 0]}}},
+        {"$project": {
+            "_id": 0, "id": 1, "user_id": 1, "submitted_at": 1, "submitted_day": 1, "waiting_days": 1,
+            "completion_percentage": 1, "institution_name": 1, "university": 1, "research_field": 1,
+            "user.first_name": 1, "user.last_name": 1, "user.email": 1,
+        }},
+    ]).to_list(None)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([items[-1].get(field) for field, _ in QUEUE_SORT])
+    for item in items:
+        item.pop("submitted_day", None)
+        item["kind"] = kind
+    return {"total": total, "items": items}, next_cursor
+
+
+async def apply_decisions(db, kind: str, ids: List[str], approve: bool, changes: Optional[dict] = None) -> List[dict]:
+    """
+    Approve or reject many pending documents with one bulk write and return
+    the documents that were decided, as written.
+
+    Each update only matches while its document is still pending, so items
+    decided in the meantime by another admin are left alone. Every update
+    stamps the same new review_batch_id, by which the documents this batch
+    decided are then read back in one query.
+    """
+    review_kind = REVIEW_KINDS[kind]
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return []
+    batch_id = str(uuid.uuid4())
+    new_status = review_kind.approved if approve else review_kind.rejected
+    update = {"$set": {
+        **(changes or {}),
+        review_kind.status_field: new_status,
+        "review_date": datetime.now(),
+        "review_batch_id": batch_id,
+    }}
+    collection = db[review_kind.collection]
+    result = await collection.bulk_write([
+        UpdateOne({"id": document_id, review_kind.status_field: review_kind.pending}, update)
+        for document_id in ids
+    ], ordered=False)
+    if not result.modified_count:
+        return []
+    decided = await collection.find({"review_batch_id": batch_id}, {"_id": 0}).to_list(None)
+    logger.info(f"{'Approved' if approve else 'Rejected'} {len(decided)} of {len(ids)} pending {kind}s")
+    return decided
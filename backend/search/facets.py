@@ -0,0 +1,97 @@
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Facet name -> researcher profile field it is counted from
+DEFAULT_FACET_FIELDS = {
+    "academic_titles": "academic_title",
+    "institutions": "institution_name",
+    "countries": "country",
+    "cities": "city",
+    "research_interests": "research_interests",
+}
+
+
+class FacetStore:
+    """
+    Value -> count maps for the researcher search filters.
+
+    Counts cover approved profiles only and are adjusted per profile write,
+    so serving the filter options never touches the database.
+    """
+
+    def __init__(self, facet_fields: Optional[Dict[str, str]] = None):
+        self.facet_fields = facet_fields or dict(DEFAULT_FACET_FIELDS)
+        self.counts: Dict[str, Counter] = {facet: Counter() for facet in self.facet_fields}
+        # doc_id -> facet -> values the document currently contributes
+        self.doc_values: Dict[str, Dict[str, List[str]]] = {}
+
+    def __len__(self):
+        return len(self.doc_values)
+
+    def _extract(self, profile: dict) -> Dict[str, List[str]]:
+        values = {}
+        for facet, field in self.facet_fields.items():
+            value = profile.get(field)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                # A profile counts once per distinct value
+                values[facet] = list(dict.fromkeys(item for item in value if item))
+            else:
+                values[facet] = [value]
+        return values
+
+    def add(self, doc_id: str, profile: dict):
+        """Count a profile's facet values, replacing any previous version"""
+        self.remove(doc_id)
+        values = self._extract(profile)
+        for facet, facet_values in values.items():
+            self.counts[facet].update(facet_values)
+        self.doc_values[doc_id] = values
+
+    def remove(self, doc_id: str):
+        """Stop counting a profile's facet values"""
+        values = self.doc_values.pop(doc_id, None)
+        if values is None:
+            return
+        for facet, facet_values in values.items():
+            counter = self.counts[facet]
+            for value in facet_values:
+                counter[value] -= 1
+                if counter[value] <= 0:
+                    del counter[value]
+
+    def sync(self, profile: Optional[dict]):
+        """Count an approved profile, or discount it if it is no longer approved"""
+        if not profile or not profile.get("id"):
+            return
+        if profile.get("status") == "approved":
+            self.add(profile["id"], profile)
+        else:
+            self.remove(profile["id"])
+
+    def values(self, facet: str) -> List[str]:
+        return sorted(self.counts[facet])
+
+    def as_filters(self) -> Dict:
+        """Sorted values per facet plus their counts"""
+        filters = {facet: self.values(facet) for facet in self.facet_fields}
+        filters["counts"] = {facet: dict(counter) for facet, counter in self.counts.items()}
+        return filters
+
+    def build(self, profiles: Iterable[dict]):
+        """Recount every facet from scratch"""
+        self.__init__(self.facet_fields)
+        for profile in profiles:
+            self.sync(profile)
+
+    async def load(self, db):
+        """Count the facets of every approved profile in the database"""
+        projection = {field: 1 for field in self.facet_fields.values()}
+        projection.update({"_id": 0, "id": 1, "status": 1})
+        cursor = db.researcher_profiles.find({"status": "approved"}, projection)
+        self.build([profile async for profile in cursor])
+        logger.info(f"Facet store built with {len(self)} approved profiles")
@@ -0,0 +1,192 @@
+import math
+import re
+import bisect
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "is", "it", "of", "on", "or", "the", "to", "with",
+}
+
+# Relative weight of a term match in each indexed profile field
+DEFAULT_FIELD_BOOSTS = {
+    "academic_title": 2.0,
+    "institution_name": 1.5,
+    "department": 1.5,
+    "research_interests": 2.0,
+    "bio": 1.0,
+}
+
+
+def tokenize(text) -> List[str]:
+    """Split a field value into lowercase search terms"""
+    if not text:
+        return []
+    if isinstance(text, (list, tuple, set)):
+        text = " ".join(str(item) for item in text if item)
+    return [
+        token for token in TOKEN_PATTERN.findall(str(text).lower())
+        if token not in STOP_WORDS
+    ]
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over approved researcher profiles.
+
+    Postings map each term to the documents and fields it occurs in, and
+    queries are ranked with BM25 summed over the boosted fields.
+    """
+
+    def __init__(
+        self,
+        field_boosts: Optional[Dict[str, float]] = None,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.field_boosts = field_boosts or dict(DEFAULT_FIELD_BOOSTS)
+        self.k1 = k1
+        self.b = b
+        # term -> doc_id -> field -> term frequency
+        self.postings: Dict[str, Dict[str, Dict[str, int]]] = defaultdict(dict)
+        # doc_id -> field -> field length in tokens
+        self.field_lengths: Dict[str, Dict[str, int]] = {}
+        # doc_id -> terms, so a document can be removed without a full scan
+        self.doc_terms: Dict[str, Set[str]] = {}
+        self.total_field_lengths: Dict[str, int] = defaultdict(int)
+        # Sorted vocabulary used for prefix expansion of the last query term
+        self.vocabulary: List[str] = []
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def __contains__(self, doc_id: str):
+        return doc_id in self.doc_terms
+
+    def add(self, doc_id: str, document: dict):
+        """Index a document, replacing any previous version of it"""
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+
+        lengths = {}
+        terms = set()
+        for field in self.field_boosts:
+            tokens = tokenize(document.get(field))
+            if not tokens:
+                continue
+            lengths[field] = len(tokens)
+            self.total_field_lengths[field] += len(tokens)
+            for token in tokens:
+                fields = self.postings[token].setdefault(doc_id, {})
+                fields[field] = fields.get(field, 0) + 1
+                if token not in terms:
+                    terms.add(token)
+                    if len(self.postings[token]) == 1:
+                        bisect.insort(self.vocabulary, token)
+
+        self.field_lengths[doc_id] = lengths
+        self.doc_terms[doc_id] = terms
+
+    def remove(self, doc_id: str):
+        """Drop a document from the index if it is present"""
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for field, length in self.field_lengths.pop(doc_id, {}).items():
+            self.total_field_lengths[field] -= length
+
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+                position = bisect.bisect_left(self.vocabulary, term)
+                if position < len(self.vocabulary) and self.vocabulary[position] == term:
+                    del self.vocabulary[position]
+
+    def sync(self, profile: Optional[dict]):
+        """Index an approved profile, or remove it if it is no longer approved"""
+        if not profile or not profile.get("id"):
+            return
+        if profile.get("status") == "approved":
+            self.add(profile["id"], profile)
+        else:
+            self.remove(profile["id"])
+
+    def expand_prefix(self, prefix: str, max_terms: int = 50) -> List[str]:
+        """Return indexed terms starting with the given prefix"""
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        matches = []
+        for term in self.vocabulary[start:start + max_terms]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def _idf(self, term: str) -> float:
+        doc_freq = len(self.postings.get(term, ()))
+        total = len(self.doc_terms)
+        return math.log(1 + (total - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def _score_term(self, term: str, scores: Dict[str, float], weight: float = 1.0):
+        docs = self.postings.get(term)
+        if not docs:
+            return
+        idf = self._idf(term) * weight
+        total_docs = len(self.doc_terms)
+        for doc_id, fields in docs.items():
+            lengths = self.field_lengths[doc_id]
+            score = 0.0
+            for field, tf in fields.items():
+                avg_length = self.total_field_lengths[field] / total_docs
+                norm = 1 - self.b + self.b * lengths[field] / avg_length
+                score += self.field_boosts[field] * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * score
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a free-text query.
+        The last query term also matches as a prefix so partial words still hit.
+        """
+        terms = tokenize(query)
+        if not terms or not self.doc_terms:
+            return []
+
+        scores: Dict[str, float] = {}
+        for term in terms[:-1]:
+            self._score_term(term, scores)
+
+        last_term = terms[-1]
+        self._score_term(last_term, scores)
+        for term in self.expand_prefix(last_term):
+            if term != last_term:
+                # Prefix completions count for less than an exact term match
+                self._score_term(term, scores, weight=0.5)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return ranked
+
+    def build(self, profiles: Iterable[dict]):
+        """Rebuild the index from scratch"""
+        self.__init__(self.field_boosts, self.k1, self.b)
+        for profile in profiles:
+            self.sync(profile)
+
+    async def load(self, db):
+        """Build the index from every approved profile in the database"""
+        projection = {field: 1 for field in self.field_boosts}
+        projection.update({"_id": 0, "id": 1, "status": 1})
+        cursor = db.researcher_profiles.find({"status": "approved"}, projection)
+        self.build([profile async for profile in cursor])
+        logger.info(f"Search index built with {len(self)} approved profiles")
@@ -1,26 +1,54 @@
 import os
 import uuid
-import random
 import logging
 import secrets
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 from dotenv import load_dotenv
 
-from fastapi import BackgroundTasks, Body, Depends, FastAPI, HTTPException, Query, status, APIRouter
+from fastapi import BackgroundTasks, Body, Depends, FastAPI, HTTPException, Query, Request, status, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseModel, EmailStr, Field
+from pymongo.errors import DuplicateKeyError
 import jwt
-from passlib.context import CryptContext
 import re
+import math
+import bisect
+
+from .auth.passwords import PasswordHasher
+from .auth.rate_limit import (
+    LOGIN_PER_ACCOUNT, LOGIN_PER_ACCOUNT_IP, LOGIN_PER_IP, REGISTER_PER_IP, RateLimitRule, create_rate_limiter,
+    forwarded_client_ip
+)
+from .auth.user_cache import UserCache
+from .database.indexes import ensure_indexes, index_report
+from .database.migrations import backfill_connection_pair_keys, backfill_review_queue_fields
+from .database.writes import (
+    conditional_update, conditional_update_with_previous, literal_fields, populated_count
+)
+from .database.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, paginate
+from .graph.connections import MAX_PATH_DEPTH, ConnectionGraph, connection_pair_key
+from .graph.suggestions import SuggestionEngine
+from .geo.encoding import GLOBE_BINARY_MEDIA_TYPE, accepts_globe_binary, encode_globe_points
+from .geo.globe import GlobeIndex, parse_bbox
+from .geo.nearby import NearbyIndex
+from .keywords.autocomplete import MAX_COMPLETIONS, KeywordCompleter
+from .keywords.registry import KeywordRegistry
+from .keywords.related import KeywordCooccurrence
+from .keywords.synonyms import KeywordCanonicalizer
+from .notifications.admin_digest import AdminDigest, AdminRoster
+from .notifications.outbox import OutboxSender, SmtpConfig, SmtpPool, enqueue_email, enqueue_emails
+from .review.queue import MAX_BULK_DECISIONS, REVIEW_KINDS, apply_decisions, review_queue, submission_fields
+from .search.facets import FacetStore
+from .search.index import SearchIndex
+from .stats.counters import ViewCounter, adjust_user_counters, connection_counter_deltas, ensure_user_counters, get_user_counters
+from .stats.dashboard import AdminDashboard
+from .stats.rollups import StatsRollups
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -30,6 +58,62 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ.get('DB_NAME', 'bangladesh_academic_network')]
 
+# Authenticated users, so most requests skip the users lookup
+user_cache = UserCache()
+
+# Login and registration throttling; shared through Redis when REDIS_URL is set
+rate_limiter = create_rate_limiter(os.environ.get("REDIS_URL"))
+# Reverse proxies in front of the API. Client addresses come from X-Forwarded-For only
+# when this is set; with none, a client could put any address in that header
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", 0))
+
+# Background delivery of the email outbox over pooled SMTP connections
+smtp_config = SmtpConfig.from_env()
+email_outbox = OutboxSender(SmtpPool(smtp_config) if smtp_config else None)
+
+# Cached admin emails and the batched digest of submissions sent to them
+admin_roster = AdminRoster()
+admin_digest = AdminDigest(admin_roster, float(os.environ.get("ADMIN_DIGEST_WINDOW_SECONDS", 60)))
+
+# In-memory full-text index over approved researcher profiles
+search_index = SearchIndex()
+
+# Value -> count maps backing the researcher search filters
+facet_store = FacetStore()
+
+# Approved academics clustered per globe zoom level
+globe_index = GlobeIndex()
+
+# k-d tree of approved academics for nearest-neighbour queries
+nearby_index = NearbyIndex()
+
+# Adjacency sets of accepted connections for mutual and path queries
+connection_graph = ConnectionGraph()
+
+# Precomputed, similarity-ranked connection suggestions per researcher
+suggestion_engine = SuggestionEngine()
+
+# Keyword names with how many academic profiles use them
+keyword_registry = KeywordRegistry()
+
+# Sorted keyword names for prefix completion, ranked by usage
+keyword_completer = KeywordCompleter()
+
+# Cached spelling and synonym folding of keywords to canonical names
+keyword_canonicalizer = KeywordCanonicalizer()
+
+# Sparse keyword co-occurrence counts for related keywords and query expansion
+keyword_cooccurrence = KeywordCooccurrence()
+
+# Admin dashboard figures, from one $facet aggregation per collection, briefly cached
+admin_dashboard = AdminDashboard(float(os.environ.get("ADMIN_DASHBOARD_TTL_SECONDS", 30)))
+
+# Materialized per-city and per-field counts of approved academics
+stats_rollups = StatsRollups()
+
+# Buffered profile view counts, flushed to user_counters in batches
+profile_views = ViewCounter()
+
 # Create the main app without a prefix
 app = FastAPI(title="Bangladesh Academic Mentor Network API")
 
@@ -40,6 +124,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # User models
@@ -153,6 +238,25 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+async def get_cached_user(user_id: Optional[str], email: Optional[str] = None) -> Optional[dict]:
+    """
+    Load the user behind a token, from the user cache when possible.
+    When the token names an email the user must still have that email.
+    """
+    if not user_id:
+        return await db.users.find_one({"email": email}) if email else None
+
+    user = user_cache.get(user_id)
+    if user is not None and (email is None or user.get("email") == email):
+        return user
+
+    version = user_cache.version(user_id)
+    user = await db.users.find_one({"email": email} if email else {"id": user_id})
+    if user is not None and user.get("id") == user_id:
+        user_cache.put(user_id, user, version)
+    return user
+
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -166,7 +270,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             raise credentials_exception
     except jwt.PyJWTError:
         raise credentials_exception
-    user = await db.users.find_one({"id": user_id})
+    user = await get_cached_user(user_id)
     if user is None:
         raise credentials_exception
     return user
@@ -180,6 +284,20 @@ async def get_current_admin(current_user: dict = Depends(get_current_user)):
         )
     return current_user
 
+
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/token", auto_error=False)
+
+
+async def get_viewer_id(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[str]:
+    """The signed-in user's id from a valid bearer token, or None; never rejects the request"""
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.PyJWTError:
+        return None
+    return payload.get("user_id")
+
 # Model for email verification tokens
 class VerificationToken(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -308,137 +426,104 @@ async def update_my_profile(
     profile_update: ResearcherProfileUpdate,
     current_user: User = Depends(get_current_user)
 ):
-    # Check if profile exists
-    existing_profile = await db.researcher_profiles.find_one({"user_id": current_user.id})
-    if not existing_profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found"
-        )
-    
-    # Update the profile
     update_data = profile_update.dict(exclude_unset=True)
     
-    # If any fields are updated, recalculate completion percentage
-    if update_data:
-        # Get the current profile data
-        current_profile = {**existing_profile, **update_data}
-        
-        # Recalculate completion percentage
-        update_data["completion_percentage"] = calculate_profile_completion(current_profile)
-        update_data["updated_at"] = datetime.now()
-        
-        # If status changed to PENDING_APPROVAL, clear any previous feedback
-        if update_data.get("status") == ProfileStatus.PENDING_APPROVAL:
-            update_data["feedback"] = None
-            update_data["rejection_reason"] = None
+    # Nothing to change, just return the profile
+    if not update_data:
+        existing_profile = await db.researcher_profiles.find_one({"user_id": current_user.id})
+        if not existing_profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found"
+            )
+        return existing_profile
     
-    # Update in database
-    await db.researcher_profiles.update_one(
+    update_data["updated_at"] = datetime.now()
+    
+    # If status changed to PENDING_APPROVAL, clear any previous feedback and queue it for review
+    if update_data.get("status") == ProfileStatus.PENDING_APPROVAL:
+        update_data["feedback"] = None
+        update_data["rejection_reason"] = None
+        update_data.update(submission_fields("profile", update_data["updated_at"]))
+    
+    # Update and recalculate the completion percentage in the same write
+    updated_profile = await conditional_update(
+        db.researcher_profiles,
         {"user_id": current_user.id},
-        {"$set": update_data}
+        {},
+        [
+            {"$set": literal_fields(update_data)},
+            {"$set": {"completion_percentage": profile_completion_expression()}}
+        ],
+        not_found("Profile not found")
     )
-    
-    # Return updated profile
-    updated_profile = await db.researcher_profiles.find_one({"user_id": current_user.id})
+    search_index.sync(updated_profile)
+    facet_store.sync(updated_profile)
+    keyword_cooccurrence.sync_profile(updated_profile)
+    await suggestion_engine.sync(db, updated_profile)
     return updated_profile
 
 
 @api_router.put("/profiles/me/submit", response_model=ResearcherProfile)
 async def submit_profile_for_approval(
-    current_user: User = Depends(get_current_user),
-    background_tasks: BackgroundTasks = None
+    current_user: User = Depends(get_current_user)
 ):
     """
     Submit a profile for admin approval.
     """
-    # Check if profile exists
-    profile = await db.researcher_profiles.find_one({"user_id": current_user.id})
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found"
-        )
-    
-    # Check if profile is complete enough to submit
-    if profile.get("completion_percentage", 0) < 70:
-        raise HTTPException(
+    def explain(profile):
+        if not profile:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found"
+            )
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Profile is not complete enough to submit (minimum 70% completion required)"
         )
     
-    # Update status to pending approval
-    await db.researcher_profiles.update_one(
+    # Update status to pending approval, if the profile is complete enough to submit
+    updated_profile = await conditional_update(
+        db.researcher_profiles,
         {"user_id": current_user.id},
+        {"completion_percentage": {"$gte": 70}},
         {"$set": {
             "status": ProfileStatus.PENDING_APPROVAL,
             "updated_at": datetime.now(),
+            **submission_fields("profile", datetime.now()),
             "feedback": None,
             "rejection_reason": None
-        }}
+        }},
+        explain
+    )
+    search_index.sync(updated_profile)
+    facet_store.sync(updated_profile)
+    keyword_cooccurrence.sync_profile(updated_profile)
+    await suggestion_engine.sync(db, updated_profile)
+    
+    # Notify admins in the next digest
+    admin_digest.record(
+        f"A new researcher profile has been submitted for approval: {current_user.get('first_name')} {current_user.get('last_name')}"
     )
-    
-    # Get the updated profile
-    updated_profile = await db.researcher_profiles.find_one({"user_id": current_user.id})
-    
-    # Notify admins (just log it for now)
-    if background_tasks:
-        # Get admin emails
-        admins = await db.users.find({"is_admin": True}).to_list(100)
-        admin_emails = [admin.get("email") for admin in admins if admin.get("email")]
-        
-        # Log notification for each admin
-        for email in admin_emails:
-            background_tasks.add_task(
-                log_notification,
-                email,
-                "New Profile Submission",
-                f"A new researcher profile has been submitted for approval: {current_user.get('first_name')} {current_user.get('last_name')}"
-            )
     
     return updated_profile
 
 
 @api_router.get("/profiles/{profile_id}", response_model=ResearcherProfile)
-async def get_profile_by_id(profile_id: str):
+async def get_profile_by_id(profile_id: str, viewer_id: Optional[str] = Depends(get_viewer_id)):
     profile = await db.researcher_profiles.find_one({"id": profile_id})
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
+    profile_views.record(profile.get("user_id"), viewer_id)
     return profile
 
 
 @api_router.get("/researchers/search", response_model=List[ResearcherProfile])
 async def search_researchers(
-    query: Optional[str] = None,
-    limit: int = Query(20, ge=1, le=100)
-):
-    """
-    Basic researcher search endpoint.
-    Returns only approved profiles matching the query.
-    """
-    # Start with base filter - only return approved profiles
-    filter_query = {"status": "approved"}
-    
-    # Add text search if query is provided
-    if query:
-        filter_query["$or"] = [
-            {"academic_title": {"$regex": query, "$options": "i"}},
-            {"institution_name": {"$regex": query, "$options": "i"}},
-            {"department": {"$regex": query, "$options": "i"}},
-            {"bio": {"$regex": query, "$options": "i"}}
-        ]
-    
-    # Execute the query
-    profiles = await db.researcher_profiles.find(filter_query).limit(limit).to_list(limit)
-    
-    return profiles
-
-
-@api_router.get("/researchers/search", response_model=List[ResearcherProfile])
-async def search_researchers(
+    response: Response,
     query: str = Query(None, description="General search query"),
     research_interests: str = Query(None, description="Comma-separated research interests to filter by"),
     institution: str = Query(None, description="Institution name to filter by"),
@@ -447,27 +532,22 @@ async def search_researchers(
     city: str = Query(None, description="City to filter by"),
     min_completion: int = Query(0, description="Minimum profile completion percentage"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
-    offset: int = Query(0, ge=0, description="Number of results to skip for pagination")
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    expand: bool = Query(False, description="Also match research interests related to the requested ones")
 ):
     """
     Search for researchers based on multiple criteria.
-    Returns only approved profiles.
+    Returns only approved profiles, ranked by relevance when a query is given.
+    With expand, the interest filter also matches interests that often appear alongside the requested ones.
+    The cursor for the next page is returned in the X-Next-Cursor header.
     """
     # Start with base filter - only return approved profiles
     filter_query = {"status": "approved"}
-    
-    # Add additional filters based on query parameters
-    if query:
-        # Search in multiple fields
-        filter_query["$or"] = [
-            {"academic_title": {"$regex": query, "$options": "i"}},
-            {"institution_name": {"$regex": query, "$options": "i"}},
-            {"department": {"$regex": query, "$options": "i"}},
-            {"bio": {"$regex": query, "$options": "i"}}
-        ]
-    
+
     if research_interests:
         interests = [interest.strip() for interest in research_interests.split(",")]
+        if expand:
+            interests = keyword_cooccurrence.expand(interests)
         filter_query["research_interests"] = {"$in": interests}
     
     if institution:
@@ -484,80 +564,90 @@ async def search_researchers(
     
     if min_completion > 0:
         filter_query["completion_percentage"] = {"$gte": min_completion}
-    
-    # Execute the query
-    profiles = await db.researcher_profiles.find(filter_query).skip(offset).limit(limit).to_list(limit)
-    
-    return profiles
+
+    if not query:
+        # Execute the query
+        profiles, next_cursor = await paginate(db.researcher_profiles, filter_query, cursor, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return profiles
+
+    # Rank matching profiles from the in-memory index instead of a regex scan
+    ranked = search_index.search(query)
+    if cursor:
+        # Resume after the (score, id) of the last profile on the previous page
+        last_score, last_id = decode_cursor(cursor, 2, ((float, int), (str,)))
+        ranked = ranked[bisect.bisect_right(ranked, (-last_score, last_id), key=lambda item: (-item[1], item[0])):]
+    ranked_ids = [doc_id for doc_id, _ in ranked]
+    if not ranked_ids:
+        return []
+
+    # Narrow the ranked ids with the remaining structured filters
+    if len(filter_query) > 1:
+        filter_query["id"] = {"$in": ranked_ids}
+        matching = await db.researcher_profiles.find(filter_query, {"_id": 0, "id": 1}).to_list(None)
+        allowed_ids = {profile["id"] for profile in matching}
+        ranked_ids = [doc_id for doc_id in ranked_ids if doc_id in allowed_ids]
+
+    page_ids = ranked_ids[:limit]
+    if not page_ids:
+        return []
+    if len(ranked_ids) > limit:
+        scores = dict(ranked)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([scores[page_ids[-1]], page_ids[-1]])
+
+    profiles = await db.researcher_profiles.find({"id": {"$in": page_ids}}).to_list(len(page_ids))
+    profiles_by_id = {profile["id"]: profile for profile in profiles}
+
+    return [profiles_by_id[doc_id] for doc_id in page_ids if doc_id in profiles_by_id]
 
 
 @api_router.get("/researchers/filters", response_model=Dict)
 async def get_search_filters():
     """
     Get available filter options for the researcher search.
+    Each facet lists its values, with per-value profile counts under "counts".
     """
-    # Query all approved profiles
-    profiles = await db.researcher_profiles.find({"status": "approved"}).to_list(1000)
-    
-    # Extract unique values for filters
-    academic_titles = set()
-    institutions = set()
-    countries = set()
-    cities = set()
-    all_interests = set()
-    
-    for profile in profiles:
-        if profile.get("academic_title"):
-            academic_titles.add(profile["academic_title"])
-        
-        if profile.get("institution_name"):
-            institutions.add(profile["institution_name"])
-        
-        if profile.get("country"):
-            countries.add(profile["country"])
-        
-        if profile.get("city"):
-            cities.add(profile["city"])
-        
-        if profile.get("research_interests"):
-            for interest in profile["research_interests"]:
-                all_interests.add(interest)
-    
-    return {
-        "academic_titles": sorted(list(academic_titles)),
-        "institutions": sorted(list(institutions)),
-        "countries": sorted(list(countries)),
-        "cities": sorted(list(cities)),
-        "research_interests": sorted(list(all_interests))
-    }
+    return facet_store.as_filters()
+
 
+PROFILE_REQUIRED_FIELDS = [
+    "academic_title", 
+    "institution_name", 
+    "department", 
+    "research_interests", 
+    "bio", 
+    "location", 
+    "contact_email"
+]
 
 def calculate_profile_completion(profile: dict) -> int:
     """Calculate the completion percentage of a researcher profile"""
-    required_fields = [
-        "academic_title", 
-        "institution_name", 
-        "department", 
-        "research_interests", 
-        "bio", 
-        "location", 
-        "contact_email"
-    ]
-    
     # Count the number of required fields that are populated
-    completed_fields = sum(1 for field in required_fields if field in profile and profile[field])
+    completed_fields = sum(1 for field in PROFILE_REQUIRED_FIELDS if field in profile and profile[field])
     
     # Calculate percentage
-    percentage = int((completed_fields / len(required_fields)) * 100)
+    percentage = int((completed_fields / len(PROFILE_REQUIRED_FIELDS)) * 100)
     
     return percentage
 
+def profile_completion_expression() -> dict:
+    """calculate_profile_completion as an update pipeline expression, so a write can recompute it"""
+    return {"$toInt": {"$floor": {"$multiply": [
+        {"$divide": [populated_count(PROFILE_REQUIRED_FIELDS), len(PROFILE_REQUIRED_FIELDS)]}, 100
+    ]}}}
+
+def not_found(detail: str):
+    """explain for conditional writes whose only condition is that the document exists"""
+    return lambda document: HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
 # Security
 SECRET_KEY = os.environ.get("SECRET_KEY", "mysecretkey")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 1 week
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt runs off the event loop, on a bounded pool
+password_hasher = PasswordHasher()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/token")
 
 # Enums
@@ -684,6 +774,11 @@ class User(UserBase):
 class Keyword(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
+    count: int = 0
+
+class KeywordSynonymCreate(BaseModel):
+    alias: str
+    canonical: str
     
 class AcademicBase(BaseModel):
     user_id: str
@@ -702,6 +797,13 @@ class AcademicBase(BaseModel):
 class AcademicCreate(AcademicBase):
     pass
 
+class ReviewDecisionCreate(BaseModel):
+    kind: str = "profile"
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BULK_DECISIONS)
+    approve: bool
+    message: Optional[str] = None
+    reason: Optional[str] = None
+
 class Academic(AcademicBase):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     approval_status: ApprovalStatus = ApprovalStatus.PENDING
@@ -709,12 +811,6 @@ class Academic(AcademicBase):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
 # Helper functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
-
 async def create_verification_token(db, user_id: str, purpose: str) -> VerificationToken:
     token = VerificationToken(
         user_id=user_id,
@@ -733,51 +829,6 @@ async def mark_token_as_used(db, token_id: str):
         {"$set": {"is_used": True}}
     )
 
-async def send_verification_email(email: str, token: str, name: str):
-    # Get email configuration from environment variables
-    smtp_server = os.environ.get("SMTP_SERVER")
-    smtp_port = int(os.environ.get("SMTP_PORT", 587))
-    smtp_username = os.environ.get("SMTP_USERNAME")
-    smtp_password = os.environ.get("SMTP_PASSWORD")
-    from_email = os.environ.get("FROM_EMAIL")
-    
-    # Create verification URL
-    verification_url = f"{os.environ.get('FRONTEND_URL', 'http://localhost:3000')}/verify-email/{token}"
-    
-    # Create email message
-    msg = MIMEMultipart()
-    msg["From"] = from_email
-    msg["To"] = email
-    msg["Subject"] = "Verify your email address"
-    
-    # Email body
-    body = f"""
-    Dear {name},
-    
-    Thank you for registering with Bangladesh Academic Network. Please verify your email address by clicking the link below:
-    
-    {verification_url}
-    
-    This link will expire in 24 hours.
-    
-    If you did not register for an account, please ignore this email.
-    
-    Best regards,
-    Bangladesh Academic Network Team
-    """
-    
-    msg.attach(MIMEText(body, "plain"))
-    
-    try:
-        # Connect to SMTP server and send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(smtp_username, smtp_password)
-            server.send_message(msg)
-    except Exception as e:
-        logging.error(f"Failed to send verification email: {str(e)}")
-        # Don't raise the exception as this is running in a background task
-
 async def get_user_by_email(email: str):
     user = await db.users.find_one({"email": email})
     if user:
@@ -788,7 +839,7 @@ async def authenticate_user(email: str, password: str):
     user = await db.users.find_one({"email": email})
     if not user:
         return False
-    if not verify_password(password, user.get("password")):
+    if not await password_hasher.verify(password, user.get("password")):
         return False
     return User(**{k: v for k, v in user.items() if k != "password"})
 
@@ -818,7 +869,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         token_data = TokenData(email=email, role=role, user_id=user_id)
     except jwt.PyJWTError:
         raise credentials_exception
-    user = await db.users.find_one({"email": token_data.email})
+    user = await get_cached_user(token_data.user_id, token_data.email)
     if user is None:
         raise credentials_exception
     user = User(**user)
@@ -835,7 +886,7 @@ async def get_current_admin(current_user: User = Depends(get_current_user)):
 # Auth routes
 async def send_verification_email(user_id: str, email: str, name: str):
     """
-    Send a verification email to the user
+    Create a verification token and queue the verification email
     """
     # Create token
     token_data = VerificationToken(
@@ -852,15 +903,51 @@ async def send_verification_email(user_id: str, email: str, name: str):
     frontend_url = os.environ.get("FRONTEND_URL", "http://localhost:3000")
     verification_link = f"{frontend_url}/verify-email?token={token_data.token}"
     
-    # Log the verification email details (in a real app, this would send an actual email)
-    logging.info(f"Verification email would be sent to {email}")
-    logging.info(f"Verification link: {verification_link}")
+    # Queue the email; the outbox sender delivers it and retries on failure
+    body = f"""
+    Dear {name},
+    
+    Thank you for registering with Bangladesh Academic Network. Please verify your email address by clicking the link below:
+    
+    {verification_link}
+    
+    This link will expire in 24 hours.
+    
+    If you did not register for an account, please ignore this email.
     
-    # In a real app, you would send an actual email with the verification link
-    # For this demo, we'll just log the verification link
+    Best regards,
+    Bangladesh Academic Network Team
+    """
+    await enqueue_email(db, email, "Verify your email address", body, kind="email_verification")
+    email_outbox.wake()
+
+async def enforce_rate_limits(*checks: Tuple[RateLimitRule, str], consume: bool = True):
+    """
+    Raise 429 once any (rule, key) bucket is empty; runs before any hashing or
+    database work. With consume=False the buckets are only checked, for
+    limits that are charged later, such as failed logins.
+    """
+    for rule, key in checks:
+        retry_after = await rate_limiter.hit(rule, key, 1 if consume else 0)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, please try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+def client_ip(request: Request) -> str:
+    """The caller's address, taken from X-Forwarded-For behind TRUSTED_PROXY_HOPS reverse proxies"""
+    return forwarded_client_ip(
+        request.headers.get("x-forwarded-for"),
+        request.client.host if request.client else None,
+        TRUSTED_PROXY_HOPS
+    )
 
 @api_router.post("/register", response_model=User)
-async def register_user(user: UserCreate, background_tasks: BackgroundTasks):
+async def register_user(user: UserCreate, background_tasks: BackgroundTasks, request: Request):
+    await enforce_rate_limits((REGISTER_PER_IP, client_ip(request)))
+
     # Check if user already exists
     existing_user = await db.users.find_one({"email": user.email})
     if existing_user:
@@ -870,7 +957,7 @@ async def register_user(user: UserCreate, background_tasks: BackgroundTasks):
         )
     
     # Hash the password
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
     
     # Create user object
     user_id = str(uuid.uuid4())
@@ -888,6 +975,8 @@ async def register_user(user: UserCreate, background_tasks: BackgroundTasks):
     
     # Insert into database
     await db.users.insert_one(user_data)
+    if user.is_admin:
+        admin_roster.invalidate()
     
     # Send verification email in background
     background_tasks.add_task(
@@ -935,13 +1024,22 @@ async def verify_email(token: str):
         {"id": token_data["user_id"]},
         {"$set": {"email_verified": True}}
     )
+    user_cache.invalidate(token_data["user_id"])
     
     return {"message": "Email verified successfully"}
 
 @api_router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    ip = client_ip(request)
+    account = form_data.username.strip().lower()
+    failed_logins = ((LOGIN_PER_ACCOUNT, account), (LOGIN_PER_ACCOUNT_IP, f"{account}:{ip}"))
+    await enforce_rate_limits((LOGIN_PER_IP, ip))
+    await enforce_rate_limits(*failed_logins, consume=False)
     user = await authenticate_user(form_data.username, form_data.password)
     if not user:
+        # Only failures count against the account
+        for rule, key in failed_logins:
+            await rate_limiter.hit(rule, key)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -954,6 +1052,33 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     )
     return {"access_token": access_token, "token_type": "bearer", "user_id": user.id, "role": user.role}
 
+# Academic fields the rollups and keyword counts are derived from; writes that
+# move those counts only apply while these still hold the values they read
+ACADEMIC_TRACKED_FIELDS = ("approval_status", "country", "city", "research_field", "keywords")
+
+async def sync_academic_indexes(academic: Optional[dict]):
+    """Refresh the in-memory academic indexes after an academic document changes"""
+    await sync_many_academic_indexes([academic])
+
+async def sync_many_academic_indexes(academics: List[Optional[dict]]):
+    """Refresh the in-memory academic indexes after several academic documents change"""
+    approved = [
+        academic for academic in academics
+        if academic and academic.get("approval_status") == ApprovalStatus.APPROVED
+    ]
+    users = {}
+    if approved:
+        found = await db.users.find(
+            {"id": {"$in": [academic["user_id"] for academic in approved]}},
+            {"_id": 0, "id": 1, "first_name": 1, "last_name": 1}
+        ).to_list(None)
+        users = {user["id"]: user for user in found}
+    for academic in academics:
+        is_approved = academic and academic.get("approval_status") == ApprovalStatus.APPROVED
+        globe_index.sync(academic, users.get(academic["user_id"]) if is_approved else None)
+        nearby_index.sync(academic)
+        keyword_cooccurrence.sync_academic(academic)
+
 # Academic profile routes
 @api_router.post("/academics", response_model=Academic)
 async def create_academic_profile(profile: AcademicCreate, current_user: User = Depends(get_current_user)):
@@ -972,9 +1097,15 @@ async def create_academic_profile(profile: AcademicCreate, current_user: User =
             detail="Profile already exists for this user"
         )
     
+    # Store keywords under their canonical names
+    await keyword_canonicalizer.refresh(db)
+    profile.keywords = keyword_canonicalizer.canonicalize(profile.keywords)
+    
     # Create new academic profile
     new_profile = Academic(**profile.dict())
-    await db.academics.insert_one(new_profile.dict())
+    await db.academics.insert_one({
+        **new_profile.dict(), **submission_fields("academic", new_profile.created_at)
+    })
     
     # Update user role to academic if not already
     if current_user.role == Role.USER:
@@ -982,14 +1113,11 @@ async def create_academic_profile(profile: AcademicCreate, current_user: User =
             {"id": current_user.id},
             {"$set": {"role": Role.ACADEMIC}}
         )
+        user_cache.invalidate(current_user.id)
+        admin_roster.invalidate()
     
-    # Add keywords to the database if they don't exist
-    for keyword in profile.keywords:
-        await db.keywords.update_one(
-            {"name": keyword},
-            {"$set": {"name": keyword}},
-            upsert=True
-        )
+    # Register the keywords and count their use
+    keyword_completer.apply(await keyword_registry.record_change(db, None, profile.keywords))
     
     return new_profile
 
@@ -999,7 +1127,8 @@ async def get_academics(
     country: Optional[str] = Query(None),
     city: Optional[str] = Query(None),
     keywords: Optional[List[str]] = Query(None),
-    research_field: Optional[str] = Query(None)
+    research_field: Optional[str] = Query(None),
+    expand: bool = Query(False)
 ):
     # Build query based on filters
     query = {}
@@ -1014,19 +1143,65 @@ async def get_academics(
     if research_field:
         query["research_field"] = {"$regex": research_field, "$options": "i"}
     if keywords:
-        query["keywords"] = {"$in": keywords}
+        # Match every spelling and synonym of the requested keywords,
+        # and with expand of the keywords most often used alongside them
+        await keyword_canonicalizer.refresh(db)
+        if expand:
+            keywords = keyword_cooccurrence.expand(keywords)
+        query["keywords"] = {"$in": keyword_canonicalizer.expand(keywords)}
     
     academics = await db.academics.find(query).to_list(1000)
     return [Academic(**academic) for academic in academics]
 
+@api_router.get("/academics/nearby")
+async def get_nearby_academics(
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=100),
+    research_field: Optional[str] = Query(None),
+    keywords: Optional[List[str]] = Query(None)
+):
+    """
+    The k approved academics closest to a point, nearest first, optionally
+    limited to a research field and/or any of the given keywords.
+    """
+    field = research_field.lower() if research_field else None
+    if keywords:
+        await keyword_canonicalizer.refresh(db)
+    wanted_keywords = set(keyword_canonicalizer.expand(keywords))
+
+    def matches(entry) -> bool:
+        _, _, _, entry_field, entry_keywords = entry
+        if field and field not in entry_field.lower():
+            return False
+        if wanted_keywords and not wanted_keywords & entry_keywords:
+            return False
+        return True
+
+    nearest = nearby_index.nearest(lat, lng, k, matches if field or wanted_keywords else None)
+    if not nearest:
+        return []
+
+    academics = await db.academics.find({"id": {"$in": [academic_id for academic_id, _ in nearest]}}).to_list(k)
+    academics_by_id = {academic["id"]: academic for academic in academics}
+
+    results = []
+    for academic_id, distance_km in nearest:
+        if academic_id in academics_by_id:
+            academic = Academic(**academics_by_id[academic_id]).dict()
+            academic["distance_km"] = round(distance_km, 3)
+            results.append(academic)
+    return results
+
 @api_router.get("/academics/{academic_id}", response_model=Academic)
-async def get_academic(academic_id: str):
+async def get_academic(academic_id: str, viewer_id: Optional[str] = Depends(get_viewer_id)):
     academic = await db.academics.find_one({"id": academic_id})
     if not academic:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Academic profile not found"
         )
+    profile_views.record(academic.get("user_id"), viewer_id)
     return Academic(**academic)
 
 @api_router.put("/academics/{academic_id}", response_model=Academic)
@@ -1035,17 +1210,13 @@ async def update_academic(
     profile_update: dict = Body(...), 
     current_user: User = Depends(get_current_user)
 ):
-    # Get the current profile
-    academic = await db.academics.find_one({"id": academic_id})
-    if not academic:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Academic profile not found"
-        )
-    
-    # Check permissions
-    if academic["user_id"] != current_user.id and current_user.role != Role.ADMIN:
-        raise HTTPException(
+    def explain(academic):
+        if not academic:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Academic profile not found"
+            )
+        return HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only update your own profile"
         )
@@ -1057,21 +1228,33 @@ async def update_academic(
     if current_user.role != Role.ADMIN and "approval_status" in profile_update:
         del profile_update["approval_status"]
     
-    await db.academics.update_one(
+    # An admin sending a profile back to pending queues it for review again
+    if profile_update.get("approval_status") == ApprovalStatus.PENDING:
+        profile_update.update(submission_fields("academic", profile_update["updated_at"]))
+    
+    # Store keywords under their canonical names
+    if "keywords" in profile_update:
+        await keyword_canonicalizer.refresh(db)
+        profile_update["keywords"] = keyword_canonicalizer.canonicalize(profile_update["keywords"])
+    
+    # Non-admins may only update their own profile
+    previous_academic, updated_academic = await conditional_update_with_previous(
+        db.academics,
         {"id": academic_id},
-        {"$set": profile_update}
+        {} if current_user.role == Role.ADMIN else {"user_id": current_user.id},
+        {"$set": profile_update},
+        explain,
+        ACADEMIC_TRACKED_FIELDS
     )
+    await stats_rollups.record_change(db, previous_academic, updated_academic)
     
-    # Add new keywords to the database
+    # Register new keywords and move the usage counts
     if "keywords" in profile_update:
-        for keyword in profile_update["keywords"]:
-            await db.keywords.update_one(
-                {"name": keyword},
-                {"$set": {"name": keyword}},
-                upsert=True
-            )
+        keyword_completer.apply(await keyword_registry.record_change(
+            db, previous_academic.get("keywords"), updated_academic.get("keywords")
+        ))
     
-    updated_academic = await db.academics.find_one({"id": academic_id})
+    await sync_academic_indexes(updated_academic)
     return Academic(**updated_academic)
 
 # User routes
@@ -1120,348 +1303,199 @@ async def get_user_stats(user_id: str, current_user: User = Depends(get_current_
             detail="You can only access your own stats"
         )
     
-    # Get real stats if available, otherwise return placeholder data
-    # In a real app, these would come from actual database queries
-    
-    # Check if user has a profile
-    profile = await db.academics.find_one({"user_id": user_id})
-    
-    if profile:
-        # For demo purposes, generate random stats
-        # In production, these would be actual metrics from the database
-        profile_views = random.randint(50, 200)
-        connections_count = random.randint(5, 30)
-        messages_count = random.randint(0, 10)
-    else:
-        # Default stats for users without profiles
-        profile_views = 0
-        connections_count = 0
-        messages_count = 0
+    # Denormalized counters, plus profile views still waiting to be flushed
+    counters = await get_user_counters(db, user_id)
     
     return {
-        "profileViews": profile_views,
-        "connections": connections_count, 
-        "messages": messages_count
+        "profileViews": counters.get("profile_views", 0) + profile_views.pending_for(user_id),
+        "connections": counters.get("connections", 0),
+        "messages": counters.get("messages", 0)
     }
 
 # Admin routes
 @api_router.get("/admin/academics", response_model=List[Academic])
 async def get_academics_for_admin(
+    response: Response,
     approval_status: Optional[ApprovalStatus] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_admin)
 ):
     query = {}
     if approval_status:
         query["approval_status"] = approval_status
     
-    academics = await db.academics.find(query).to_list(1000)
+    academics, next_cursor = await paginate(db.academics, query, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [Academic(**academic) for academic in academics]
 
 @api_router.put("/admin/academics/{academic_id}/approve", response_model=Academic)
 async def approve_academic(academic_id: str, current_user: User = Depends(get_current_admin)):
     # Update the approval status
-    await db.academics.update_one(
+    previous_academic, updated_academic = await conditional_update_with_previous(
+        db.academics,
         {"id": academic_id},
-        {"$set": {"approval_status": ApprovalStatus.APPROVED}}
+        {},
+        {"$set": {"approval_status": ApprovalStatus.APPROVED}},
+        not_found("Academic profile not found"),
+        ACADEMIC_TRACKED_FIELDS
     )
-    
-    updated_academic = await db.academics.find_one({"id": academic_id})
-    if not updated_academic:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Academic profile not found"
-        )
+    await stats_rollups.record_change(db, previous_academic, updated_academic)
+    await sync_academic_indexes(updated_academic)
+    admin_dashboard.invalidate()
     
     return Academic(**updated_academic)
 
 @api_router.put("/admin/academics/{academic_id}/reject", response_model=Academic)
 async def reject_academic(academic_id: str, current_user: User = Depends(get_current_admin)):
     # Update the approval status
-    await db.academics.update_one(
+    previous_academic, updated_academic = await conditional_update_with_previous(
+        db.academics,
         {"id": academic_id},
-        {"$set": {"approval_status": ApprovalStatus.REJECTED}}
+        {},
+        {"$set": {"approval_status": ApprovalStatus.REJECTED}},
+        not_found("Academic profile not found"),
+        ACADEMIC_TRACKED_FIELDS
     )
-    
-    updated_academic = await db.academics.find_one({"id": academic_id})
-    if not updated_academic:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Academic profile not found"
-        )
+    await stats_rollups.record_change(db, previous_academic, updated_academic)
+    await sync_academic_indexes(updated_academic)
+    admin_dashboard.invalidate()
     
     return Academic(**updated_academic)
 
+@api_router.get("/admin/indexes")
+async def get_index_report(current_user: User = Depends(get_current_admin)):
+    """
+    Report declared Mongo indexes that are missing or unused, and live indexes
+    that are not declared in the registry.
+    """
+    return await index_report(db)
+
+@api_router.get("/admin/password-pool")
+async def get_password_pool_metrics(current_user: User = Depends(get_current_admin)):
+    """Concurrency and queue depth of the bcrypt worker pool"""
+    return password_hasher.metrics()
+
 # Keyword routes
 @api_router.get("/keywords", response_model=List[Keyword])
 async def get_keywords():
-    keywords = await db.keywords.find().to_list(1000)
+    """Keywords in use, most used first, with how many profiles use each"""
+    keywords = await keyword_registry.in_use(db)
     return [Keyword(**keyword) for keyword in keywords]
 
+@api_router.get("/admin/keyword-synonyms")
+async def get_keyword_synonyms(current_user: User = Depends(get_current_admin)):
+    return await keyword_canonicalizer.list_synonyms(db)
+
+@api_router.put("/admin/keyword-synonyms")
+async def set_keyword_synonym(synonym: KeywordSynonymCreate, current_user: User = Depends(get_current_admin)):
+    """
+    Fold an alias (e.g. "ML") into a canonical keyword. New writes use it at
+    once; run the re-canonicalize job to rewrite existing profiles.
+    """
+    try:
+        return await keyword_canonicalizer.set_synonym(db, synonym.alias, synonym.canonical)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@api_router.delete("/admin/keyword-synonyms/{alias}")
+async def delete_keyword_synonym(alias: str, current_user: User = Depends(get_current_admin)):
+    if not await keyword_canonicalizer.remove_synonym(db, alias):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Synonym not found"
+        )
+    return {"message": "Synonym deleted successfully"}
+
+@api_router.post("/admin/keywords/recanonicalize")
+async def recanonicalize_keywords(current_user: User = Depends(get_current_admin)):
+    """
+    Rewrite existing academic profiles' keywords in canonical form, then
+    recount usage and rebuild the keyword-backed indexes.
+    """
+    changed = await keyword_canonicalizer.recanonicalize(db)
+    await keyword_registry.recount(db)
+    await keyword_completer.load(db)
+    await nearby_index.load(db)
+    await globe_index.load(db)
+    await keyword_cooccurrence.load(db)
+    return {"updated_profiles": changed}
+
+@api_router.get("/keywords/complete")
+async def complete_keywords(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=MAX_COMPLETIONS)
+):
+    """The most used keywords starting with prefix, case-insensitively"""
+    return keyword_completer.complete(prefix, limit)
+
+@api_router.get("/keywords/{name:path}/related")
+async def get_related_keywords(name: str, limit: int = Query(10, ge=1, le=50)):
+    """
+    Keywords and research interests most often used together with name on
+    approved profiles, scored by the cosine of the profiles using each
+    """
+    return keyword_cooccurrence.related(name, limit)
+
 # Stats routes
 @api_router.get("/stats/academics-by-city")
 async def get_academics_by_city(country: Optional[str] = Query(None)):
-    pipeline = [
-        {"$match": {"approval_status": ApprovalStatus.APPROVED}},
-    ]
-    
-    if country:
-        pipeline[0]["$match"]["country"] = country
-    
-    pipeline.extend([
-        {"$group": {"_id": {"country": "$country", "city": "$city"}, "count": {"$sum": 1}}},
-        {"$sort": {"_id.country": 1, "_id.city": 1}}
-    ])
-    
-    results = await db.academics.aggregate(pipeline).to_list(1000)
-    
-    formatted_results = []
-    for result in results:
-        formatted_results.append({
-            "country": result["_id"]["country"],
-            "city": result["_id"]["city"],
-            "count": result["count"]
-        })
-    
-    return formatted_results
+    return await stats_rollups.by_city(db, country)
 
 @api_router.get("/stats/academics-by-field")
 async def get_academics_by_field():
-    pipeline = [
-        {"$match": {"approval_status": ApprovalStatus.APPROVED}},
-        {"$group": {"_id": "$research_field", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}}
-    ]
-    
-    results = await db.academics.aggregate(pipeline).to_list(1000)
-    
-    formatted_results = []
-    for result in results:
-        formatted_results.append({
-            "field": result["_id"],
-            "count": result["count"]
-        })
-    
-    return formatted_results
+    return await stats_rollups.by_field(db)
+
+def globe_response(points: List[dict], request: Request):
+    """
+    JSON points by default, or the packed columnar encoding when the client
+    asks for it in its Accept header.
+    """
+    headers = {"Vary": "Accept"}
+    if accepts_globe_binary(request.headers.get("accept")):
+        return Response(
+            content=encode_globe_points(points),
+            media_type=GLOBE_BINARY_MEDIA_TYPE,
+            headers=headers
+        )
+    return JSONResponse(content=points, headers=headers)
 
 # Globe data endpoint
 @api_router.get("/globe-data")
-async def get_globe_data():
-    # Sample data for the globe visualization
-    sample_data = [
-        # Bangladesh academics
-        {
-            "id": "bd-1",
-            "name": "Dr. Rahim Ahmed",
-            "university": "Bangladesh University of Engineering and Technology",
-            "field": "Computer Science",
-            "bio": "Pioneering researcher in machine learning and artificial intelligence with a focus on natural language processing for Bangla language.",
-            "country": "Bangladesh",
-            "city": "Dhaka",
-            "lat": 23.7104,
-            "lng": 90.4074,
-            "publications": 45,
-            "research_areas": ["AI", "NLP", "Deep Learning"],
-            "email": "rahim.ahmed@buet.ac.bd",
-            "phone": "+880 1XX-XXXXXXX"
-        },
-        {
-            "id": "bd-2",
-            "name": "Dr. Farida Begum",
-            "university": "University of Dhaka",
-            "field": "Medicine",
-            "bio": "Expert in infectious diseases research with extensive experience in tropical medicine and community health initiatives.",
-            "country": "Bangladesh",
-            "city": "Dhaka",
-            "lat": 23.7300,
-            "lng": 90.3900,
-            "publications": 32,
-            "research_areas": ["Infectious Diseases", "Tropical Medicine", "Public Health"],
-            "email": "farida.begum@du.ac.bd",
-            "phone": "+880 1XX-XXXXXXX"
-        },
-        {
-            "id": "bd-3",
-            "name": "Dr. Anisur Rahman",
-            "university": "Jahangirnagar University",
-            "field": "Environmental Science",
-            "bio": "Environmental researcher specializing in climate change impacts on Bangladesh's coastal regions and sustainable development.",
-            "country": "Bangladesh",
-            "city": "Savar",
-            "lat": 23.8830,
-            "lng": 90.2670,
-            "publications": 28,
-            "research_areas": ["Climate Change", "Coastal Ecology", "Sustainable Development"],
-            "email": "anisur.rahman@ju.ac.bd",
-            "phone": "+880 1XX-XXXXXXX"
-        },
-        {
-            "id": "bd-4",
-            "name": "Dr. Taslima Khatun",
-            "university": "Rajshahi University",
-            "field": "Agricultural Science",
-            "bio": "Agricultural scientist working on crop improvement and sustainable farming practices for rural Bangladesh.",
-            "country": "Bangladesh",
-            "city": "Rajshahi",
-            "lat": 24.3636,
-            "lng": 88.6241,
-            "publications": 22,
-            "research_areas": ["Agronomy", "Crop Science", "Food Security"],
-            "email": "taslima.khatun@ru.ac.bd",
-            "phone": "+880 1XX-XXXXXXX"
-        },
-        {
-            "id": "bd-5",
-            "name": "Dr. Kamal Hossain",
-            "university": "Chittagong University of Engineering and Technology",
-            "field": "Civil Engineering",
-            "bio": "Civil engineer specializing in earthquake-resistant structures and infrastructure development in seismic zones.",
-            "country": "Bangladesh",
-            "city": "Chittagong",
-            "lat": 22.4716,
-            "lng": 91.7877,
-            "publications": 19,
-            "research_areas": ["Structural Engineering", "Earthquake Engineering", "Infrastructure"],
-            "email": "kamal.hossain@cuet.ac.bd",
-            "phone": "+880 1XX-XXXXXXX"
-        },
-        
-        # International academics
-        {
-            "id": "int-1",
-            "name": "Dr. John Smith",
-            "university": "MIT",
-            "field": "Robotics",
-            "bio": "Leading researcher in advanced robotics with a focus on human-robot interaction and autonomous systems.",
-            "country": "USA",
-            "city": "Boston",
-            "lat": 42.3601,
-            "lng": -71.0942,
-            "publications": 78,
-            "research_areas": ["Robotics", "AI", "Human-Robot Interaction"],
-            "email": "john.smith@mit.edu",
-            "phone": "+1 XXX-XXX-XXXX"
-        },
-        {
-            "id": "int-2",
-            "name": "Dr. Sarah Johnson",
-            "university": "University of Oxford",
-            "field": "Literature",
-            "bio": "Literary scholar specializing in South Asian literature with focus on Bengali works in translation.",
-            "country": "UK",
-            "city": "Oxford",
-            "lat": 51.7520,
-            "lng": -1.2577,
-            "publications": 42,
-            "research_areas": ["South Asian Literature", "Translation Studies", "Postcolonial Theory"],
-            "email": "sarah.johnson@oxford.ac.uk",
-            "phone": "+44 XXXX XXXXXX"
-        },
-        {
-            "id": "int-3",
-            "name": "Dr. Takashi Yamamoto",
-            "university": "University of Tokyo",
-            "field": "Physics",
-            "bio": "Theoretical physicist working on quantum field theory with collaborative projects with Bangladeshi institutions.",
-            "country": "Japan",
-            "city": "Tokyo",
-            "lat": 35.6895,
-            "lng": 139.6917,
-            "publications": 64,
-            "research_areas": ["Quantum Physics", "Theoretical Physics", "Particle Physics"],
-            "email": "takashi.yamamoto@u-tokyo.ac.jp",
-            "phone": "+81 XX-XXXX-XXXX"
-        },
-        {
-            "id": "int-4",
-            "name": "Dr. Fatima Khan",
-            "university": "University of Toronto",
-            "field": "Economics",
-            "bio": "Economist studying developmental economics with a focus on microfinance and poverty alleviation in South Asia.",
-            "country": "Canada",
-            "city": "Toronto",
-            "lat": 43.6532,
-            "lng": -79.3832,
-            "publications": 37,
-            "research_areas": ["Developmental Economics", "Microfinance", "Poverty Studies"],
-            "email": "fatima.khan@utoronto.ca",
-            "phone": "+1 XXX-XXX-XXXX"
-        },
-        {
-            "id": "int-5",
-            "name": "Dr. Mohammad Rahman",
-            "university": "Stanford University",
-            "field": "Computer Science",
-            "bio": "Computer scientist specializing in big data analytics and machine learning applications in healthcare.",
-            "country": "USA",
-            "city": "Palo Alto",
-            "lat": 37.4419,
-            "lng": -122.1430,
-            "publications": 52,
-            "research_areas": ["Big Data", "Machine Learning", "Healthcare Informatics"],
-            "email": "mohammad.rahman@stanford.edu",
-            "phone": "+1 XXX-XXX-XXXX"
-        },
-        {
-            "id": "int-6",
-            "name": "Dr. Amina Patel",
-            "university": "University of Melbourne",
-            "field": "Public Health",
-            "bio": "Public health researcher specializing in health systems strengthening in developing countries.",
-            "country": "Australia",
-            "city": "Melbourne",
-            "lat": -37.8136,
-            "lng": 144.9631,
-            "publications": 29,
-            "research_areas": ["Public Health", "Health Systems", "Global Health"],
-            "email": "amina.patel@unimelb.edu.au",
-            "phone": "+61 X XXXX XXXX"
-        },
-        {
-            "id": "int-7",
-            "name": "Dr. Abdullah Al-Farabi",
-            "university": "Technical University of Munich",
-            "field": "Mechanical Engineering",
-            "bio": "Mechanical engineer specializing in renewable energy technologies and sustainable engineering.",
-            "country": "Germany",
-            "city": "Munich",
-            "lat": 48.1351,
-            "lng": 11.5820,
-            "publications": 31,
-            "research_areas": ["Renewable Energy", "Sustainable Engineering", "Thermodynamics"],
-            "email": "abdullah.alfarabi@tum.de",
-            "phone": "+49 XXX XXXXXXXX"
-        },
-        {
-            "id": "int-8",
-            "name": "Dr. Priya Sharma",
-            "university": "National University of Singapore",
-            "field": "Bioengineering",
-            "bio": "Bioengineer working on tissue engineering and regenerative medicine with applications in tropical diseases.",
-            "country": "Singapore",
-            "city": "Singapore",
-            "lat": 1.2966,
-            "lng": 103.7764,
-            "publications": 40,
-            "research_areas": ["Tissue Engineering", "Regenerative Medicine", "Tropical Diseases"],
-            "email": "priya.sharma@nus.edu.sg",
-            "phone": "+65 XXXX XXXX"
-        }
-    ]
-    return sample_data
-
-@api_router.get("/academics/{academic_id}")
-async def get_academic_by_id(academic_id: str):
-    """Get details of a specific academic by ID"""
-    # Get all sample data
-    all_academics = await get_globe_data()
-    
-    # Find the academic with the matching ID
-    for academic in all_academics:
-        if academic["id"] == academic_id:
-            return academic
-            
-    # If not found, raise a 404 error
-    raise HTTPException(status_code=404, detail="Academic not found")
+async def get_globe_data(
+    request: Request,
+    zoom: Optional[int] = Query(None, ge=0, description="Globe zoom level; omit for every individual academic")
+):
+    """
+    Approved academics for the globe visualization.
+    With a zoom level, nearby academics are merged into cluster centroids
+    with counts until the zoom is high enough to show them individually.
+    """
+    if zoom is None:
+        return globe_response(list(globe_index.points.values()), request)
+    return globe_response(globe_index.clusters(zoom), request)
+
+@api_router.get("/globe-data/viewport")
+async def get_globe_viewport(
+    request: Request,
+    bbox: str = Query(..., description="Visible area as west,south,east,north in degrees"),
+    zoom: int = Query(..., ge=0, description="Globe zoom level")
+):
+    """
+    Clusters, or individual academics at high zoom, inside the visible area only.
+    """
+    try:
+        bounds = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid bbox: {str(e)}"
+        )
+    return globe_response(globe_index.viewport(bounds, zoom), request)
 
 # Test route
 @api_router.get("/")
@@ -1608,6 +1642,7 @@ async def verify_email(token: str):
         {"id": token_data["user_id"]},
         {"$set": {"email_verified": True}}
     )
+    user_cache.invalidate(token_data["user_id"])
     
     # Update profile status if exists
     await db.profiles.update_one(
@@ -1620,18 +1655,23 @@ async def verify_email(token: str):
 # Admin routes for profile approval workflow
 @api_router.get("/admin/profiles", response_model=List[ResearcherProfile])
 async def get_profiles_for_admin(
+    response: Response,
     status: Optional[ProfileStatus] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     current_user: User = Depends(get_current_admin)
 ):
     """
-    Get all researcher profiles for admin review.
-    Optionally filter by status.
+    Get researcher profiles for admin review, newest first.
+    Optionally filter by status; page with the X-Next-Cursor header.
     """
     query = {}
     if status:
         query["status"] = status
     
-    profiles = await db.researcher_profiles.find(query).to_list(1000)
+    profiles, next_cursor = await paginate(db.researcher_profiles, query, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return profiles
 
 
@@ -1661,28 +1701,25 @@ async def approve_profile(
     """
     Approve a researcher profile.
     """
-    # Check if profile exists
-    profile = await db.researcher_profiles.find_one({"id": profile_id})
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found"
-        )
-    
     # Update status to approved
-    await db.researcher_profiles.update_one(
+    updated_profile = await conditional_update(
+        db.researcher_profiles,
         {"id": profile_id},
+        {},
         {"$set": {
             "status": ProfileStatus.APPROVED,
             "updated_at": datetime.now()
-        }}
+        }},
+        not_found("Profile not found")
     )
-    
-    # Get the updated profile
-    updated_profile = await db.researcher_profiles.find_one({"id": profile_id})
+    search_index.sync(updated_profile)
+    facet_store.sync(updated_profile)
+    keyword_cooccurrence.sync_profile(updated_profile)
+    await suggestion_engine.sync(db, updated_profile)
+    admin_dashboard.invalidate()
     
     # Get user info for notification
-    user = await db.users.find_one({"id": profile["user_id"]})
+    user = await db.users.find_one({"id": updated_profile["user_id"]})
     
     # Send notification in background (just log it for now)
     if background_tasks and user:
@@ -1706,30 +1743,27 @@ async def reject_profile(
     """
     Reject a researcher profile with feedback.
     """
-    # Check if profile exists
-    profile = await db.researcher_profiles.find_one({"id": profile_id})
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found"
-        )
-    
     # Update status to rejected and add feedback
-    await db.researcher_profiles.update_one(
+    updated_profile = await conditional_update(
+        db.researcher_profiles,
         {"id": profile_id},
+        {},
         {"$set": {
             "status": ProfileStatus.DRAFT,  # Set back to draft for editing
             "feedback": feedback.get("message", ""),
             "rejection_reason": feedback.get("reason", ""),
             "updated_at": datetime.now()
-        }}
+        }},
+        not_found("Profile not found")
     )
-    
-    # Get the updated profile
-    updated_profile = await db.researcher_profiles.find_one({"id": profile_id})
+    search_index.sync(updated_profile)
+    facet_store.sync(updated_profile)
+    keyword_cooccurrence.sync_profile(updated_profile)
+    await suggestion_engine.sync(db, updated_profile)
+    admin_dashboard.invalidate()
     
     # Get user info for notification
-    user = await db.users.find_one({"id": profile["user_id"]})
+    user = await db.users.find_one({"id": updated_profile["user_id"]})
     
     # Send notification in background (just log it for now)
     if background_tasks and user:
@@ -1743,6 +1777,101 @@ async def reject_profile(
     return updated_profile
 
 
+@api_router.get("/admin/dashboard")
+async def get_admin_dashboard(current_user: User = Depends(get_current_admin)):
+    """
+    Status counts, pending-review age percentiles, per-field and per-country
+    breakdowns and recent signups in one response, refreshed every few seconds.
+    """
+    return await admin_dashboard.get(db)
+
+
+@api_router.get("/admin/review-queue")
+async def get_review_queue(
+    response: Response,
+    kind: str = Query("profile", description="profile or academic"),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Pending researcher or academic profiles awaiting review: those submitted
+    on the earliest day first and, within a day, the most complete first.
+    """
+    if kind not in REVIEW_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown review kind: {kind}"
+        )
+    page, next_cursor = await review_queue(db, kind, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
+
+
+@api_router.post("/admin/review-queue/decisions")
+async def decide_review_queue(
+    decision: ReviewDecisionCreate,
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Approve or reject many pending profiles at once.
+    Items no longer pending are skipped and reported back; owners of the
+    decided items are emailed through the outbox in one batch.
+    """
+    if decision.kind not in REVIEW_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown review kind: {decision.kind}"
+        )
+
+    if decision.kind == "profile":
+        changes = {"updated_at": datetime.now()}
+        if not decision.approve:
+            changes.update({"feedback": decision.message or "", "rejection_reason": decision.reason or ""})
+        decided = await apply_decisions(db, "profile", decision.ids, decision.approve, changes)
+        for profile in decided:
+            search_index.sync(profile)
+            facet_store.sync(profile)
+            keyword_cooccurrence.sync_profile(profile)
+        await suggestion_engine.sync_many(db, decided)
+        subject = "Profile Approved" if decision.approve else "Profile Needs Updates"
+        body = (
+            "Your researcher profile has been approved and is now publicly visible."
+            if decision.approve else
+            f"Your researcher profile requires some updates before it can be approved: {decision.message or ''}"
+        )
+    else:
+        decided = await apply_decisions(db, "academic", decision.ids, decision.approve)
+        # Pending academics count towards no rollup, so only the new versions add to the counts
+        await stats_rollups.record_changes(db, [(None, academic) for academic in decided])
+        await sync_many_academic_indexes(decided)
+        subject = "Academic Profile Approved" if decision.approve else "Academic Profile Rejected"
+        body = (
+            "Your academic profile has been approved and is now publicly visible."
+            if decision.approve else
+            f"Your academic profile was not approved. {decision.message or ''}".strip()
+        )
+
+    if decided:
+        users = await db.users.find(
+            {"id": {"$in": [document["user_id"] for document in decided]}},
+            {"_id": 0, "email": 1}
+        ).to_list(None)
+        await enqueue_emails(db, [
+            {"to": user["email"], "subject": subject, "body": body, "kind": "review_decision"}
+            for user in users if user.get("email")
+        ])
+
+    if decided:
+        admin_dashboard.invalidate()
+    decided_ids = {document["id"] for document in decided}
+    return {
+        "decided": sorted(decided_ids),
+        "skipped": [document_id for document_id in dict.fromkeys(decision.ids) if document_id not in decided_ids]
+    }
+
+
 async def log_notification(email: str, subject: str, message: str):
     """
     Helper function to log notifications until email service is implemented.
@@ -1776,20 +1905,6 @@ async def create_connection_request(
             detail="Cannot send connection request to yourself"
         )
     
-    # Check if a connection already exists
-    existing_connection = await db.connections.find_one({
-        "$or": [
-            {"requester_id": current_user["id"], "recipient_id": connection.recipient_id},
-            {"requester_id": connection.recipient_id, "recipient_id": current_user["id"]}
-        ]
-    })
-    
-    if existing_connection:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Connection request already exists"
-        )
-    
     # Create connection request
     connection_request = ConnectionRequest(
         requester_id=current_user["id"],
@@ -1797,20 +1912,37 @@ async def create_connection_request(
         message=connection.message
     )
     
-    # Insert into database
-    await db.connections.insert_one(connection_request.dict())
+    # Insert into database; the unique pair key rejects a second request
+    # between the same two users, in either direction
+    try:
+        await db.connections.insert_one({
+            **connection_request.dict(),
+            "pair_key": connection_pair_key(current_user["id"], connection.recipient_id)
+        })
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Connection request already exists"
+        )
+    await adjust_user_counters(
+        db, connection_counter_deltas(connection_request.dict(), None, ConnectionStatus.PENDING)
+    )
+    await suggestion_engine.forget_pair(db, current_user["id"], connection.recipient_id)
     
     return connection_request
 
 
 @api_router.get("/connections", response_model=List[ConnectionRequest])
 async def get_my_connections(
+    response: Response,
     status: Optional[ConnectionStatus] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get all connection requests for the current user.
-    Optionally filter by status.
+    Get connection requests for the current user, newest first.
+    Optionally filter by status; page with the X-Next-Cursor header.
     """
     # Build the query
     query = {
@@ -1825,7 +1957,9 @@ async def get_my_connections(
         query["status"] = status
     
     # Fetch connections
-    connections = await db.connections.find(query).to_list(1000)
+    connections, next_cursor = await paginate(db.connections, query, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return connections
 
@@ -1839,40 +1973,41 @@ async def accept_connection(
     Accept a connection request.
     Only the recipient can accept a connection request.
     """
-    # Find the connection request
-    connection = await db.connections.find_one({"id": connection_id})
-    
-    if not connection:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Connection request not found"
-        )
-    
-    # Check if the current user is the recipient
-    if connection["recipient_id"] != current_user["id"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only the recipient can accept a connection request"
-        )
-    
-    # Check if the connection is already accepted
-    if connection["status"] == ConnectionStatus.ACCEPTED:
-        raise HTTPException(
+    def explain(connection):
+        if not connection:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Connection request not found"
+            )
+        if connection["recipient_id"] != current_user["id"]:
+            return HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the recipient can accept a connection request"
+            )
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Connection request already accepted"
         )
     
-    # Update the connection status
-    await db.connections.update_one(
+    # Accept it if the current user is the recipient and it is not accepted yet
+    changes = {
+        "status": ConnectionStatus.ACCEPTED,
+        "updated_at": datetime.now()
+    }
+    previous_connection = await conditional_update(
+        db.connections,
         {"id": connection_id},
-        {"$set": {
-            "status": ConnectionStatus.ACCEPTED,
-            "updated_at": datetime.now()
-        }}
+        {"recipient_id": current_user["id"], "status": {"$ne": ConnectionStatus.ACCEPTED}},
+        {"$set": changes},
+        explain,
+        return_previous=True
     )
+    await adjust_user_counters(db, connection_counter_deltas(
+        previous_connection, previous_connection["status"], ConnectionStatus.ACCEPTED
+    ))
     
-    # Return the updated connection
-    updated_connection = await db.connections.find_one({"id": connection_id})
+    updated_connection = {**previous_connection, **changes}
+    connection_graph.sync(updated_connection)
     return updated_connection
 
 
@@ -1885,95 +2020,120 @@ async def reject_connection(
     Reject a connection request.
     Only the recipient can reject a connection request.
     """
-    # Find the connection request
-    connection = await db.connections.find_one({"id": connection_id})
-    
-    if not connection:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Connection request not found"
-        )
-    
-    # Check if the current user is the recipient
-    if connection["recipient_id"] != current_user["id"]:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only the recipient can reject a connection request"
+    def explain(connection):
+        if not connection:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Connection request not found"
+            )
+        if connection["recipient_id"] != current_user["id"]:
+            return HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the recipient can reject a connection request"
+            )
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Connection request already rejected"
         )
     
-    # Update the connection status
-    await db.connections.update_one(
+    # Update the connection status; counters move by the status it actually had,
+    # and a request that is already rejected is left alone so they don't move twice
+    changes = {
+        "status": ConnectionStatus.REJECTED,
+        "updated_at": datetime.now()
+    }
+    previous_connection = await conditional_update(
+        db.connections,
         {"id": connection_id},
-        {"$set": {
-            "status": ConnectionStatus.REJECTED,
-            "updated_at": datetime.now()
-        }}
+        {"recipient_id": current_user["id"], "status": {"$ne": ConnectionStatus.REJECTED}},
+        {"$set": changes},
+        explain,
+        return_previous=True
     )
+    await adjust_user_counters(db, connection_counter_deltas(
+        previous_connection, previous_connection["status"], ConnectionStatus.REJECTED
+    ))
     
-    # Return the updated connection
-    updated_connection = await db.connections.find_one({"id": connection_id})
+    updated_connection = {**previous_connection, **changes}
+    connection_graph.sync(updated_connection)
     return updated_connection
 
 
+@api_router.get("/connections/mutual/{user_id}")
+async def get_mutual_connections(
+    user_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Users connected to both the current user and the given user.
+    """
+    mutual = connection_graph.mutual(current_user["id"], user_id)
+    return {"user_id": user_id, "count": len(mutual), "mutual_ids": mutual}
+
+
+@api_router.get("/connections/path/{user_id}")
+async def get_connection_path(
+    user_id: str,
+    max_depth: int = Query(MAX_PATH_DEPTH, ge=1, le=MAX_PATH_DEPTH),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    A shortest chain of accepted connections from the current user to the
+    given user. degrees is null when they are not linked within max_depth.
+    """
+    path = connection_graph.path(current_user["id"], user_id, max_depth)
+    return {
+        "user_id": user_id,
+        "degrees": len(path) - 1 if path else None,
+        "path": path or []
+    }
+
+
 @api_router.get("/connections/suggestions", response_model=List[ResearcherProfile])
 async def get_connection_suggestions(
     limit: int = Query(10, ge=1, le=50),
     current_user: dict = Depends(get_current_user)
 ):
     """
-    Get connection suggestions based on research interests.
+    Get connection suggestions ranked by shared research interests,
+    institution and location.
     """
-    # Get the current user's profile
-    my_profile = await db.researcher_profiles.find_one({"user_id": current_user["id"]})
+    suggested_ids = await suggestion_engine.suggested_ids(db, current_user["id"], limit)
     
-    if not my_profile or not my_profile.get("research_interests"):
-        # If no profile or no research interests, just return some random approved profiles
+    if not suggested_ids:
+        # No profile to rank from yet, so just return some approved profiles the user isn't already linked to
+        excluded_ids = await suggestion_engine.excluded_ids(db, current_user["id"])
         suggestions = await db.researcher_profiles.find({
             "status": "approved",
-            "user_id": {"$ne": current_user["id"]}
+            "user_id": {"$nin": list(excluded_ids)}
         }).limit(limit).to_list(limit)
         return suggestions
     
-    # Get my connections (to exclude them from suggestions)
-    my_connections = await db.connections.find({
-        "$or": [
-            {"requester_id": current_user["id"]},
-            {"recipient_id": current_user["id"]}
-        ],
-        "status": {"$in": [ConnectionStatus.PENDING, ConnectionStatus.ACCEPTED]}
-    }).to_list(1000)
-    
-    connected_user_ids = set()
-    for conn in my_connections:
-        connected_user_ids.add(conn["requester_id"])
-        connected_user_ids.add(conn["recipient_id"])
-    
-    # Remove my own ID if it's in the set
-    if current_user["id"] in connected_user_ids:
-        connected_user_ids.remove(current_user["id"])
-    
-    # Find researchers with similar interests
-    suggestions = await db.researcher_profiles.find({
+    profiles = await db.researcher_profiles.find({
         "status": "approved",
-        "user_id": {"$nin": list(connected_user_ids)},
-        "research_interests": {"$in": my_profile.get("research_interests", [])}
-    }).limit(limit).to_list(limit)
-    
-    # If we don't have enough suggestions, get some random ones
-    if len(suggestions) < limit:
-        random_limit = limit - len(suggestions)
-        existing_ids = [s["user_id"] for s in suggestions]
-        random_suggestions = await db.researcher_profiles.find({
-            "status": "approved",
-            "user_id": {"$nin": list(connected_user_ids) + existing_ids}
-        }).limit(random_limit).to_list(random_limit)
-        
-        suggestions.extend(random_suggestions)
+        "user_id": {"$in": suggested_ids}
+    }).to_list(limit)
+    rank = {user_id: position for position, user_id in enumerate(suggested_ids)}
+    profiles.sort(key=lambda profile: rank[profile["user_id"]])
     
-    return suggestions
+    return profiles
 
 
 # Research Project endpoints
+def is_project_admin(project: dict, user_id: str) -> bool:
+    return any(
+        member["user_id"] == user_id
+        and ("admin" in member.get("permissions", []) or member["role"] == "owner")
+        for member in project.get("team_members", [])
+    )
+
+def project_admin_condition(user_id: str) -> dict:
+    """Filter for projects on which the user is an owner or has admin permissions, as is_project_admin checks"""
+    return {"team_members": {"$elemMatch": {
+        "user_id": user_id,
+        "$or": [{"permissions": "admin"}, {"role": "owner"}]
+    }}}
+
 @api_router.post("/projects", response_model=ResearchProject)
 async def create_project(
     project: ResearchProjectCreate,
@@ -2004,12 +2164,15 @@ async def create_project(
 
 @api_router.get("/projects", response_model=List[ResearchProject])
 async def list_projects(
+    response: Response,
     current_user: dict = Depends(get_current_user),
-    status: Optional[ProjectStatus] = None
+    status: Optional[ProjectStatus] = None,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None)
 ):
     """
-    List all research projects where the current user is a team member.
-    Optionally filter by status.
+    List research projects where the current user is a team member, newest first.
+    Optionally filter by status; page with the X-Next-Cursor header.
     """
     # Build query
     query = {
@@ -2020,7 +2183,9 @@ async def list_projects(
         query["status"] = status
     
     # Execute query
-    projects = await db.research_projects.find(query).to_list(1000)
+    projects, next_cursor = await paginate(db.research_projects, query, cursor, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return projects
 
@@ -2064,41 +2229,29 @@ async def update_project(
     Update a research project.
     User must be a team member with edit permissions.
     """
-    # Get the project
-    project = await db.research_projects.find_one({"id": project_id})
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    # Check if user is a team member with edit permissions
-    is_admin = False
-    for member in project["team_members"]:
-        if member["user_id"] == current_user["id"]:
-            if "admin" in member.get("permissions", []) or member["role"] == "owner":
-                is_admin = True
-                break
-    
-    if not is_admin:
-        raise HTTPException(
+    def explain(project):
+        if not project:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        return HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to edit this project"
         )
     
-    # Update the project
+    # Update the project if the user is a team member with edit permissions
     update_data = project_update.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.now()
     
-    await db.research_projects.update_one(
+    updated_project = await conditional_update(
+        db.research_projects,
         {"id": project_id},
-        {"$set": update_data}
+        project_admin_condition(current_user["id"]),
+        {"$set": update_data},
+        explain
     )
     
-    # Get updated project
-    updated_project = await db.research_projects.find_one({"id": project_id})
-    
     return updated_project
 
 
@@ -2164,32 +2317,18 @@ async def add_team_member(
             detail="User not found"
         )
     
-    # Get the project
-    project = await db.research_projects.find_one({"id": project_id})
-    
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
-    
-    # Check if user is a team member with admin permissions
-    is_admin = False
-    for member in project["team_members"]:
-        if member["user_id"] == current_user["id"]:
-            if "admin" in member.get("permissions", []) or member["role"] == "owner":
-                is_admin = True
-                break
-    
-    if not is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You do not have permission to add team members"
-        )
-    
-    # Check if user is already a team member
-    if any(member["user_id"] == member_data["user_id"] for member in project["team_members"]):
-        raise HTTPException(
+    def explain(project):
+        if not project:
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found"
+            )
+        if not is_project_admin(project, current_user["id"]):
+            return HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You do not have permission to add team members"
+            )
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User is already a team member"
         )
@@ -2203,18 +2342,21 @@ async def add_team_member(
         else:
             member_data["permissions"] = ["view"]
     
-    # Add the team member
-    await db.research_projects.update_one(
+    # Add the team member, if the user has admin permissions and the new member isn't on the team yet
+    updated_project = await conditional_update(
+        db.research_projects,
         {"id": project_id},
+        {
+            **project_admin_condition(current_user["id"]),
+            "team_members.user_id": {"$ne": member_data["user_id"]}
+        },
         {
             "$push": {"team_members": member_data},
             "$set": {"updated_at": datetime.now()}
-        }
+        },
+        explain
     )
     
-    # Get updated project
-    updated_project = await db.research_projects.find_one({"id": project_id})
-    
     return updated_project
 
 
@@ -2230,6 +2372,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def prepare_indexes():
+    await backfill_connection_pair_keys(db)
+    await backfill_review_queue_fields(db)
+    await ensure_indexes(db)
+    await search_index.load(db)
+    await facet_store.load(db)
+    await globe_index.load(db)
+    await nearby_index.load(db)
+    await connection_graph.load(db)
+    await suggestion_engine.load(db)
+    await stats_rollups.ensure_built(db)
+    await ensure_user_counters(db)
+    await keyword_registry.ensure_counted(db)
+    await keyword_completer.load(db)
+    await keyword_canonicalizer.load(db)
+    await keyword_cooccurrence.load(db)
+    profile_views.start(db)
+    email_outbox.start(db)
+    admin_digest.start(db)
+    suggestion_engine.start(db)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await profile_views.stop(db)
+    await suggestion_engine.stop()
+    await admin_digest.stop(db)
+    await email_outbox.stop()
+    password_hasher.shutdown()
+    await rate_limiter.close()
     client.close()
@@ -0,0 +1 @@
+# This file makes the stats directory a Python package
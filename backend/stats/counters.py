@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+USER_COUNTERS_COLLECTION = "user_counters"
+
+
+def connection_counter_deltas(
+    connection: dict,
+    before_status: Optional[str],
+    after_status: Optional[str]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Per-user counter changes for a connection moving between statuses.
+    Accepted connections count for both users; pending requests count as
+    unanswered messages for the recipient.
+    """
+    deltas: Dict[str, Dict[str, int]] = {}
+
+    def bump(user_id: str, field: str, delta: int):
+        fields = deltas.setdefault(user_id, {})
+        fields[field] = fields.get(field, 0) + delta
+
+    for connection_status, sign in ((before_status, -1), (after_status, 1)):
+        if connection_status == "accepted":
+            bump(connection["requester_id"], "connections", sign)
+            bump(connection["recipient_id"], "connections", sign)
+        elif connection_status == "pending":
+            bump(connection["recipient_id"], "messages", sign)
+
+    return {
+        user_id: {field: delta for field, delta in fields.items() if delta}
+        for user_id, fields in deltas.items()
+        if any(fields.values())
+    }
+
+
+async def adjust_user_counters(db, deltas: Dict[str, Dict[str, int]]):
+    """Apply {user_id: {counter: delta}} in one bulk write"""
+    operations = [
+        UpdateOne({"_id": user_id}, {"$inc": fields}, upsert=True)
+        for user_id, fields in deltas.items() if fields
+    ]
+    if operations:
+        await db[USER_COUNTERS_COLLECTION].bulk_write(operations, ordered=False)
+
+
+async def get_user_counters(db, user_id: str) -> dict:
+    counters = await db[USER_COUNTERS_COLLECTION].find_one({"_id": user_id})
+    return counters or {}
+
+
+async def ensure_user_counters(db):
+    """Seed the connection and message counters from the connections collection on first start"""
+    if await db[USER_COUNTERS_COLLECTION].estimated_document_count() > 0:
+        return
+    counts: Dict[str, Dict[str, int]] = {}
+    for connection_status, field, counted_fields in (
+        ("accepted", "connections", ("requester_id", "recipient_id")),
+        ("pending", "messages", ("recipient_id",)),
+    ):
+        for user_field in counted_fields:
+            results = await db.connections.aggregate([
+                {"$match": {"status": connection_status}},
+                {"$group": {"_id": f"${user_field}", "count": {"$sum": 1}}},
+            ]).to_list(None)
+            for result in results:
+                fields = counts.setdefault(result["_id"], {})
+                fields[field] = fields.get(field, 0) + result["count"]
+
+    operations = [
+        UpdateOne({"_id": user_id}, {"$set": fields}, upsert=True)
+        for user_id, fields in counts.items()
+    ]
+    if operations:
+        await db[USER_COUNTERS_COLLECTION].bulk_write(operations, ordered=False)
+    logger.info(f"Seeded connection counters for {len(operations)} users")
+
+
+class ViewCounter:
+    """
+    Write-behind buffer for profile views.
+
+    Views are counted in memory and flushed every few seconds as one bulk
+    write of $inc per viewed user, so a popular profile costs one database
+    write per interval instead of one per view.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, field: str = "profile_views"):
+        self.flush_interval = flush_interval
+        self.field = field
+        self.pending: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, user_id: Optional[str], viewer_id: Optional[str] = None):
+        """Count a view of user_id's profile; owners looking at their own profile are not counted"""
+        if user_id and user_id != viewer_id:
+            self.pending[user_id] = self.pending.get(user_id, 0) + 1
+
+    def _requeue(self, batch: Dict[str, int]):
+        for user_id, count in batch.items():
+            self.pending[user_id] = self.pending.get(user_id, 0) + count
+
+    def pending_for(self, user_id: str) -> int:
+        """Views not flushed yet, so stats read back include them"""
+        return self.pending.get(user_id, 0)
+
+    async def flush(self, db):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, {}
+        user_ids = list(batch)
+        operations = [
+            UpdateOne({"_id": user_id}, {"$inc": {self.field: batch[user_id]}}, upsert=True)
+            for user_id in user_ids
+        ]
+        try:
+            await db[USER_COUNTERS_COLLECTION].bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # The other increments were applied; only the failed ones are retried on the next flush
+            failed = [user_ids[error["index"]] for error in e.details.get("writeErrors", [])]
+            self._requeue({user_id: batch[user_id] for user_id in failed})
+            logger.error(f"Failed to flush profile views for {len(failed)} users: {str(e)}")
+        except Exception as e:
+            # Nothing is known to have been applied; put the batch back so the views are retried
+            self._requeue(batch)
+            logger.error(f"Failed to flush profile views: {str(e)}")
+
+    async def _run(self, db):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush(db)
+
+    def start(self, db):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(db))
+
+    async def stop(self, db):
+        """Stop the periodic flush and write out whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush(db)
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING_AGE_PERCENTILES = (50, 90, 99)
+RECENT_LIMIT = 10
+BREAKDOWN_LIMIT = 20
+
+_HOUR_MS = 60 * 60 * 1000
+
+
+def _count_by(field: str) -> List[dict]:
+    return [
+        {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+    ]
+
+
+def _top(field: str, match: dict) -> List[dict]:
+    return [{"$match": match}] + _count_by(field) + [{"$limit": BREAKDOWN_LIMIT}]
+
+
+def _pending_age(match: dict, submitted_field: str, fallback_field: str, now: datetime) -> List[dict]:
+    """
+    Hours pending documents have waited, summarized as count, oldest and
+    percentiles. Timestamps are stored as naive local times, so ages are taken
+    from the caller's datetime.now() rather than the server's UTC $$NOW.
+    Documents with no submission time at all are left out, not counted as
+    null ages at the bottom of the percentiles.
+    """
+    submitted_at = {"$ifNull": [f"${submitted_field}", f"${fallback_field}"]}
+    percentile_index = {
+        f"p{percentile}": {"$arrayElemAt": ["$ages", {"$toInt": {"$floor": {"$multiply": [
+            {"$subtract": ["$count", 1]}, percentile / 100
+        ]}}}]}
+        for percentile in PENDING_AGE_PERCENTILES
+    }
+    return [
+        {"$match": {**match, "$or": [{submitted_field: {"$ne": None}}, {fallback_field: {"$ne": None}}]}},
+        {"$project": {"_id": 0, "age_hours": {"$divide": [{"$subtract": [now, submitted_at]}, _HOUR_MS]}}},
+        {"$sort": {"age_hours": 1}},
+        {"$group": {"_id": None, "ages": {"$push": "$age_hours"}, "count": {"$sum": 1}}},
+        {"$project": {"_id": 0, "count": 1, "oldest": {"$arrayElemAt": ["$ages", -1]}, **percentile_index}},
+    ]
+
+
+def _recent(fields: Dict[str, int], sort_field: str = "created_at") -> List[dict]:
+    return [
+        {"$sort": {sort_field: -1}},
+        {"$limit": RECENT_LIMIT},
+        {"$project": {"_id": 0, **fields}},
+    ]
+
+
+def _counts(rows: List[dict]) -> Dict[str, int]:
+    return {str(row["_id"]): row["count"] for row in rows}
+
+
+def _breakdown(rows: List[dict], name: str) -> List[dict]:
+    return [{name: row["_id"], "count": row["count"]} for row in rows]
+
+
+def _ages(rows: List[dict]) -> dict:
+    if not rows:
+        return {"count": 0}
+    return {key: round(value, 1) if isinstance(value, float) else value for key, value in rows[0].items()}
+
+
+class AdminDashboard:
+    """
+    Everything the admin dashboard shows, from one $facet aggregation per
+    collection run concurrently, cached for ttl_seconds. Concurrent requests
+    on a cold cache share a single computation.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self.snapshot: Optional[dict] = None
+        self.expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self):
+        self.expires_at = 0.0
+
+    async def get(self, db) -> dict:
+        if self.snapshot is not None and self.expires_at > time.monotonic():
+            return self.snapshot
+        async with self._lock:
+            if self.snapshot is None or self.expires_at <= time.monotonic():
+                self.snapshot = await self.compute(db)
+                self.expires_at = time.monotonic() + self.ttl_seconds
+            return self.snapshot
+
+    async def compute(self, db) -> dict:
+        now = datetime.now()
+        week_ago = now - timedelta(days=7)
+        profiles, academics, users = await asyncio.gather(
+            db.researcher_profiles.aggregate([{"$facet": {
+                "by_status": _count_by("status"),
+                "pending_age": _pending_age({"status": "pending_approval"}, "submitted_at", "updated_at", now),
+                "recent": _recent({"id": 1, "user_id": 1, "status": 1, "institution_name": 1, "created_at": 1}),
+            }}]).to_list(None),
+            db.academics.aggregate([{"$facet": {
+                "by_status": _count_by("approval_status"),
+                "pending_age": _pending_age({"approval_status": "pending"}, "submitted_at", "created_at", now),
+                "by_field": _top("research_field", {"approval_status": "approved"}),
+                "by_country": _top("country", {"approval_status": "approved"}),
+                "recent": _recent({"id": 1, "user_id": 1, "approval_status": 1, "university": 1, "created_at": 1}),
+            }}]).to_list(None),
+            db.users.aggregate([{"$facet": {
+                "by_role": _count_by("role"),
+                "signups_last_7_days": [{"$match": {"created_at": {"$gte": week_ago}}}, {"$count": "count"}],
+                "recent_signups": _recent(
+                    {"id": 1, "first_name": 1, "last_name": 1, "email": 1, "role": 1, "created_at": 1}
+                ),
+            }}]).to_list(None),
+        )
+        profiles, academics, users = profiles[0], academics[0], users[0]
+        logger.debug("Recomputed the admin dashboard")
+        signups = users["signups_last_7_days"]
+        return {
+            "generated_at": now,
+            "profiles": {
+                "by_status": _counts(profiles["by_status"]),
+                "pending_age_hours": _ages(profiles["pending_age"]),
+                "recent": profiles["recent"],
+            },
+            "academics": {
+                "by_status": _counts(academics["by_status"]),
+                "pending_age_hours": _ages(academics["pending_age"]),
+                "by_field": _breakdown(academics["by_field"], "field"),
+                "by_country": _breakdown(academics["by_country"], "country"),
+                "recent": academics["recent"],
+            },
+            "users": {
+                "by_role": _counts(users["by_role"]),
+                "signups_last_7_days": signups[0]["count"] if signups else 0,
+                "recent_signups": users["recent_signups"],
+            },
+        }
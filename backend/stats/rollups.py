@@ -0,0 +1,103 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = "academic_stats"
+
+
+def _rollup_keys(academic: Optional[dict]) -> List[Tuple]:
+    """The rollup rows an academic counts towards; none unless it is approved"""
+    if not academic or academic.get("approval_status") != "approved":
+        return []
+    return [
+        ("city", academic.get("country"), academic.get("city")),
+        ("field", academic.get("research_field")),
+    ]
+
+
+def _row_fields(key: Tuple) -> dict:
+    if key[0] == "city":
+        return {"kind": "city", "country": key[1], "city": key[2]}
+    return {"kind": "field", "field": key[1]}
+
+
+class StatsRollups:
+    """
+    Per-(country, city) and per-research_field counts of approved academics,
+    kept in their own collection and adjusted by each academic write.
+    """
+
+    def __init__(self, collection_name: str = ROLLUP_COLLECTION):
+        self.collection_name = collection_name
+
+    async def record_change(self, db, before: Optional[dict], after: Optional[dict]):
+        """Apply the count delta between two versions of an academic document"""
+        await self.record_changes(db, [(before, after)])
+
+    async def record_changes(self, db, changes: List[Tuple[Optional[dict], Optional[dict]]]):
+        """Apply the summed count deltas of several (before, after) academic versions in one write"""
+        deltas: Dict[Tuple, int] = {}
+        for before, after in changes:
+            for key in _rollup_keys(before):
+                deltas[key] = deltas.get(key, 0) - 1
+            for key in _rollup_keys(after):
+                deltas[key] = deltas.get(key, 0) + 1
+
+        operations = [
+            UpdateOne(
+                {"_id": _row_fields(key)},
+                {"$inc": {"count": delta}, "$setOnInsert": _row_fields(key)},
+                upsert=True
+            )
+            for key, delta in deltas.items() if delta
+        ]
+        if operations:
+            await db[self.collection_name].bulk_write(operations, ordered=False)
+
+    async def rebuild(self, db):
+        """Recount every rollup row from the academics collection"""
+        rows = []
+        by_city = await db.academics.aggregate([
+            {"$match": {"approval_status": "approved"}},
+            {"$group": {"_id": {"country": "$country", "city": "$city"}, "count": {"$sum": 1}}},
+        ]).to_list(None)
+        for result in by_city:
+            fields = _row_fields(("city", result["_id"].get("country"), result["_id"].get("city")))
+            rows.append({"_id": fields, **fields, "count": result["count"]})
+
+        by_field = await db.academics.aggregate([
+            {"$match": {"approval_status": "approved"}},
+            {"$group": {"_id": "$research_field", "count": {"$sum": 1}}},
+        ]).to_list(None)
+        for result in by_field:
+            fields = _row_fields(("field", result["_id"]))
+            rows.append({"_id": fields, **fields, "count": result["count"]})
+
+        collection = db[self.collection_name]
+        await collection.delete_many({})
+        if rows:
+            await collection.insert_many(rows)
+        logger.info(f"Rebuilt {len(rows)} academic stats rollup rows")
+
+    async def ensure_built(self, db):
+        """Seed the rollups on first start, when the collection is still empty"""
+        if await db[self.collection_name].estimated_document_count() == 0:
+            await self.rebuild(db)
+
+    async def by_city(self, db, country: Optional[str] = None) -> List[dict]:
+        query = {"kind": "city", "count": {"$gt": 0}}
+        if country:
+            query["country"] = country
+        rows = await db[self.collection_name].find(
+            query, {"_id": 0, "country": 1, "city": 1, "count": 1}
+        ).sort([("country", ASCENDING), ("city", ASCENDING)]).to_list(None)
+        return rows
+
+    async def by_field(self, db) -> List[dict]:
+        rows = await db[self.collection_name].find(
+            {"kind": "field", "count": {"$gt": 0}}, {"_id": 0, "field": 1, "count": 1}
+        ).sort([("count", DESCENDING)]).to_list(None)
+        return rows
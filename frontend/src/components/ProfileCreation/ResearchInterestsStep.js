@@ -1,7 +1,29 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
+import axios from 'axios';
+
+const API = `${process.env.REACT_APP_BACKEND_URL}/api`;
 
 const ResearchInterestsStep = ({ formData, updateFormData, errors }) => {
   const [interest, setInterest] = useState('');
+  const [completions, setCompletions] = useState([]);
+  
+  // Complete the typed interest from keywords already in use, after a short pause in typing
+  useEffect(() => {
+    const prefix = interest.trim();
+    if (!prefix) {
+      setCompletions([]);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get(`${API}/keywords/complete`, { params: { prefix, limit: 8 } });
+        setCompletions(response.data);
+      } catch (err) {
+        setCompletions([]);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [interest]);
   
   // Example research areas (would be fetched from API in a real application)
   const suggestedInterests = [
@@ -25,6 +47,13 @@ const ResearchInterestsStep = ({ formData, updateFormData, errors }) => {
     }
   };
   
+  const handleCompletionClick = (name) => {
+    if (!formData.research_interests.includes(name)) {
+      updateFormData({ research_interests: [...formData.research_interests, name] });
+    }
+    setInterest('');
+  };
+  
   const handleRemoveInterest = (interestToRemove) => {
     const updatedInterests = formData.research_interests.filter(
       (item) => item !== interestToRemove
@@ -64,6 +93,23 @@ const ResearchInterestsStep = ({ formData, updateFormData, errors }) => {
           </button>
         </div>
         
+        {/* Completions from keywords other researchers use */}
+        {completions.length > 0 && (
+          <div className="border border-gray-200 rounded-md mb-2 divide-y divide-gray-100">
+            {completions.map((completion) => (
+              <button
+                key={completion.name}
+                type="button"
+                onClick={() => handleCompletionClick(completion.name)}
+                className="w-full flex justify-between px-3 py-2 text-left text-sm hover:bg-gray-50"
+              >
+                <span>{completion.name}</span>
+                <span className="text-gray-400">{completion.count}</span>
+              </button>
+            ))}
+          </div>
+        )}
+        
         {errors.research_interests && (
           <p className="text-red-500 text-xs mt-1">{errors.research_interests}</p>
         )}
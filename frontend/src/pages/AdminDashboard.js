@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
+import { fetchAllPages } from '../utils/pagination';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
@@ -49,12 +50,14 @@ const AdminDashboard = () => {
         statusParam = "draft"; // Rejected profiles are set back to draft with feedback
       }
       
-      // Fetch profiles from admin endpoint
-      const response = await axios.get(`${API}/admin/profiles${statusParam ? `?status=${statusParam}` : ''}`);
-      setProfiles(response.data);
+      // Fetch every page of profiles from admin endpoint
+      const allProfiles = await fetchAllPages(`${API}/admin/profiles`, {
+        params: statusParam ? { status: statusParam } : {}
+      });
+      setProfiles(allProfiles);
       
       // Fetch user details for each profile
-      const userIds = response.data.map(profile => profile.user_id);
+      const userIds = allProfiles.map(profile => profile.user_id);
       const uniqueUserIds = [...new Set(userIds)];
       
       const userDetails = { ...users };
@@ -85,12 +88,14 @@ const AdminDashboard = () => {
       setError(null);
       
       try {
-        // Fetch academics from admin endpoint
-        const response = await axios.get(`${API}/admin/academics?approval_status=${activeTab}`);
-        setAcademics(response.data);
+        // Fetch every page of academics from admin endpoint
+        const allAcademics = await fetchAllPages(`${API}/admin/academics`, {
+          params: { approval_status: activeTab }
+        });
+        setAcademics(allAcademics);
         
         // Fetch user details for each academic
-        const userIds = response.data.map(academic => academic.user_id);
+        const userIds = allAcademics.map(academic => academic.user_id);
         const uniqueUserIds = [...new Set(userIds)];
         
         const userDetails = {};
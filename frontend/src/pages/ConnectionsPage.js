@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../context/AuthContext';
+import { fetchAllPages } from '../utils/pagination';
 import Card from '../components/ui/Card';
 import Button from '../components/ui/Button';
 
@@ -27,8 +28,8 @@ const ConnectionsPage = () => {
       setError(null);
       
       try {
-        // Fetch all connections
-        const response = await axios.get(`${API}/connections`, {
+        // Fetch all connections, every page
+        const allConnections = await fetchAllPages(`${API}/connections`, {
           headers: {
             Authorization: `Bearer ${localStorage.getItem('token')}`
           }
@@ -39,7 +40,7 @@ const ConnectionsPage = () => {
         const pending = [];
         const sent = [];
         
-        response.data.forEach(conn => {
+        allConnections.forEach(conn => {
           if (conn.status === 'accepted') {
             established.push(conn);
           } else if (conn.status === 'pending') {
@@ -16,7 +16,8 @@ const ResearcherSearchPage = () => {
     institutions: [],
     countries: [],
     cities: [],
-    research_interests: []
+    research_interests: [],
+    counts: {}
   });
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -274,6 +275,9 @@ const ResearcherSearchPage = () => {
                       />
                       <label htmlFor={`title-${title}`} className="ml-2 block text-text-secondary text-sm">
                         {title}
+                        {filterOptions.counts?.academic_titles?.[title] !== undefined && (
+                          <span className="ml-1 text-gray-400">({filterOptions.counts.academic_titles[title]})</span>
+                        )}
                       </label>
                     </div>
                   ))}
@@ -295,6 +299,9 @@ const ResearcherSearchPage = () => {
                       />
                       <label htmlFor={`institution-${institution}`} className="ml-2 block text-text-secondary text-sm">
                         {institution}
+                        {filterOptions.counts?.institutions?.[institution] !== undefined && (
+                          <span className="ml-1 text-gray-400">({filterOptions.counts.institutions[institution]})</span>
+                        )}
                       </label>
                     </div>
                   ))}
@@ -316,6 +323,9 @@ const ResearcherSearchPage = () => {
                       />
                       <label htmlFor={`interest-${interest}`} className="ml-2 block text-text-secondary text-sm">
                         {interest}
+                        {filterOptions.counts?.research_interests?.[interest] !== undefined && (
+                          <span className="ml-1 text-gray-400">({filterOptions.counts.research_interests[interest]})</span>
+                        )}
                       </label>
                     </div>
                   ))}
@@ -0,0 +1,20 @@
+import axios from 'axios';
+
+// Largest page the API's cursor-paginated listings accept
+const MAX_PAGE_SIZE = 500;
+
+// Fetch every page of a cursor-paginated listing, following the
+// X-Next-Cursor response header until the last page.
+export const fetchAllPages = async (url, config = {}) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await axios.get(url, {
+      ...config,
+      params: { ...config.params, limit: MAX_PAGE_SIZE, ...(cursor ? { cursor } : {}) }
+    });
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return items;
+};
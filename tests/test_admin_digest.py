@@ -0,0 +1,97 @@
+import asyncio
+
+from backend.notifications.admin_digest import AdminDigest, AdminRoster
+from backend.notifications.outbox import OUTBOX_COLLECTION
+
+
+class FakeCursor:
+    def __init__(self, documents, on_read=None):
+        self.documents = documents
+        self.on_read = on_read
+
+    async def to_list(self, length):
+        if self.on_read:
+            self.on_read()
+        return list(self.documents)
+
+
+class FakeUsers:
+    def __init__(self, admins):
+        self.admins = admins
+        self.reads = 0
+        self.on_read = None
+
+    def find(self, query, projection=None):
+        self.reads += 1
+        return FakeCursor(self.admins, self.on_read)
+
+
+class FakeOutbox:
+    def __init__(self, error=None):
+        self.error = error
+        self.documents = []
+
+    async def insert_many(self, documents, ordered=True):
+        if self.error:
+            raise self.error
+        self.documents.extend(documents)
+
+
+class FakeDb:
+    def __init__(self, admins, outbox_error=None):
+        self.users = FakeUsers(admins)
+        self.outbox = FakeOutbox(outbox_error)
+
+    def __getitem__(self, name):
+        assert name == OUTBOX_COLLECTION
+        return self.outbox
+
+
+def test_roster_is_cached_until_invalidated():
+    db = FakeDb([{"email": "b@example.org"}, {"email": "a@example.org"}, {"email": "a@example.org"}, {}])
+    roster = AdminRoster()
+
+    assert asyncio.run(roster.get(db)) == ["a@example.org", "b@example.org"]
+    asyncio.run(roster.get(db))
+    assert db.users.reads == 1
+
+    roster.invalidate()
+    asyncio.run(roster.get(db))
+    assert db.users.reads == 2
+
+
+def test_roster_read_racing_a_role_change_is_not_cached():
+    db = FakeDb([{"email": "a@example.org"}])
+    roster = AdminRoster()
+    db.users.on_read = roster.invalidate
+
+    asyncio.run(roster.get(db))
+
+    assert roster.emails is None
+
+
+def test_one_digest_per_admin_per_window():
+    db = FakeDb([{"email": "a@example.org"}, {"email": "b@example.org"}])
+    digest = AdminDigest(AdminRoster(), max_listed=2)
+    for name in ["Ada", "Bo", "Cy"]:
+        digest.record(f"{name} submitted a profile")
+
+    asyncio.run(digest.flush(db))
+
+    emails = db.outbox.documents
+    assert sorted(email["to"] for email in emails) == ["a@example.org", "b@example.org"]
+    assert emails[0]["subject"] == "3 New Profile Submissions"
+    assert "- Bo submitted a profile" in emails[0]["body"]
+    assert "Cy submitted" not in emails[0]["body"] and "...and 1 more" in emails[0]["body"]
+    assert digest.pending == []
+
+
+def test_failed_flush_keeps_events_for_the_next_window():
+    db = FakeDb([{"email": "a@example.org"}], outbox_error=ConnectionError("down"))
+    digest = AdminDigest(AdminRoster())
+    digest.record("first")
+
+    asyncio.run(digest.flush(db))
+    digest.record("second")
+
+    assert digest.pending == ["first", "second"]
@@ -0,0 +1,44 @@
+from backend.keywords import autocomplete
+from backend.keywords.autocomplete import KeywordCompleter
+
+
+def names(results):
+    return [(result["name"], result["count"]) for result in results]
+
+
+def test_spellings_of_one_keyword_are_summed_under_the_most_used():
+    completer = KeywordCompleter()
+    completer.build([
+        {"name": "machine-learning", "count": 2},
+        {"name": "Machine Learning", "count": 5},
+        {"name": "Machine Vision", "count": 4},
+        {"name": "Unused", "count": 0},
+    ])
+
+    assert names(completer.complete("mach")) == [("Machine Learning", 7), ("Machine Vision", 4)]
+    assert names(completer.complete("machine-l")) == [("Machine Learning", 7)]
+    assert len(completer) == 2
+
+
+def test_applied_deltas_follow_the_registry():
+    completer = KeywordCompleter()
+    completer.build([{"name": "Physics", "count": 1}])
+
+    completer.apply({"physics": 2, "Optics": 1})
+    assert names(completer.complete("")) == [("Physics", 3), ("Optics", 1)]
+
+    completer.apply({"Physics": -3})
+    assert names(completer.complete("p")) == []
+
+
+def test_broad_prefixes_are_cached_and_invalidated(monkeypatch):
+    monkeypatch.setattr(autocomplete, "SCAN_LIMIT", 2)
+    completer = KeywordCompleter()
+    completer.build([{"name": f"a{i}", "count": i + 1} for i in range(5)])
+
+    assert names(completer.complete("a", 2)) == [("a4", 5), ("a3", 4)]
+    assert "a" in completer.top_cache
+
+    completer.set_count("a0", 10)
+    assert "a" not in completer.top_cache
+    assert names(completer.complete("a", 1)) == [("a0", 10)]
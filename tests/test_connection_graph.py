@@ -0,0 +1,72 @@
+import random
+from collections import deque
+
+from backend.graph.connections import ConnectionGraph
+
+
+def accepted(requester_id, recipient_id, status="accepted"):
+    return {"requester_id": requester_id, "recipient_id": recipient_id, "status": status}
+
+
+def shortest_hops(edges, source, target):
+    adjacency = {}
+    for a, b in edges:
+        adjacency.setdefault(a, set()).add(b)
+        adjacency.setdefault(b, set()).add(a)
+    distance = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for neighbour in adjacency.get(node, ()):
+            if neighbour not in distance:
+                distance[neighbour] = distance[node] + 1
+                queue.append(neighbour)
+    return distance.get(target)
+
+
+def test_mutual_connections():
+    graph = ConnectionGraph()
+    graph.build([accepted("a", "x"), accepted("b", "x"), accepted("a", "y"), accepted("y", "b"),
+                 accepted("a", "z"), accepted("b", "w", status="pending")])
+
+    assert graph.mutual("a", "b") == ["x", "y"]
+    assert graph.mutual("a", "nobody") == []
+    assert graph.degree("b") == 2
+
+
+def test_sync_follows_status_changes():
+    graph = ConnectionGraph()
+    graph.sync(accepted("a", "b"))
+    assert graph.neighbours("a") == ["b"]
+
+    graph.sync(accepted("a", "b", status="rejected"))
+    assert graph.neighbours("a") == [] and graph.degree("b") == 0
+
+
+def test_path_is_a_shortest_chain_of_real_connections():
+    rng = random.Random(3)
+    users = [f"u{i}" for i in range(60)]
+    edges = {tuple(sorted(rng.sample(users, 2))) for _ in range(90)}
+    graph = ConnectionGraph()
+    graph.build([accepted(a, b) for a, b in edges])
+
+    for _ in range(200):
+        source, target = rng.choice(users), rng.choice(users)
+        expected = shortest_hops(edges, source, target)
+        path = graph.path(source, target, max_depth=60)
+        if expected is None:
+            assert path is None
+            continue
+        assert path[0] == source and path[-1] == target
+        assert len(path) - 1 == expected
+        assert all(tuple(sorted(pair)) in edges for pair in zip(path, path[1:]))
+
+
+def test_path_gives_up_beyond_max_depth():
+    graph = ConnectionGraph()
+    graph.build([accepted(str(i), str(i + 1)) for i in range(5)])
+
+    assert graph.path("0", "5", max_depth=5) == ["0", "1", "2", "3", "4", "5"]
+    assert graph.path("0", "5", max_depth=4) is None
+    assert graph.path("0", "0") == ["0"]
+    assert graph.path("0", "unknown") is None
@@ -0,0 +1,75 @@
+import asyncio
+
+from pymongo.errors import BulkWriteError
+
+from backend.stats.counters import USER_COUNTERS_COLLECTION, ViewCounter, connection_counter_deltas
+
+
+class FakeCollection:
+    def __init__(self, error=None):
+        self.error = error
+        self.operations = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.append(operations)
+        if self.error:
+            raise self.error
+
+
+def fake_db(collection):
+    return {USER_COUNTERS_COLLECTION: collection}
+
+
+def test_connection_counter_deltas():
+    connection = {"requester_id": "a", "recipient_id": "b"}
+
+    assert connection_counter_deltas(connection, None, "pending") == {"b": {"messages": 1}}
+    assert connection_counter_deltas(connection, "pending", "accepted") == {
+        "a": {"connections": 1}, "b": {"connections": 1, "messages": -1}
+    }
+    assert connection_counter_deltas(connection, "accepted", "accepted") == {}
+
+
+def test_views_of_your_own_profile_are_not_counted():
+    counter = ViewCounter()
+    counter.record("owner", viewer_id="owner")
+    counter.record("owner", viewer_id="someone-else")
+    counter.record("owner")
+    counter.record(None)
+
+    assert counter.pending_for("owner") == 2
+
+
+def test_flush_writes_one_increment_per_user():
+    counter = ViewCounter()
+    for user_id in ["a", "a", "b"]:
+        counter.record(user_id)
+    collection = FakeCollection()
+
+    asyncio.run(counter.flush(fake_db(collection)))
+
+    [operations] = collection.operations
+    assert sorted((operation._filter["_id"], operation._doc["$inc"]["profile_views"]) for operation in operations) == [
+        ("a", 2), ("b", 1)
+    ]
+    assert counter.pending == {}
+
+
+def test_partial_bulk_failure_requeues_only_failed_increments():
+    counter = ViewCounter()
+    for user_id in ["a", "b", "b", "c"]:
+        counter.record(user_id)
+    error = BulkWriteError({"writeErrors": [{"index": 1, "code": 11000, "errmsg": "failed"}], "nInserted": 0})
+
+    asyncio.run(counter.flush(fake_db(FakeCollection(error))))
+
+    assert counter.pending == {"b": 2}
+
+
+def test_failed_flush_requeues_the_whole_batch():
+    counter = ViewCounter()
+    counter.record("a")
+    asyncio.run(counter.flush(fake_db(FakeCollection(ConnectionError("down")))))
+    counter.record("a")
+
+    assert counter.pending == {"a": 2}
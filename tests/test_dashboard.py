@@ -0,0 +1,77 @@
+import asyncio
+from datetime import datetime
+
+from backend.stats.dashboard import AdminDashboard, _ages, _pending_age
+
+
+class FakeAggregation:
+    def __init__(self, result):
+        self.result = result
+
+    async def to_list(self, length):
+        await asyncio.sleep(0)
+        return [self.result]
+
+
+class FakeCollection:
+    def __init__(self, result, db):
+        self.result = result
+        self.db = db
+
+    def aggregate(self, pipeline):
+        self.db.pipelines.append(pipeline)
+        return FakeAggregation(self.result)
+
+
+class FakeDb:
+    def __init__(self):
+        self.pipelines = []
+        self.researcher_profiles = FakeCollection(
+            {"by_status": [{"_id": "approved", "count": 2}], "pending_age": [], "recent": []}, self
+        )
+        self.academics = FakeCollection({
+            "by_status": [{"_id": "pending", "count": 1}],
+            "pending_age": [{"count": 1, "oldest": 5.04, "p50": 5.04, "p90": 5.04, "p99": 5.04}],
+            "by_field": [{"_id": "Physics", "count": 3}], "by_country": [], "recent": [],
+        }, self)
+        self.users = FakeCollection({"by_role": [], "signups_last_7_days": [{"count": 4}], "recent_signups": []}, self)
+
+
+def test_pending_age_uses_the_given_local_time_and_skips_unsubmitted():
+    now = datetime(2026, 5, 1, 12, 0)
+
+    pipeline = _pending_age({"approval_status": "pending"}, "submitted_at", "created_at", now)
+
+    assert pipeline[0]["$match"] == {
+        "approval_status": "pending",
+        "$or": [{"submitted_at": {"$ne": None}}, {"created_at": {"$ne": None}}],
+    }
+    age = pipeline[1]["$project"]["age_hours"]["$divide"][0]["$subtract"]
+    assert age[0] == now and "$$NOW" not in str(pipeline)
+
+
+def test_ages_are_rounded_and_empty_is_a_zero_count():
+    assert _ages([]) == {"count": 0}
+    assert _ages([{"count": 2, "p50": 1.26}]) == {"count": 2, "p50": 1.3}
+
+
+def test_snapshot_is_shared_until_invalidated():
+    db = FakeDb()
+    dashboard = AdminDashboard(ttl_seconds=60)
+
+    async def scenario():
+        first, second = await asyncio.gather(dashboard.get(db), dashboard.get(db))
+        assert first is second
+        assert len(db.pipelines) == 3
+        await dashboard.get(db)
+        assert len(db.pipelines) == 3
+        dashboard.invalidate()
+        await dashboard.get(db)
+        assert len(db.pipelines) == 6
+        return first
+
+    snapshot = asyncio.run(scenario())
+
+    assert snapshot["academics"]["pending_age_hours"]["p50"] == 5.0
+    assert snapshot["academics"]["by_field"] == [{"field": "Physics", "count": 3}]
+    assert snapshot["users"]["signups_last_7_days"] == 4
@@ -0,0 +1,40 @@
+from backend.search.facets import FacetStore
+
+
+def profile(profile_id, status="approved", **fields):
+    return {"id": profile_id, "status": status, **fields}
+
+
+def test_counts_distinct_values_of_approved_profiles():
+    store = FacetStore()
+    store.build([
+        profile("p1", country="Bangladesh", research_interests=["AI", "AI", "Optics"]),
+        profile("p2", country="Bangladesh", research_interests=["AI"]),
+        profile("p3", status="draft", country="India", research_interests=["AI"]),
+    ])
+
+    assert store.counts["countries"] == {"Bangladesh": 2}
+    assert store.counts["research_interests"] == {"AI": 2, "Optics": 1}
+
+
+def test_sync_moves_counts_between_values():
+    store = FacetStore()
+    store.sync(profile("p1", city="Dhaka"))
+    store.sync(profile("p1", city="Sylhet"))
+
+    assert store.values("cities") == ["Sylhet"]
+
+    store.sync(profile("p1", status="pending_approval", city="Sylhet"))
+
+    assert store.values("cities") == []
+    assert len(store) == 0
+
+
+def test_as_filters_lists_sorted_values_with_counts():
+    store = FacetStore()
+    store.build([profile("p1", institution_name="BUET"), profile("p2", institution_name="Dhaka University")])
+
+    filters = store.as_filters()
+
+    assert filters["institutions"] == ["BUET", "Dhaka University"]
+    assert filters["counts"]["institutions"] == {"BUET": 1, "Dhaka University": 1}
@@ -0,0 +1,94 @@
+import pytest
+
+from backend.geo.globe import (
+    GlobeIndex,
+    bbox_tile_ranges,
+    covering_prefixes,
+    in_bbox,
+    parse_bbox,
+    quadkey,
+    quadkey_tile,
+    tile_quadkey,
+    tile_xy,
+)
+
+
+def point(point_id, lat, lng):
+    return {"id": point_id, "lat": lat, "lng": lng}
+
+
+def test_quadkey_round_trips_tile_coordinates():
+    for level in range(1, 12):
+        tile_x, tile_y = tile_xy(23.8, 90.4, level)
+        assert quadkey_tile(tile_quadkey(tile_x, tile_y, level)) == (tile_x, tile_y)
+    assert quadkey(23.8, 90.4, 5).startswith(quadkey(23.8, 90.4, 3))
+
+
+def test_parse_bbox_validates_ranges():
+    assert parse_bbox("170,-10,-170,10") == (170, -10, -170, 10)
+    with pytest.raises(ValueError):
+        parse_bbox("0,0,10")
+    with pytest.raises(ValueError):
+        parse_bbox("0,20,10,10")
+
+
+def test_in_bbox_handles_the_antimeridian():
+    bbox = (170, -10, -170, 10)
+    assert in_bbox(0, 175, bbox)
+    assert in_bbox(0, -175, bbox)
+    assert not in_bbox(0, 0, bbox)
+
+
+@pytest.mark.parametrize("level", range(0, 14))
+def test_antimeridian_box_in_one_tile_column_covers_each_tile_once(level):
+    bbox = (10, -10, 5, 30)
+
+    prefixes = covering_prefixes(bbox, level)
+
+    assert len(prefixes) == len(set(prefixes))
+    columns = [column for x0, x1, _, _ in bbox_tile_ranges(bbox, level) for column in range(x0, x1 + 1)]
+    assert len(columns) == len(set(columns))
+
+
+def test_viewport_across_the_antimeridian_returns_each_academic_once():
+    index = GlobeIndex()
+    index.build([point("a", 0, 12), point("b", 0, 170), point("c", 0, -170), point("outside", 0, 7)])
+
+    for bbox in [(10, -10, 5, 30), (160, -10, -160, 10)]:
+        found = [entry["id"] for entry in index.viewport(bbox, index.expand_zoom)]
+        assert len(found) == len(set(found))
+    assert sorted(entry["id"] for entry in index.viewport((10, -10, 5, 30), index.expand_zoom)) == ["a", "b", "c"]
+
+    # Clusters are whole cells, so only check that no cell is reported twice
+    clusters = [entry["id"] for entry in index.viewport((10, -10, 5, 30), 0)]
+    assert len(clusters) == len(set(clusters))
+
+
+def academic(academic_id, lat, lng, approval_status="approved", **fields):
+    return {"id": academic_id, "approval_status": approval_status, "latitude": lat, "longitude": lng, **fields}
+
+
+def test_clusters_merge_nearby_academics_until_expand_zoom():
+    index = GlobeIndex()
+    index.build([point("a", 23.81, 90.41), point("b", 23.82, 90.42), point("c", -33.9, 151.2)])
+
+    world = index.clusters(0)
+    dhaka = [entry for entry in world if entry.get("type") == "cluster"]
+    assert len(dhaka) == 1 and dhaka[0]["count"] == 2
+    assert dhaka[0]["lat"] == pytest.approx(23.815)
+    assert {entry["id"] for entry in world if entry.get("type") != "cluster"} == {"c"}
+
+    assert sorted(entry["id"] for entry in index.clusters(index.expand_zoom)) == ["a", "b", "c"]
+
+
+def test_sync_shows_only_approved_academics_and_removes_empty_cells():
+    index = GlobeIndex()
+    index.sync(academic("a", 23.8, 90.4, keywords=["AI"]), {"first_name": "Ada", "last_name": "Rahman"})
+    assert index.points["a"]["name"] == "Ada Rahman"
+    assert index.points["a"]["research_areas"] == ["AI"]
+
+    index.sync(academic("a", 23.8, 90.4, approval_status="rejected"))
+
+    assert len(index) == 0
+    assert all(not cells for cells in index.levels)
+    assert all(not keys for keys in index.level_keys)
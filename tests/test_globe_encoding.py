@@ -0,0 +1,35 @@
+import pytest
+
+from backend.geo.encoding import GLOBE_BINARY_MEDIA_TYPE, accepts_globe_binary, decode_globe_points, encode_globe_points
+
+
+def test_encoding_round_trips_points_and_clusters():
+    points = [
+        {"id": "a1", "lat": 23.75, "lng": 90.5, "name": "ignored"},
+        {"id": "cluster-3-0123", "lat": -10.25, "lng": 120.0, "count": 42},
+    ]
+
+    decoded = decode_globe_points(encode_globe_points(points))
+
+    assert [point["id"] for point in decoded] == ["a1", "cluster-3-0123"]
+    assert [point["count"] for point in decoded] == [1, 42]
+    assert decoded[0]["lat"] == pytest.approx(23.75)
+    assert decoded[1]["lng"] == pytest.approx(120.0)
+
+
+def test_columns_are_four_byte_aligned():
+    payload = encode_globe_points([{"id": "x", "lat": 0.0, "lng": 0.0}] * 3)
+    # magic + n + three float/uint columns + ids length, then the ids
+    assert len(payload) == 4 + 4 + 3 * 4 * 3 + 4 + len("x\nx\nx")
+
+
+def test_empty_payload_and_bad_magic():
+    assert decode_globe_points(encode_globe_points([])) == []
+    with pytest.raises(ValueError):
+        decode_globe_points(b"JSON")
+
+
+def test_accept_header_negotiation():
+    assert accepts_globe_binary(f"{GLOBE_BINARY_MEDIA_TYPE}, application/json;q=0.5")
+    assert not accepts_globe_binary("application/json")
+    assert not accepts_globe_binary(None)
@@ -0,0 +1,73 @@
+import asyncio
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from backend.database.indexes import INDEXES, ensure_indexes, index_report
+
+DECLARED = {
+    "things": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("owner", ASCENDING)], name="owner"),
+        IndexModel([("slug", ASCENDING)], name="slug_unique", unique=True),
+    ],
+}
+
+
+class FakeAggregation:
+    def __init__(self, stats):
+        self.stats = stats
+
+    async def to_list(self, length):
+        return self.stats
+
+
+class FakeCollection:
+    def __init__(self, existing, failing=(), accesses=None):
+        self.existing = dict.fromkeys(existing, {})
+        self.failing = set(failing)
+        self.accesses = accesses or {}
+        self.created = []
+
+    async def index_information(self):
+        return self.existing
+
+    async def create_indexes(self, models):
+        for model in models:
+            if model.document["name"] in self.failing:
+                raise OperationFailure("E11000 duplicate key")
+            self.created.append(model.document["name"])
+            self.existing[model.document["name"]] = {}
+
+    def aggregate(self, pipeline):
+        assert pipeline == [{"$indexStats": {}}]
+        return FakeAggregation([
+            {"name": name, "accesses": {"ops": self.accesses.get(name, 0)}} for name in self.existing
+        ])
+
+
+def test_only_missing_indexes_are_created_and_failures_do_not_raise():
+    collection = FakeCollection(["_id_", "id_unique"], failing=["slug_unique"])
+
+    result = asyncio.run(ensure_indexes({"things": collection}, DECLARED))
+
+    assert collection.created == ["owner"]
+    assert result == {"created": ["things.owner"], "failed": ["things.slug_unique"]}
+
+
+def test_report_lists_missing_unused_and_undeclared_indexes():
+    collection = FakeCollection(["_id_", "id_unique", "owner", "legacy_name"], accesses={"id_unique": 12})
+
+    report = asyncio.run(index_report({"things": collection}, DECLARED))
+
+    assert report == {
+        "missing": ["things.slug_unique"],
+        "unused": ["things.owner"],
+        "undeclared": ["things.legacy_name"],
+    }
+
+
+def test_declared_index_names_are_unique_per_collection():
+    for collection_name, models in INDEXES.items():
+        names = [model.document["name"] for model in models]
+        assert len(names) == len(set(names)), collection_name
@@ -0,0 +1,72 @@
+import asyncio
+
+from backend.keywords.registry import KeywordRegistry, keyword_deltas
+
+
+def test_deltas_ignore_duplicates_and_blanks():
+    assert keyword_deltas(["AI", "AI", ""], ["AI", "Robotics", "Robotics", None]) == {"Robotics": 1}
+    assert keyword_deltas(None, ["AI"]) == {"AI": 1}
+    assert keyword_deltas(["AI", "ML"], []) == {"AI": -1, "ML": -1}
+
+
+class FakeAggregation:
+    def __init__(self, documents, pipeline):
+        self.documents = documents
+        self.pipeline = pipeline
+
+    async def to_list(self, length):
+        """Run the handful of stages recount uses"""
+        documents = [dict(document) for document in self.documents]
+        for stage in self.pipeline:
+            if "$match" in stage:
+                documents = [document for document in documents if document.get("keywords")]
+            elif "$project" in stage:
+                documents = [{"keywords": sorted(set(document["keywords"]))} for document in documents]
+            elif "$unwind" in stage:
+                documents = [{"keywords": keyword} for document in documents for keyword in document["keywords"]]
+            elif "$group" in stage:
+                counts = {}
+                for document in documents:
+                    counts[document["keywords"]] = counts.get(document["keywords"], 0) + 1
+                documents = [{"_id": name, "count": count} for name, count in counts.items()]
+        return documents
+
+
+class FakeAcademics:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def aggregate(self, pipeline):
+        return FakeAggregation(self.documents, pipeline)
+
+
+class FakeKeywords:
+    def __init__(self, names):
+        self.names = names
+        self.counts = {}
+
+    async def distinct(self, field):
+        return self.names
+
+    async def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            self.counts[operation._filter["name"]] = operation._doc["$set"]["count"]
+
+
+class FakeDb:
+    def __init__(self, academics, names=()):
+        self.academics = FakeAcademics(academics)
+        self.keywords = FakeKeywords(list(names))
+
+
+def test_recount_counts_each_profile_once_per_keyword():
+    db = FakeDb([
+        {"keywords": ["AI", "AI", "ML"]},
+        {"keywords": ["AI"]},
+        {"keywords": []},
+        {},
+    ], names=["Unused"])
+
+    asyncio.run(KeywordRegistry().recount(db))
+
+    assert db.keywords.counts == {"AI": 2, "ML": 1, "Unused": 0}
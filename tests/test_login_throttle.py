@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend import server
+from backend.auth.rate_limit import LOGIN_PER_ACCOUNT, LOGIN_PER_ACCOUNT_IP, MemoryRateLimiter
+
+
+@pytest.fixture
+def login(monkeypatch):
+    """Call the login route from a given address, with a password check that passes only for "right" """
+    monkeypatch.setattr(server, "rate_limiter", MemoryRateLimiter())
+
+    async def authenticate_user(email, password):
+        if password != "right":
+            return False
+        return SimpleNamespace(email=email, role="researcher", id="u1")
+
+    monkeypatch.setattr(server, "authenticate_user", authenticate_user)
+
+    def attempt(ip, password, username="Victim@example.org"):
+        request = Request({"type": "http", "headers": [], "client": (ip, 5000)})
+        form = SimpleNamespace(username=username, password=password)
+        try:
+            asyncio.run(server.login_for_access_token(request, form))
+        except HTTPException as error:
+            return error.status_code
+        return 200
+
+    return attempt
+
+
+def test_failures_spread_over_many_addresses_lock_the_account(login):
+    statuses = [login(f"10.0.{i // 250}.{i % 250}", "wrong") for i in range(LOGIN_PER_ACCOUNT.capacity + 1)]
+
+    assert statuses[:-1] == [401] * LOGIN_PER_ACCOUNT.capacity
+    assert statuses[-1] == 429
+    # The username is normalized, so changing its case is no way around the lock
+    assert login("10.9.9.9", "right", username=" victim@EXAMPLE.org") == 429
+
+
+def test_one_address_is_throttled_before_it_can_lock_the_account(login):
+    statuses = [login("10.0.0.1", "wrong") for _ in range(LOGIN_PER_ACCOUNT_IP.capacity + 1)]
+
+    assert statuses[-1] == 429
+    assert login("10.0.0.2", "right") == 200
+
+
+def test_successful_logins_are_not_counted(login):
+    assert all(login("10.0.0.1", "right") == 200 for _ in range(LOGIN_PER_ACCOUNT_IP.capacity + 2))
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(server, "TRUSTED_PROXY_HOPS", 0)
+    request = Request({"type": "http", "headers": [(b"x-forwarded-for", b"6.6.6.6")], "client": ("10.0.0.1", 5000)})
+
+    assert server.client_ip(request) == "10.0.0.1"
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime
+
+from backend.database.migrations import backfill_connection_pair_keys
+from backend.graph.connections import connection_pair_key
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return [dict(document) for document in self.documents]
+
+
+class FakeConnections:
+    def __init__(self, documents):
+        self.documents = documents
+        self.writes = 0
+
+    def find(self, query, projection=None):
+        return FakeCursor([document for document in self.documents if "pair_key" not in document])
+
+    async def distinct(self, field, query):
+        return [document["pair_key"] for document in self.documents if isinstance(document.get("pair_key"), str)]
+
+    async def bulk_write(self, operations, ordered=True):
+        self.writes += 1
+        by_id = {document["id"]: document for document in self.documents}
+        for operation in operations:
+            by_id[operation._filter["id"]].update(operation._doc["$set"])
+
+
+class FakeDb:
+    def __init__(self, documents):
+        self.connections = FakeConnections(documents)
+
+
+def connection(connection_id, requester_id, recipient_id, status, day, **fields):
+    return {"id": connection_id, "requester_id": requester_id, "recipient_id": recipient_id,
+            "status": status, "created_at": datetime(2026, 1, day), **fields}
+
+
+def pair_keys(db):
+    return {document["id"]: document.get("pair_key") for document in db.connections.documents}
+
+
+def test_pair_key_ignores_direction():
+    assert connection_pair_key("b", "a") == connection_pair_key("a", "b") == "a:b"
+
+
+def test_backfill_keys_the_connection_that_matters_most_per_pair():
+    db = FakeDb([
+        connection("old-pending", "a", "b", "pending", 1),
+        connection("accepted", "b", "a", "accepted", 5),
+        connection("first", "a", "c", "rejected", 1),
+        connection("second", "c", "a", "rejected", 2),
+        connection("single", "b", "c", "pending", 3),
+    ])
+
+    asyncio.run(backfill_connection_pair_keys(db))
+
+    assert pair_keys(db) == {
+        "old-pending": None, "accepted": "a:b", "first": "a:c", "second": None, "single": "b:c",
+    }
+
+
+def test_backfill_respects_keys_already_taken_and_is_idempotent():
+    db = FakeDb([
+        connection("keyed", "a", "b", "pending", 1, pair_key="a:b"),
+        connection("newer", "b", "a", "accepted", 2),
+    ])
+
+    asyncio.run(backfill_connection_pair_keys(db))
+    assert pair_keys(db) == {"keyed": "a:b", "newer": None}
+    assert db.connections.writes == 0
+
+    done = FakeDb([connection("x", "a", "b", "pending", 1, pair_key="a:b")])
+    asyncio.run(backfill_connection_pair_keys(done))
+    assert done.connections.writes == 0
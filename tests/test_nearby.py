@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from backend.geo.nearby import NearbyIndex, haversine_km
+
+
+def academic(academic_id, lat, lng, approval_status="approved", research_field="Physics", keywords=()):
+    return {
+        "id": academic_id, "approval_status": approval_status, "latitude": lat, "longitude": lng,
+        "research_field": research_field, "keywords": list(keywords),
+    }
+
+
+def brute_force(index, lat, lng, k):
+    distances = sorted(
+        (haversine_km(lat, lng, entry[1], entry[2]), academic_id) for academic_id, entry in index.entries.items()
+    )
+    return [academic_id for _, academic_id in distances[:k]]
+
+
+def test_haversine_distance():
+    # Dhaka to Chattogram is about 215 km
+    assert haversine_km(23.8103, 90.4125, 22.3569, 91.7832) == pytest.approx(215, abs=5)
+
+
+def test_resyncing_a_built_academic_keeps_it_findable():
+    index = NearbyIndex()
+    index.build([academic("0", 0, 0), academic("1", 0, 0.1412)])
+    assert index.nearest(0, 0, 1)[0][0] == "0"
+
+    index.sync(academic("0", 0, 0))
+
+    assert index.nearest(0, 0, 1)[0][0] == "0"
+    assert [academic_id for academic_id, _ in index.nearest(0, 0, 5)] == ["0", "1"]
+
+
+def test_moving_then_removing_a_built_academic():
+    index = NearbyIndex()
+    index.build([academic("a", 0, 0), academic("b", 10, 10)])
+
+    index.sync(academic("a", 50, 50))
+    assert index.nearest(49, 49, 1)[0][0] == "a"
+    assert [academic_id for academic_id, _ in index.nearest(0, 0, 5)] == ["b", "a"]
+
+    index.sync(academic("a", 50, 50, approval_status="rejected"))
+    assert [academic_id for academic_id, _ in index.nearest(0, 0, 5)] == ["b"]
+
+
+def test_predicate_filters_during_search():
+    index = NearbyIndex()
+    index.build([academic("near", 0, 0, research_field="Biology"), academic("far", 5, 5)])
+
+    results = index.nearest(0, 0, 1, lambda entry: entry[3] == "Physics")
+
+    assert [academic_id for academic_id, _ in results] == ["far"]
+
+
+def test_matches_brute_force_through_random_updates():
+    rng = random.Random(7)
+    index = NearbyIndex()
+    index.build([academic(str(i), rng.uniform(-60, 60), rng.uniform(-180, 180)) for i in range(300)])
+
+    for step in range(2000):
+        academic_id = str(rng.randrange(400))
+        if rng.random() < 0.2:
+            index.sync(academic(academic_id, 0, 0, approval_status="pending"))
+        else:
+            index.sync(academic(academic_id, rng.uniform(-60, 60), rng.uniform(-180, 180)))
+        if step % 100 == 0:
+            lat, lng = rng.uniform(-60, 60), rng.uniform(-180, 180)
+            assert [academic_id for academic_id, _ in index.nearest(lat, lng, 5)] == brute_force(index, lat, lng, 5)
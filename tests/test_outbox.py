@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import socketserver
+import threading
+from datetime import datetime, timedelta
+from email import message_from_bytes
+
+import pytest
+
+from backend.notifications.outbox import OUTBOX_COLLECTION, OutboxSender, SmtpConfig, SmtpPool, enqueue_emails
+
+
+class SmtpStub(socketserver.ThreadingTCPServer):
+    """A local SMTP server recording what it receives; rejects recipients in `reject`"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, reject=(), drop_after=None):
+        super().__init__(("127.0.0.1", 0), SmtpStubHandler)
+        self.reject = set(reject)
+        # Close each connection after this many messages, like a server timing out idle clients
+        self.drop_after = drop_after
+        self.messages = []
+        self.connections = 0
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class SmtpStubHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 stub ready")
+        sent = 0
+        recipients = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 stub")
+            elif verb == "MAIL":
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip("<> ")
+                if address in self.server.reject:
+                    self.reply("550 no such user")
+                else:
+                    recipients.append(address)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 go ahead")
+                data = b""
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data += chunk
+                self.server.messages.append((recipients, message_from_bytes(data)))
+                self.reply("250 queued")
+                sent += 1
+                if self.server.drop_after and sent >= self.server.drop_after:
+                    return
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_stub(request):
+    stub = SmtpStub(**getattr(request, "param", {}))
+    yield stub
+    stub.close()
+
+
+def matches(document, query):
+    """Evaluate the subset of the query language the outbox uses"""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = document.get(key)
+        if isinstance(condition, dict):
+            for operator, operand in condition.items():
+                if operator == "$in" and value not in operand:
+                    return False
+                if operator == "$lt" and not (value is not None and value < operand):
+                    return False
+                if operator == "$lte" and not (value is not None and value <= operand):
+                    return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, field, direction):
+        self.documents.sort(key=lambda document: document[field], reverse=direction == -1)
+        return self
+
+    def limit(self, count):
+        self.documents = self.documents[:count]
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+
+class FakeOutbox:
+    def __init__(self):
+        self.documents = []
+        self.round_trips = 0
+
+    async def insert_many(self, documents, ordered=True):
+        self.documents.extend(dict(document) for document in documents)
+
+    def find(self, query, projection=None):
+        self.round_trips += 1
+        return FakeCursor([dict(document) for document in self.documents if matches(document, query)])
+
+    async def update_many(self, query, update):
+        self.round_trips += 1
+        for document in self.documents:
+            if matches(document, query):
+                document.update(update["$set"])
+
+    async def update_one(self, query, update):
+        for document in self.documents:
+            if matches(document, query):
+                document.update(update["$set"])
+                return
+
+
+def outbox_with(*recipients):
+    db = {OUTBOX_COLLECTION: FakeOutbox()}
+    asyncio.run(enqueue_emails(db, [
+        {"to": to, "subject": f"Hello {to}", "body": f"Link for {to}", "kind": "test"} for to in recipients
+    ]))
+    return db
+
+
+def sender_for(stub, **options):
+    pool = SmtpPool(SmtpConfig("127.0.0.1", stub.port, from_email="noreply@example.org", use_tls=False))
+    return OutboxSender(pool, **options)
+
+
+def run_batches(sender, db, rounds=1):
+    async def scenario():
+        counts = [await sender.send_batch(db) for _ in range(rounds)]
+        await sender.stop()
+        return counts
+    return asyncio.run(scenario())
+
+
+def statuses(db):
+    return {document["to"]: document["status"] for document in db[OUTBOX_COLLECTION].documents}
+
+
+def test_batch_is_sent_over_one_pooled_connection(smtp_stub):
+    db = outbox_with("a@example.org", "b@example.org", "c@example.org")
+
+    counts = run_batches(sender_for(smtp_stub, batch_size=2), db, rounds=3)
+
+    assert counts == [2, 1, 0]
+    assert set(statuses(db).values()) == {"sent"}
+    assert sorted(recipients[0] for recipients, _ in smtp_stub.messages) == ["a@example.org", "b@example.org", "c@example.org"]
+    recipients, message = smtp_stub.messages[0]
+    assert message["Subject"] == f"Hello {recipients[0]}"
+    assert message["From"] == "noreply@example.org"
+    assert f"Link for {recipients[0]}" in message.get_payload()[0].get_payload()
+    # The first round opens at most two connections and later rounds reuse them
+    assert smtp_stub.connections <= 2
+
+
+def test_claim_costs_the_same_round_trips_for_any_batch_size():
+    db = outbox_with(*[f"user{i}@example.org" for i in range(20)])
+    sender = OutboxSender(None, batch_size=20)
+
+    claimed = asyncio.run(sender._claim(db))
+
+    assert len(claimed) == 20
+    assert db[OUTBOX_COLLECTION].round_trips == 3
+    assert len({email["claim_id"] for email in claimed}) == 1
+
+
+def test_claimed_emails_are_left_alone_until_the_lease_expires():
+    db = outbox_with("a@example.org")
+    sender = OutboxSender(None, lease_seconds=300)
+
+    assert len(asyncio.run(sender._claim(db))) == 1
+    assert asyncio.run(sender._claim(db)) == []
+
+    [document] = db[OUTBOX_COLLECTION].documents
+    document["claimed_at"] -= timedelta(seconds=301)
+    assert len(asyncio.run(sender._claim(db))) == 1
+
+
+@pytest.mark.parametrize("smtp_stub", [{"reject": ["bad@example.org"]}], indirect=True)
+def test_rejected_email_is_retried_with_backoff_then_failed(smtp_stub):
+    db = outbox_with("good@example.org", "bad@example.org")
+    sender = sender_for(smtp_stub, max_attempts=2, base_backoff_seconds=30)
+
+    run_batches(sender, db)
+
+    assert statuses(db) == {"good@example.org": "sent", "bad@example.org": "pending"}
+    bad = next(document for document in db[OUTBOX_COLLECTION].documents if document["to"] == "bad@example.org")
+    assert bad["attempts"] == 1 and "no such user" in bad["last_error"]
+    assert bad["next_attempt_at"] - bad["updated_at"] == timedelta(seconds=30)
+
+    # Not due again until the backoff has passed
+    assert run_batches(sender_for(smtp_stub, max_attempts=2), db) == [0]
+    bad["next_attempt_at"] = datetime.now() - timedelta(seconds=1)
+    run_batches(sender_for(smtp_stub, max_attempts=2), db)
+
+    assert bad["status"] == "failed" and bad["attempts"] == 2
+
+
+def test_backoff_doubles_and_is_capped():
+    sender = OutboxSender(None, base_backoff_seconds=30)
+
+    assert [sender.backoff(attempts).total_seconds() for attempts in (1, 2, 3)] == [30, 60, 120]
+    assert sender.backoff(20) == timedelta(hours=6)
+
+
+@pytest.mark.parametrize("smtp_stub", [{"drop_after": 1}], indirect=True)
+def test_connection_dropped_by_the_server_is_replaced(smtp_stub):
+    db = outbox_with("a@example.org", "b@example.org")
+
+    run_batches(sender_for(smtp_stub, batch_size=1), db, rounds=2)
+
+    assert set(statuses(db).values()) == {"sent"}
+    assert len(smtp_stub.messages) == 2
+    assert smtp_stub.connections == 2
+
+
+def test_without_smtp_the_body_is_logged(caplog):
+    db = outbox_with("a@example.org")
+
+    with caplog.at_level(logging.INFO, logger="backend.notifications.outbox"):
+        run_batches(OutboxSender(None), db)
+
+    assert "Link for a@example.org" in caplog.text
+    assert statuses(db) == {"a@example.org": "sent"}
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from pymongo import ASCENDING, DESCENDING
+
+from backend.database.pagination import DEFAULT_SORT, decode_cursor, encode_cursor, keyset_filter
+
+
+def matches(document, query):
+    """Evaluate the subset of the query language keyset_filter produces"""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+            continue
+        if key == "$and":
+            if not all(matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = document.get(key)
+        if isinstance(condition, dict):
+            for operator, operand in condition.items():
+                if operator == "$ne" and value == operand:
+                    return False
+                if operator == "$in" and value not in operand:
+                    return False
+                if operator in ("$lt", "$gt"):
+                    # Comparisons never match across null, as in MongoDB
+                    if value is None or operand is None:
+                        return False
+                    if operator == "$lt" and not value < operand:
+                        return False
+                    if operator == "$gt" and not value > operand:
+                        return False
+        elif value != condition:
+            return False
+    return True
+
+
+def mongo_sorted(documents, sort):
+    """Sort like MongoDB, where null sorts below every other value"""
+    ordered = list(documents)
+    for field, direction in reversed(sort):
+        ordered.sort(
+            key=lambda document: (document.get(field) is not None, document.get(field) or 0),
+            reverse=direction == DESCENDING
+        )
+    return ordered
+
+
+def paginate_all(documents, sort, limit):
+    pages = []
+    cursor = None
+    while True:
+        remaining = documents
+        if cursor:
+            values = decode_cursor(cursor, len(sort))
+            remaining = [document for document in documents if matches(document, keyset_filter(sort, values))]
+        page = mongo_sorted(remaining, sort)[:limit]
+        if not page:
+            return pages
+        pages.append([document["id"] for document in page])
+        cursor = encode_cursor([page[-1].get(field) for field, _ in sort])
+
+
+def test_cursor_round_trips_datetimes_and_scalars():
+    values = [datetime(2026, 1, 2, 3, 4, 5, 678000), "id-1", 2.5, None]
+    assert decode_cursor(encode_cursor(values), 4) == values
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(["a"]), encode_cursor([{"$ne": None}, "id"])])
+def test_decode_rejects_tampered_cursors(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+def test_decode_checks_value_types_per_position():
+    listing_cursor = encode_cursor([datetime(2026, 1, 1), "id-1"])
+
+    with pytest.raises(HTTPException):
+        decode_cursor(listing_cursor, 2, ((float, int), (str,)))
+    assert decode_cursor(encode_cursor([1.5, "id-1"]), 2, ((float, int), (str,))) == [1.5, "id-1"]
+
+
+def test_descending_pages_include_documents_without_updated_at():
+    start = datetime(2026, 1, 1)
+    documents = [{"id": f"d{i}", "updated_at": start + timedelta(days=i % 3)} for i in range(7)]
+    documents += [{"id": "n1", "updated_at": None}, {"id": "n2"}]
+
+    pages = paginate_all(documents, DEFAULT_SORT, limit=2)
+
+    flattened = [doc_id for page in pages for doc_id in page]
+    assert flattened == [document["id"] for document in mongo_sorted(documents, DEFAULT_SORT)]
+    assert sorted(flattened) == sorted(document["id"] for document in documents)
+
+
+def test_ascending_pages_start_with_null_values():
+    sort = [("rank", ASCENDING), ("id", ASCENDING)]
+    documents = [{"id": "a", "rank": 2}, {"id": "b"}, {"id": "c", "rank": 1}, {"id": "d", "rank": None}]
+
+    pages = paginate_all(documents, sort, limit=1)
+
+    assert [page[0] for page in pages] == ["b", "d", "c", "a"]
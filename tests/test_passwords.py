@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+
+from backend.auth.passwords import PasswordHasher
+
+
+class SlowContext:
+    """Stands in for a CryptContext, recording how many hashes run at once"""
+
+    def __init__(self, seconds=0.02):
+        self.seconds = seconds
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _work(self):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.seconds)
+        with self.lock:
+            self.running -= 1
+
+    def hash(self, password):
+        self._work()
+        return f"hashed:{password}"
+
+    def verify(self, password, hashed_password):
+        self._work()
+        return hashed_password == f"hashed:{password}"
+
+
+def test_hash_and_verify_run_on_the_pool():
+    async def scenario():
+        hasher = PasswordHasher(SlowContext(0), max_workers=1)
+        hashed = await hasher.hash("secret")
+        results = (await hasher.verify("secret", hashed), await hasher.verify("wrong", hashed))
+        hasher.shutdown()
+        return hashed, results, hasher.metrics()
+
+    hashed, results, metrics = asyncio.run(scenario())
+
+    assert hashed == "hashed:secret"
+    assert results == (True, False)
+    assert metrics["completed"] == 3
+
+
+def test_missing_hash_fails_without_using_the_pool():
+    hasher = PasswordHasher(SlowContext(0))
+    assert asyncio.run(hasher.verify("secret", None)) is False
+    assert hasher.metrics()["completed"] == 0
+
+
+def test_concurrency_is_capped_at_the_pool_size_and_queueing_is_measured():
+    context = SlowContext()
+
+    async def scenario():
+        hasher = PasswordHasher(context, max_workers=2)
+        await asyncio.gather(*[hasher.hash(str(i)) for i in range(8)])
+        hasher.shutdown()
+        return hasher.metrics()
+
+    metrics = asyncio.run(scenario())
+
+    assert context.peak == 2
+    assert metrics["max_queue_depth"] >= 6
+    assert metrics["queue_depth"] == 0 and metrics["running"] == 0
+    assert metrics["avg_wait_ms"] > 0
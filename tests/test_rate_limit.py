@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from backend.auth import rate_limit
+from backend.auth.rate_limit import (
+    MemoryRateLimiter,
+    RateLimitRule,
+    RedisRateLimiter,
+    create_rate_limiter,
+    forwarded_client_ip,
+)
+
+RULE = RateLimitRule("test", capacity=3, period=30)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+
+class FakeRedis:
+    """Stands in for redis.asyncio.Redis, running the token bucket script with _take"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.hashes = {}
+        self.calls = []
+        self.closed = False
+
+    def register_script(self, source):
+        assert "HMGET" in source
+
+        async def script(keys, args):
+            self.calls.append((keys, args))
+            if self.error:
+                raise self.error
+            [key] = keys
+            capacity, rate, now, cost = args
+            rule = RateLimitRule("script", capacity, capacity / rate)
+            tokens, updated_at = self.hashes.get(key, (capacity, now))
+            tokens, retry_after = rate_limit._take(tokens, updated_at, now, rule, cost)
+            self.hashes[key] = (tokens, now)
+            return str(retry_after)
+
+        return script
+
+    async def close(self):
+        self.closed = True
+
+
+def hits(limiter, count, key="k", cost=1):
+    async def scenario():
+        return [await limiter.hit(RULE, key, cost) for _ in range(count)]
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("make_limiter", [MemoryRateLimiter, lambda: RedisRateLimiter(FakeRedis())])
+def test_bucket_empties_then_refills(clock, make_limiter):
+    limiter = make_limiter()
+
+    assert hits(limiter, 3) == [0, 0, 0]
+    assert hits(limiter, 1) == [pytest.approx(10)]
+    assert hits(limiter, 1, key="other") == [0]
+
+    clock.now += 10
+    assert hits(limiter, 2) == [0, pytest.approx(10)]
+
+
+@pytest.mark.parametrize("make_limiter", [MemoryRateLimiter, lambda: RedisRateLimiter(FakeRedis())])
+def test_checking_without_cost_never_drains_the_bucket(clock, make_limiter):
+    limiter = make_limiter()
+
+    assert hits(limiter, 10, cost=0) == [0] * 10
+    hits(limiter, 3)
+    assert hits(limiter, 1, cost=0) == [pytest.approx(10)]
+
+
+def test_memory_limiter_drops_least_recently_used_buckets(clock):
+    limiter = MemoryRateLimiter(max_keys=2)
+    for key in ["a", "b", "a", "c"]:
+        hits(limiter, 1, key=key)
+
+    assert list(limiter.buckets) == ["test:a", "test:c"]
+
+
+def test_redis_limiter_shares_buckets_by_prefixed_key(clock):
+    client = FakeRedis()
+    first, second = RedisRateLimiter(client), RedisRateLimiter(client)
+
+    hits(first, 2)
+    assert hits(second, 2) == [0, pytest.approx(10)]
+    assert client.calls[0][0] == ["ratelimit:test:k"]
+
+
+def test_redis_outage_lets_requests_through(clock):
+    limiter = RedisRateLimiter(FakeRedis(ConnectionError("down")))
+
+    assert hits(limiter, 5) == [0] * 5
+
+
+def test_memory_limiter_without_redis_url():
+    assert isinstance(create_rate_limiter(None), MemoryRateLimiter)
+
+
+@pytest.mark.parametrize("forwarded_for, peer, hops, expected", [
+    (None, "10.0.0.1", 1, "10.0.0.1"),
+    ("203.0.113.7", "10.0.0.1", 0, "10.0.0.1"),
+    ("203.0.113.7", "10.0.0.1", 1, "203.0.113.7"),
+    # A client-supplied header is only ever to the left of what the proxy appended
+    ("6.6.6.6, 203.0.113.7", "10.0.0.1", 1, "203.0.113.7"),
+    ("6.6.6.6, 203.0.113.7, 10.0.0.2", "10.0.0.1", 2, "203.0.113.7"),
+    ("203.0.113.7", "10.0.0.1", 3, "203.0.113.7"),
+    (None, None, 1, "unknown"),
+])
+def test_forwarded_client_ip_trusts_only_configured_hops(forwarded_for, peer, hops, expected):
+    assert forwarded_client_ip(forwarded_for, peer, hops) == expected
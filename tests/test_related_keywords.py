@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from backend.keywords.related import KeywordCooccurrence
+
+VOCABULARY = ["AI", "Machine Learning", "Robotics", "Optics", "Lasers", "Genomics", "Statistics"]
+
+
+def academic(academic_id, keywords, approval_status="approved"):
+    return {"id": academic_id, "keywords": keywords, "approval_status": approval_status}
+
+
+def counts(cooccurrence):
+    return dict(cooccurrence.frequency), {term: dict(pairs) for term, pairs in cooccurrence.pairs.items()}
+
+
+def test_related_keywords_are_scored_by_cosine():
+    cooccurrence = KeywordCooccurrence()
+    cooccurrence.build([
+        ("academic:1", ["AI", "Machine Learning"]),
+        ("academic:2", ["ai", "machine-learning", "Robotics"]),
+        ("academic:3", ["AI", "Robotics"]),
+        ("academic:4", ["Machine Learning"]),
+    ])
+
+    related = cooccurrence.related("AI")
+
+    assert [item["name"] for item in related] == ["Robotics", "Machine Learning"]
+    assert related[1] == {"name": "Machine Learning", "count": 2, "score": pytest.approx(2 / 9 ** 0.5, abs=1e-4)}
+    assert cooccurrence.related("unknown") == []
+
+
+def test_expand_adds_only_strong_neighbours():
+    cooccurrence = KeywordCooccurrence()
+    cooccurrence.build([(f"academic:{i}", ["Optics", "Lasers"]) for i in range(3)])
+
+    assert cooccurrence.expand(["Optics"]) == ["Optics", "Lasers"]
+    assert cooccurrence.expand(["Genomics"]) == ["Genomics"]
+
+
+def test_incremental_syncs_match_a_rebuild():
+    rng = random.Random(11)
+    incremental = KeywordCooccurrence()
+    documents = {}
+    for _ in range(500):
+        academic_id = str(rng.randrange(40))
+        keywords = rng.sample(VOCABULARY, rng.randint(0, 4))
+        approved = rng.random() < 0.8
+        incremental.sync_academic(academic(academic_id, keywords, "approved" if approved else "pending"))
+        if approved and keywords:
+            documents[f"academic:{academic_id}"] = keywords
+        else:
+            documents.pop(f"academic:{academic_id}", None)
+
+    rebuilt = KeywordCooccurrence()
+    rebuilt.build(documents.items())
+
+    assert counts(incremental) == counts(rebuilt)
+    assert incremental.doc_terms == rebuilt.doc_terms
+
+
+def test_withdrawn_documents_leave_no_empty_counters():
+    cooccurrence = KeywordCooccurrence()
+    cooccurrence.sync_academic(academic("1", ["AI", "Robotics"]))
+    cooccurrence.sync_profile({"id": "p", "research_interests": ["AI"], "status": "approved"})
+
+    cooccurrence.sync_academic(academic("1", ["AI", "Robotics"], "rejected"))
+    cooccurrence.sync_profile({"id": "p", "research_interests": ["AI"], "status": "draft"})
+
+    assert counts(cooccurrence) == ({}, {})
+    assert cooccurrence.doc_terms == {}
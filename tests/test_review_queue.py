@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.review.queue import QUEUE_SORT, apply_decisions, review_queue, submission_fields
+from tests.test_pagination import matches, mongo_sorted
+
+START = datetime(2026, 3, 1, 9, 0)
+
+
+class FakeBulkResult:
+    def __init__(self, modified_count):
+        self.modified_count = modified_count
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return self.documents
+
+
+class FakeAcademics:
+    """Runs the queue pipeline's stages in Python; filters are equality-only outside the keyset $match"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def count_documents(self, query):
+        return len([document for document in self.documents if matches(document, query)])
+
+    def aggregate(self, pipeline):
+        # Everything up to the page's $limit has to run on stored fields, so the queue index can serve it
+        [match, sort, limit, *rest] = pipeline
+        assert list(sort["$sort"].items()) == QUEUE_SORT
+        assert all("$lookup" not in stage and "$addFields" not in stage for stage in (match, sort, limit))
+        documents = [document for document in self.documents if matches(document, match["$match"])]
+        documents = mongo_sorted(documents, QUEUE_SORT)[:limit["$limit"]]
+        return FakeCursor([dict(document) for document in documents])
+
+    async def bulk_write(self, operations, ordered=True):
+        modified = 0
+        for operation in operations:
+            for document in self.documents:
+                if matches(document, operation._filter):
+                    document.update(operation._doc["$set"])
+                    modified += 1
+        return FakeBulkResult(modified)
+
+    def find(self, query, projection=None):
+        return FakeCursor([dict(document) for document in self.documents if matches(document, query)])
+
+
+class FakeDb:
+    def __init__(self, academics):
+        self.academics = FakeAcademics(academics)
+
+    def __getitem__(self, name):
+        assert name == "academics"
+        return self.academics
+
+
+def academic(academic_id, days, completion=None, status="pending"):
+    created_at = START + timedelta(days=days, hours=int(academic_id[-1]))
+    document = {"id": academic_id, "user_id": f"u-{academic_id}", "approval_status": status,
+                "created_at": created_at, **submission_fields("academic", created_at)}
+    if completion is not None:
+        document["completion_percentage"] = completion
+    return document
+
+
+def test_queue_orders_by_day_then_completion_then_id():
+    db = FakeDb([academic("a1", 1, 50), academic("b2", 0, 20), academic("c3", 0, 90), academic("d4", 0)])
+
+    page, next_cursor = asyncio.run(review_queue(db, "academic"))
+
+    assert [item["id"] for item in page["items"]] == ["d4", "c3", "b2", "a1"]
+    assert page["total"] == 4 and next_cursor is None
+    assert all("submitted_day" not in item for item in page["items"])
+
+
+def test_submission_fields_store_the_day_and_default_completion():
+    submitted_at = datetime(2026, 3, 2, 17, 45)
+
+    assert submission_fields("academic", submitted_at) == {
+        "submitted_at": submitted_at, "submitted_day": datetime(2026, 3, 2), "completion_percentage": 100,
+    }
+    assert submission_fields("profile", submitted_at) == {
+        "submitted_at": submitted_at, "submitted_day": datetime(2026, 3, 2),
+    }
+
+
+def test_paging_while_deciding_neither_skips_nor_repeats():
+    documents = [academic(f"x{i}", i % 3, completion=(i * 37) % 100) for i in range(10)]
+    db = FakeDb(documents)
+    expected = [item["id"] for item in asyncio.run(review_queue(db, "academic", limit=100))[0]["items"]]
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = asyncio.run(review_queue(db, "academic", limit=3, cursor=cursor))
+        seen += [item["id"] for item in page["items"]]
+        # Approving what was just shown shrinks the queue, which would shift an offset
+        asyncio.run(apply_decisions(db, "academic", [item["id"] for item in page["items"]], approve=True))
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_queue_rejects_cursors_from_other_listings():
+    db = FakeDb([academic("a1", 0)])
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(review_queue(db, "academic", cursor="bm90LWEtY3Vyc29y"))
+    assert error.value.status_code == 400
+
+
+def test_decisions_skip_items_no_longer_pending_and_return_only_this_batch():
+    db = FakeDb([academic("a1", 0), academic("b2", 0), academic("c3", 0, status="approved")])
+    earlier = asyncio.run(apply_decisions(db, "academic", ["b2"], approve=False))
+
+    decided = asyncio.run(apply_decisions(db, "academic", ["a1", "b2", "c3", "a1"], approve=True))
+
+    assert [document["id"] for document in earlier] == ["b2"]
+    assert [document["id"] for document in decided] == ["a1"]
+    assert decided[0]["approval_status"] == "approved" and decided[0]["review_date"]
+    assert db.academics.documents[1]["approval_status"] == "rejected"
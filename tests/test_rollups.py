@@ -0,0 +1,75 @@
+import asyncio
+
+from backend.stats.rollups import ROLLUP_COLLECTION, StatsRollups
+
+
+class FakeRollupRows:
+    def __init__(self):
+        self.counts = {}
+        self.writes = 0
+
+    async def bulk_write(self, operations, ordered=True):
+        self.writes += 1
+        for operation in operations:
+            key = tuple(sorted(operation._filter["_id"].items()))
+            self.counts[key] = self.counts.get(key, 0) + operation._doc["$inc"]["count"]
+
+
+def fake_db():
+    return {ROLLUP_COLLECTION: FakeRollupRows()}
+
+
+def academic(status="approved", country="Bangladesh", city="Dhaka", field="Physics"):
+    return {"approval_status": status, "country": country, "city": city, "research_field": field}
+
+
+def row(kind, *values):
+    if kind == "city":
+        return (("city", values[1]), ("country", values[0]), ("kind", "city"))
+    return (("field", values[0]), ("kind", "field"))
+
+
+def test_approval_adds_and_rejection_removes_counts():
+    db = fake_db()
+    rollups = StatsRollups()
+
+    asyncio.run(rollups.record_change(db, academic("pending"), academic()))
+    asyncio.run(rollups.record_change(db, academic(), academic("rejected")))
+
+    counts = db[ROLLUP_COLLECTION].counts
+    assert counts == {row("city", "Bangladesh", "Dhaka"): 0, row("field", "Physics"): 0}
+
+
+def test_moving_an_approved_academic_moves_its_counts():
+    db = fake_db()
+
+    asyncio.run(StatsRollups().record_change(db, academic(), academic(city="Sylhet")))
+
+    assert db[ROLLUP_COLLECTION].counts == {
+        row("city", "Bangladesh", "Dhaka"): -1, row("city", "Bangladesh", "Sylhet"): 1
+    }
+
+
+def test_batched_changes_are_summed_into_one_write_without_no_op_rows():
+    db = fake_db()
+
+    asyncio.run(StatsRollups().record_changes(db, [
+        (None, academic()),
+        (None, academic(field="Biology")),
+        (academic(), academic()),
+        (None, academic("pending")),
+    ]))
+
+    rows = db[ROLLUP_COLLECTION]
+    assert rows.writes == 1
+    assert rows.counts == {
+        row("city", "Bangladesh", "Dhaka"): 2, row("field", "Physics"): 1, row("field", "Biology"): 1
+    }
+
+
+def test_changes_that_move_nothing_skip_the_write():
+    db = fake_db()
+
+    asyncio.run(StatsRollups().record_change(db, academic("pending"), academic("rejected")))
+
+    assert db[ROLLUP_COLLECTION].writes == 0
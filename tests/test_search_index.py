@@ -0,0 +1,54 @@
+from backend.search.index import SearchIndex, tokenize
+
+
+def profile(profile_id, status="approved", **fields):
+    return {"id": profile_id, "status": status, **fields}
+
+
+def test_tokenize_lowercases_and_drops_stop_words():
+    assert tokenize("The Theory of Machine Learning") == ["theory", "machine", "learning"]
+    assert tokenize(["Deep Learning", None, "NLP"]) == ["deep", "learning", "nlp"]
+    assert tokenize(None) == []
+
+
+def test_search_ranks_boosted_field_matches_first():
+    index = SearchIndex()
+    index.build([
+        profile("bio-only", bio="I sometimes read about genomics"),
+        profile("interest", research_interests=["Genomics"]),
+        profile("unrelated", research_interests=["Optics"]),
+    ])
+
+    ranked = [doc_id for doc_id, _ in index.search("genomics")]
+
+    assert ranked == ["interest", "bio-only"]
+
+
+def test_last_term_matches_as_prefix():
+    index = SearchIndex()
+    index.build([profile("p1", research_interests=["Bioinformatics"])])
+
+    assert [doc_id for doc_id, _ in index.search("bioinf")] == ["p1"]
+    assert index.search("xyz") == []
+
+
+def test_sync_removes_profiles_that_are_no_longer_approved():
+    index = SearchIndex()
+    index.sync(profile("p1", research_interests=["Genomics"]))
+    index.sync(profile("p2", research_interests=["Genomics"]))
+
+    index.sync(profile("p1", status="draft", research_interests=["Genomics"]))
+
+    assert "p1" not in index
+    assert [doc_id for doc_id, _ in index.search("genomics")] == ["p2"]
+
+
+def test_readding_a_document_replaces_its_terms():
+    index = SearchIndex()
+    index.add("p1", {"research_interests": ["Genomics"]})
+    index.add("p1", {"research_interests": ["Optics"]})
+
+    assert index.search("genomics") == []
+    assert index.expand_prefix("gen") == []
+    assert [doc_id for doc_id, _ in index.search("optics")] == ["p1"]
+    assert index.total_field_lengths["research_interests"] == 1
@@ -0,0 +1,192 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.graph.suggestions import (
+    DEFAULT_WORKERS,
+    MAX_WORKERS,
+    SUGGESTIONS_COLLECTION,
+    SuggestionEngine,
+    SuggestionModel,
+    profile_features,
+)
+
+
+def profile(user_id, interests=(), institution=None, country=None, city=None, status="approved"):
+    return {
+        "user_id": user_id, "status": status, "research_interests": list(interests),
+        "institution_name": institution, "country": country, "city": city,
+    }
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return self.documents
+
+
+class FakeConnections:
+    def __init__(self, connections=()):
+        self.connections = list(connections)
+
+    def find(self, query, projection=None):
+        users = None
+        if "$or" in query:
+            users = set(query["$or"][0]["requester_id"]["$in"])
+        return FakeCursor([
+            connection for connection in self.connections
+            if connection["status"] in query["status"]["$in"]
+            and (users is None or users & {connection["requester_id"], connection["recipient_id"]})
+        ])
+
+
+class FakeSuggestions:
+    """Applies the $set/$setOnInsert upserts and generation deletes the engine issues"""
+
+    def __init__(self, documents=()):
+        self.documents = {document["_id"]: dict(document) for document in documents}
+        self.operations = []
+
+    async def bulk_write(self, operations, ordered=True):
+        self.operations.extend(operations)
+        for operation in operations:
+            user_id = operation._filter.get("_id")
+            if user_id is None:
+                continue
+            exists = user_id in self.documents
+            if not exists and not operation._upsert:
+                continue
+            document = self.documents.setdefault(user_id, {"_id": user_id})
+            document.update(operation._doc.get("$set", {}))
+            if not exists:
+                document.update(operation._doc.get("$setOnInsert", {}))
+
+    async def delete_many(self, query):
+        floor = query["generation"]["$not"]["$gte"]
+        self.documents = {
+            user_id: document for user_id, document in self.documents.items()
+            if document.get("generation") is not None and document["generation"] >= floor
+        }
+
+    async def find_one(self, query, projection=None, sort=None):
+        stamped = [document for document in self.documents.values() if "generation" in document]
+        return max(stamped, key=lambda document: document["generation"], default=None)
+
+
+class FakeDb:
+    def __init__(self, connections=(), suggestions=()):
+        self.connections = FakeConnections(connections)
+        self.suggestions = FakeSuggestions(suggestions)
+
+    def __getitem__(self, name):
+        assert name == SUGGESTIONS_COLLECTION
+        return self.suggestions
+
+
+def ranked(db, user_id):
+    return [candidate["user_id"] for candidate in db.suggestions.documents[user_id]["candidates"]]
+
+
+def test_niche_shared_interests_outrank_common_ones():
+    model = SuggestionModel()
+    model.build([
+        profile("me", ["ml", "glaciology"]),
+        profile("common", ["ml"]),
+        profile("niche", ["glaciology"]),
+        *[profile(f"other{i}", ["ml"]) for i in range(5)],
+        profile("pending", ["glaciology"], status="pending"),
+    ])
+
+    ranking = [user_id for user_id, _ in model.top_k("me", 3)]
+
+    assert ranking[0] == "niche"
+    assert "pending" not in model.features
+
+
+def test_location_and_institution_add_fixed_weights():
+    model = SuggestionModel()
+    me = profile_features(profile("me", ["ml"], "BUET", "Bangladesh", "Dhaka"))
+
+    same_city = profile_features(profile("x", [], "DU", "Bangladesh", "Dhaka"))
+    other_country_same_city_name = profile_features(profile("y", [], None, "India", "Dhaka"))
+
+    assert model.score(me, same_city) == pytest.approx(0.2)
+    assert model.score(me, other_country_same_city_name) == 0
+
+
+def test_removing_a_researcher_clears_their_postings():
+    model = SuggestionModel()
+    model.sync(profile("a", ["ml"], "BUET"))
+    model.sync(profile("a", ["ml"], "BUET", status="rejected"))
+
+    assert len(model) == 0
+    assert model.by_interest == {} and model.by_institution == {}
+
+
+def test_refresh_all_ranks_inline_and_drops_stale_lists():
+    engine = SuggestionEngine(k=5)
+    engine.model.build([profile("a", ["ml"]), profile("b", ["ml"]), profile("c", ["ml"])])
+    stale = datetime.now() - timedelta(days=2)
+    db = FakeDb(
+        connections=[{"requester_id": "a", "recipient_id": "c", "status": "accepted"}],
+        suggestions=[{"_id": "gone", "candidates": [], "generation": stale}, {"_id": "legacy", "candidates": []}]
+    )
+
+    asyncio.run(engine.refresh_all(db))
+
+    assert sorted(db.suggestions.documents) == ["a", "b", "c"]
+    assert ranked(db, "a") == ["b"]
+    assert sorted(ranked(db, "b")) == ["a", "c"]
+
+
+def test_refresh_all_splits_chunks_across_worker_processes():
+    engine = SuggestionEngine(k=5, workers=2, chunk_size=2)
+    engine.model.build([profile(str(i), ["ml"]) for i in range(5)])
+    db = FakeDb()
+
+    asyncio.run(engine.refresh_all(db))
+
+    assert sorted(db.suggestions.documents) == ["0", "1", "2", "3", "4"]
+    assert sorted(ranked(db, "0")) == ["1", "2", "3", "4"]
+
+
+def test_lists_created_during_a_refresh_survive_it():
+    engine = SuggestionEngine(k=5)
+    engine.model.build([profile("a", ["ml"]), profile("b", ["ml"])])
+    db = FakeDb()
+    generation = datetime.now()
+
+    engine.model.sync(profile("late", ["ml"]))
+    asyncio.run(engine.refresh_users(db, ["late"]))
+    asyncio.run(db.suggestions.delete_many({"generation": {"$not": {"$gte": generation}}}))
+
+    assert sorted(ranked(db, "late")) == ["a", "b"]
+
+
+def test_excluded_ids_cover_the_user_and_their_connections_in_either_direction():
+    engine = SuggestionEngine()
+    db = FakeDb(connections=[
+        {"requester_id": "me", "recipient_id": "friend", "status": "accepted"},
+        {"requester_id": "asker", "recipient_id": "me", "status": "pending"},
+        {"requester_id": "me", "recipient_id": "declined", "status": "rejected"},
+        {"requester_id": "other", "recipient_id": "friend", "status": "accepted"},
+    ])
+
+    assert asyncio.run(engine.excluded_ids(db, "me")) == {"me", "friend", "asker"}
+
+
+def test_restart_waits_out_a_recent_refresh():
+    engine = SuggestionEngine(refresh_hours=24)
+
+    assert asyncio.run(engine.seconds_until_refresh(FakeDb())) == 0
+    recent = FakeDb(suggestions=[{"_id": "a", "candidates": [], "generation": datetime.now() - timedelta(hours=1)}])
+    assert 22 * 3600 < asyncio.run(engine.seconds_until_refresh(recent)) <= 23 * 3600
+    overdue = FakeDb(suggestions=[{"_id": "a", "candidates": [], "generation": datetime.now() - timedelta(days=2)}])
+    assert asyncio.run(engine.seconds_until_refresh(overdue)) == 0
+
+
+def test_worker_count_is_bounded():
+    assert 1 <= DEFAULT_WORKERS <= MAX_WORKERS
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from backend.keywords.synonyms import SYNONYMS_COLLECTION, KeywordCanonicalizer, clean_keyword, keyword_key
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length):
+        return [dict(document) for document in self.documents]
+
+
+class FakeCollection:
+    def __init__(self, documents=()):
+        self.documents = list(documents)
+
+    def find(self, query, projection=None):
+        return FakeCursor(self.documents)
+
+    async def update_one(self, query, update, upsert=False):
+        self.documents = [document for document in self.documents if document["_id"] != query["_id"]]
+        self.documents.append({"_id": query["_id"], **update["$set"]})
+
+
+class FakeDb:
+    def __init__(self, keywords=(), synonyms=()):
+        self.keywords = FakeCollection(keywords)
+        self.synonyms = FakeCollection(synonyms)
+
+    def __getitem__(self, name):
+        assert name == SYNONYMS_COLLECTION
+        return self.synonyms
+
+
+def loaded(keywords=(), synonyms=()):
+    db = FakeDb(keywords, synonyms)
+    canonicalizer = KeywordCanonicalizer()
+    asyncio.run(canonicalizer.load(db))
+    return canonicalizer, db
+
+
+def test_keyword_key_folds_case_separators_and_width():
+    assert keyword_key("  Machine-Learning ") == "machine learning"
+    assert keyword_key("machine_learning/AI") == "machine learning ai"
+    assert keyword_key("ＡＩ") == "ai"
+    assert clean_keyword("  Deep   Learning ") == "Deep Learning"
+
+
+def test_spellings_share_the_most_used_existing_name():
+    canonicalizer, _ = loaded([
+        {"name": "machine-learning", "count": 1},
+        {"name": "Machine Learning", "count": 9},
+    ])
+
+    assert canonicalizer.canonicalize(["MACHINE learning", "Machine_Learning", "Robotics"]) == [
+        "Machine Learning", "Robotics"
+    ]
+    # A new spelling is registered as typed the first time it is seen
+    assert canonicalizer.canonical("robotics") == "Robotics"
+
+
+def test_synonyms_fold_into_their_canonical_keyword():
+    canonicalizer, db = loaded([{"name": "Machine Learning", "count": 3}])
+
+    asyncio.run(canonicalizer.set_synonym(db, "ML", "machine learning"))
+
+    assert canonicalizer.canonicalize(["ml", "Machine Learning"]) == ["Machine Learning"]
+    with pytest.raises(ValueError):
+        asyncio.run(canonicalizer.set_synonym(db, "Machine-Learning", "Machine Learning"))
+    with pytest.raises(ValueError):
+        asyncio.run(canonicalizer.set_synonym(db, "Machine Learning", "Statistics"))
+
+
+def test_expand_matches_stored_case_and_separator_variants():
+    canonicalizer, _ = loaded(
+        [
+            {"name": "Machine Learning", "count": 3},
+            {"name": "machine-learning", "count": 1},
+            {"name": "ml", "count": 1},
+        ],
+        [{"_id": "ml", "alias": "ML", "canonical": "Machine Learning", "canonical_key": "machine learning"}],
+    )
+
+    assert canonicalizer.expand(["MACHINE LEARNING"]) == [
+        "MACHINE LEARNING", "ML", "Machine Learning", "machine-learning", "ml"
+    ]
+    assert set(canonicalizer.expand(["ML"])) >= {"Machine Learning", "machine-learning", "ml"}
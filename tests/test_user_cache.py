@@ -0,0 +1,67 @@
+import pytest
+
+from backend.auth import user_cache as user_cache_module
+from backend.auth.user_cache import UserCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cached_users_are_copies_and_counted():
+    cache = UserCache()
+    cache.put("u1", {"id": "u1", "role": "researcher"}, cache.version("u1"))
+
+    user = cache.get("u1")
+    user["role"] = "admin"
+
+    assert cache.get("u1")["role"] == "researcher"
+    assert cache.get("u2") is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = UserCache(ttl_seconds=60)
+    cache.put("u1", {"id": "u1"}, 0)
+
+    clock[0] += 59
+    assert cache.get("u1") is not None
+    clock[0] += 2
+    assert cache.get("u1") is None
+    assert len(cache) == 0
+
+
+def test_a_fill_racing_an_invalidation_is_dropped():
+    cache = UserCache()
+    version = cache.version("u1")
+
+    # A write lands while the reader is still waiting on the database
+    cache.invalidate("u1")
+    cache.put("u1", {"id": "u1", "email": "old@example.org"}, version)
+
+    assert cache.get("u1") is None
+    cache.put("u1", {"id": "u1", "email": "new@example.org"}, cache.version("u1"))
+    assert cache.get("u1")["email"] == "new@example.org"
+
+
+def test_least_recently_used_users_are_evicted():
+    cache = UserCache(max_size=2)
+    for user_id in ["a", "b"]:
+        cache.put(user_id, {"id": user_id}, 0)
+    cache.get("a")
+    cache.put("c", {"id": "c"}, 0)
+
+    assert list(cache.entries) == ["a", "c"]
+
+
+def test_clear_invalidates_every_entry():
+    cache = UserCache()
+    cache.put("a", {"id": "a"}, 0)
+
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert cache.version("a") == 1
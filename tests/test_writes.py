@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.database.writes import conditional_update, conditional_update_with_previous, literal_fields
+
+
+class FakeCollection:
+    """Equality-only matching; `interfere` runs before each write, like a concurrent request"""
+
+    def __init__(self, documents, interfere=None):
+        self.documents = documents
+        self.interfere = interfere
+        self.writes = 0
+
+    @staticmethod
+    def _matches(document, query):
+        return all(document.get(field) == value for field, value in query.items())
+
+    async def find_one(self, query):
+        return next((dict(document) for document in self.documents if self._matches(document, query)), None)
+
+    async def find_one_and_update(self, query, update, projection=None, return_document=None):
+        if self.interfere:
+            self.interfere(self)
+        self.writes += 1
+        for document in self.documents:
+            if self._matches(document, query):
+                before = dict(document)
+                document.update(update["$set"])
+                return dict(document) if return_document else before
+        return None
+
+
+def explain(document):
+    return HTTPException(status_code=404 if document is None else 403, detail="explained")
+
+
+def test_conditional_update_returns_the_document_as_written():
+    collection = FakeCollection([{"id": "a", "owner": "u", "title": "old"}])
+
+    written = asyncio.run(conditional_update(collection, {"id": "a"}, {"owner": "u"}, {"$set": {"title": "new"}}, explain))
+
+    assert written == {"id": "a", "owner": "u", "title": "new"}
+
+
+def test_update_with_previous_returns_both_versions():
+    collection = FakeCollection([{"id": "a", "owner": "u", "status": "pending", "city": "Dhaka"}])
+
+    before, after = asyncio.run(conditional_update_with_previous(
+        collection, {"id": "a"}, {"owner": "u"}, {"$set": {"status": "approved"}}, explain, ("status", "city")
+    ))
+
+    assert before["status"] == "pending"
+    assert after == {"id": "a", "owner": "u", "status": "approved", "city": "Dhaka"}
+
+
+def test_update_with_previous_retries_when_a_tracked_field_moves():
+    def move_city_once(collection):
+        if collection.writes == 0:
+            collection.documents[0]["city"] = "Sylhet"
+
+    collection = FakeCollection([{"id": "a", "status": "pending", "city": "Dhaka"}], interfere=move_city_once)
+
+    before, after = asyncio.run(conditional_update_with_previous(
+        collection, {"id": "a"}, {}, {"$set": {"status": "approved"}}, explain, ("status", "city")
+    ))
+
+    assert collection.writes == 2
+    assert before["city"] == after["city"] == "Sylhet"
+
+
+def test_update_with_previous_explains_permission_and_missing_documents():
+    collection = FakeCollection([{"id": "a", "owner": "u", "status": "pending"}])
+
+    for key, expected in [({"id": "a"}, 403), ({"id": "missing"}, 404)]:
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(conditional_update_with_previous(
+                collection, key, {"owner": "someone-else"}, {"$set": {"status": "x"}}, explain, ("status",)
+            ))
+        assert error.value.status_code == expected
+
+
+def test_update_with_previous_gives_up_with_a_conflict():
+    def always_move(collection):
+        collection.documents[0]["status"] += "!"
+
+    collection = FakeCollection([{"id": "a", "status": "pending"}], interfere=always_move)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(conditional_update_with_previous(
+            collection, {"id": "a"}, {}, {"$set": {"city": "x"}}, explain, ("status",), attempts=2
+        ))
+    assert error.value.status_code == 409
+
+
+def test_literal_fields_quote_dollar_strings():
+    assert literal_fields({"bio": "$5 budget"}) == {"bio": {"$literal": "$5 budget"}}